@@ -4,7 +4,9 @@
 Bot 1 — ContextMap (projektneutral, Shared-Lib)
 -----------------------------------------------------------------
 Erzeugt:
-- .github/codex/context/run-<id>-issue-<#>-<sha7>/solver_input.json
+- .github/codex/context/run-<id>-issue-<#>-<sha7>/solver_input.json[.gz|.zst] (gestreamt; Dateien nur als Blob-Keys)
+- .github/codex/context/run-.../solver_input.index.json (Offset-Index je Abschnitt/Datei)
+- .github/codex/blobstore/                          (Dateiinhalte, content-addressed, per actions/cache geteilt)
 - .github/codex/context/run-.../solver_task.json    (NEU: ausführbares Mandat für Bot 2)
 - .github/codex/context/run-.../summary.md          (Problem/Lösungsweg in eigenen Worten)
 - (Legacy) .github/codex/context/run-.../solver_plan.json (nur minimale Kompatibilität für alten Solver)
@@ -18,7 +20,7 @@ Funktionen:
 - Kommentar im Issue (eigene Zusammenfassung; kein Copy-Paste)
 - Fallback: Wenn kein Issue-Kontext vorhanden ist, wird NICHT kommentiert, aber Artefakte/Step-Summary werden geschrieben.
 
-Benötigt: requests, openai (für AI-Zusammenfassung optional), chardet (optional)
+Benötigt: requests, openai (für AI-Zusammenfassung optional), chardet (optional), zstandard (optional)
 Kompatibel mit der Shared-Lib in `.github/codex/lib/`.
 """
 
@@ -37,7 +39,7 @@ for _lib in LIB_CANDIDATES:
         sys.path.insert(0, _lib)
 
 try:
-    import gh, io_utils, repo_utils, profiles, task_schema, logging_utils
+    import gh, io_utils, repo_utils, blobstore, context_stream, profiles, task_schema, logging_utils
     try:
         import ai_utils
         HAVE_AI = True
@@ -55,7 +57,7 @@ ADD_LABEL          = os.getenv("CODEX_ADD_LABEL", "true").strip().lower() in {"1
 NOTIFY_SOLVER      = os.getenv("CODEX_NOTIFY_SOLVER", "true").strip().lower() in {"1", "true", "yes"}
 DEEP_REASONING     = os.getenv("CODEX_DEEP_REASONING", "true").strip().lower() in {"1", "true", "yes"}
 
-# Größenlimits (Text-/Binär-Einbettung für solver_input.json)
+# Größenlimits (Text-/Binär-Inhalte im Blob-Store)
 MAX_TEXT_BYTES     = int(os.getenv("CODEX_MAX_TEXT_EMBED_BYTES", "1048576"))  # 1 MiB
 MAX_BIN_B64_BYTES  = int(os.getenv("CODEX_MAX_BIN_BASE64_BYTES", "524288"))   # 512 KiB
 
@@ -92,39 +94,6 @@ def _event_ctx() -> Dict[str, Any]:
             pass
     return ictx
 
-_TEXT_LIKE_EXT = (".gradle",".kts",".xml",".md",".txt",".json",".yml",".yaml",".kt",".java",
-                  ".py",".sh",".bat",".ps1",".properties",".cfg",".ini",".csv",".proto",".tl",
-                  ".go",".rs",".swift",".dart",".html",".css",".scss",".ts",".tsx",".jsx",
-                  ".c",".h",".cc",".cpp",".hpp",".sql")
-
-def _read_repo_file(path: str, always_embed: bool = False, tracked_set: Optional[set] = None) -> Dict[str, Any]:
-    p = Path(path)
-    info: Dict[str, Any] = {"path": path, "size": None, "sha256": None, "is_text": None, "encoding": None}
-    try:
-        b = p.read_bytes()
-    except Exception as e:
-        info["error"] = f"read_error: {type(e).__name__}: {e}"
-        return info
-    info["size"] = len(b)
-    info["sha256"] = io_utils.file_sha256(b)
-    text_like = p.suffix.lower() in _TEXT_LIKE_EXT
-    is_text = io_utils.is_probably_text(b) or text_like
-    info["is_text"] = bool(is_text)
-    if is_text:
-        enc = io_utils.detect_encoding(b)
-        info["encoding"] = enc
-        if always_embed or len(b) <= MAX_TEXT_BYTES:
-            info["text"] = b.decode(enc, errors="replace")
-        else:
-            info["text"] = b.decode(enc, errors="replace")[:MAX_TEXT_BYTES]
-    else:
-        if always_embed or len(b) <= MAX_BIN_B64_BYTES:
-            import base64
-            info["base64"] = base64.b64encode(b).decode("ascii")
-        else:
-            info["binary_summary"] = {"note": "binary too large", "size": len(b)}
-    return info
-
 def _detect_profile_and_commands(files: List[str]) -> Tuple[str, Dict[str, Any]]:
     prof = profiles.detect_language_profile(files)
     cmds = profiles.resolve_commands(prof)
@@ -189,7 +158,6 @@ def main():
 
     paths = io_utils.context_paths(issue_no, RUN_ID, SHORT_SHA)
     RUN_DIR = paths["RUN_DIR"]
-    SOLVER_INPUT = paths["SOLVER_INPUT"]
     SOLVER_TASK  = paths["SOLVER_TASK"]
     SOLVER_PLAN  = paths["SOLVER_PLAN"]
     SUMMARY_MD   = paths["SUMMARY"]
@@ -197,7 +165,7 @@ def main():
     all_files = repo_utils.list_all_files()
     lang_stats = repo_utils.language_stats(all_files)
     stack = repo_utils.detect_stack_files(all_files)
-    largest = sorted(all_files, key=lambda p: (Path(p).stat().st_size if Path(p).exists() else 0), reverse=True)[:15]
+    largest = repo_utils.largest_files(all_files, 15)
     topdirs = repo_utils.top_dirs_by_count(all_files, 10)
 
     # robust: keywords even if title/body empty
@@ -219,17 +187,6 @@ def main():
     top_lang_keys = [k for k, _ in list(lang_stats.items())[:5]]
     new_files = _suggest_new_files(keywords, stack, top_lang_keys, issue_no)
 
-    tracked_set = set()
-    file_index: Dict[str, Any] = {}
-    total_bytes_embedded = 0
-    for p in all_files:
-        info = _read_repo_file(p, always_embed=False, tracked_set=tracked_set)
-        file_index[p] = info
-        if info.get("is_text") and "text" in info:
-            total_bytes_embedded += len((info["text"] or "").encode("utf-8", errors="replace"))
-        elif not info.get("is_text") and "base64" in info:
-            total_bytes_embedded += len(info.get("base64",""))
-
     def _segment_sections(body: str) -> Dict[str, str]:
         header_patterns = [
             (r"(?im)^#{1,6}\s*expected(?:\s+behavior)?|^erwartetes\s+verhalten\s*:?", "expected"),
@@ -274,9 +231,9 @@ def main():
     analysis = {
         "language_bytes_kb": lang_stats,
         "stack_indicators": stack,
-        "largest_files": [{"path": p, "bytes": (Path(p).stat().st_size if Path(p).exists() else 0)} for p in largest],
+        "largest_files": largest,
         "top_dirs_by_file_count": topdirs,
-        "repo_size_kb": round(sum(Path(p).stat().st_size for p in all_files if Path(p).exists())/1024, 2) if all_files else 0,
+        "repo_size_kb": repo_utils.total_size_kb(all_files) if all_files else 0,
         "file_count": len(all_files),
         "issue_sections": sections,
         "issue_signals": signals,
@@ -342,8 +299,14 @@ def main():
         notes=["Generated by Bot 1 (ContextMap)."]
     )
 
-    context_out = {
-        "meta": {
+    # Kontext streamen: Datei-Einträge (nur Blob-Keys, Inhalte im Blob-Store) werden
+    # geschrieben, sobald sie gelesen sind; Offsets landen in solver_input.index.json
+    store = blobstore.BlobStore()
+    base_commit = store.commit
+    inventory = repo_utils.inventory()
+    referenced = set()
+    with context_stream.ContextWriter(RUN_DIR, context_stream.default_compression()) as ctx_out:
+        ctx_out.section("meta", {
             "generated_at": time.strftime("%Y-%m-%d %H:%M:%S %z"),
             "repo": gh.repo(),
             "event_name": os.getenv("GITHUB_EVENT_NAME", ""),
@@ -352,13 +315,19 @@ def main():
             "runner_os": os.getenv("RUNNER_OS", ""),
             "max_text_embed_bytes": MAX_TEXT_BYTES,
             "max_bin_base64_bytes": MAX_BIN_B64_BYTES,
-            "total_bytes_embedded_estimate": total_bytes_embedded,
-        },
-        "issue_context": issue_ctx,
-        "attachments": [],
-        "repo": {"files": all_files, "file_index": file_index},
-        "analysis": analysis,
-    }
+        })
+        ctx_out.section("issue_context", issue_ctx)
+        ctx_out.section("attachments", [])
+        ctx_out.section("analysis", analysis)
+        ctx_out.begin("repo")
+        ctx_out.begin("file_index")
+        for p, entry in store.iter_sync((inventory[p] for p in all_files), MAX_TEXT_BYTES, MAX_BIN_B64_BYTES):
+            referenced.add(entry["blob"])
+            ctx_out.file(p, entry)
+        ctx_out.end()
+        ctx_out.section("blob_store", blobstore.summary(store, base_commit))
+    store.save(blobstore.head_commit(), keep=referenced)
+    SOLVER_INPUT = str(ctx_out.path)
 
     solver_plan = {
         "issue": {"number": issue_no, "title": title, "summary": (body or "").strip()[:800]},
@@ -371,7 +340,6 @@ def main():
         }
     }
 
-    io_utils.write_json(SOLVER_INPUT, context_out)
     io_utils.write_json(SOLVER_PLAN, solver_plan)
     task_schema.write(SOLVER_TASK, solver_task)
     io_utils.write_text(SUMMARY_MD, summary_md, encoding="utf-8")
@@ -379,7 +347,7 @@ def main():
     io_utils.write_json(paths["LAST_RUN"], {
         "run_id": RUN_ID, "issue_number": issue_no, "short_sha": SHORT_SHA,
         "run_dir": RUN_DIR.replace("\\", "/"),
-        "context": "solver_input.json", "task": "solver_task.json", "plan": "solver_plan.json"
+        "context": ctx_out.path.name, "task": "solver_task.json", "plan": "solver_plan.json"
     })
 
     # Kommentare nur, wenn Issue-Nummer bekannt
@@ -413,7 +381,7 @@ def main():
         f"Issue #{issue_no} — {title.strip()}",
         f"Top-Languages: {top_lang_preview}",
         f"Kandidaten (Top 10):\n{preview_files}",
-        f"Artefakte: solver_input.json, solver_task.json, solver_plan.json, summary.md"
+        f"Artefakte: {ctx_out.path.name}, solver_task.json, solver_plan.json, summary.md"
     ]
     logging_utils.add_step_summary("\n".join(summary_lines))
     print("\n".join(summary_lines))
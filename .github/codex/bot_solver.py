@@ -27,7 +27,7 @@ for _lib in LIB_CANDIDATES:
         sys.path.insert(0, _lib)
 
 try:
-    import gh, io_utils, repo_utils, patching, logging_utils, scopes, profiles, ai_utils, task_schema
+    import gh, io_utils, repo_utils, context_stream, patching, logging_utils, scopes, profiles, ai_utils, task_schema
 except Exception as e:
     print("::error::Shared‑Library nicht gefunden. Stelle sicher, dass `.github/codex/lib/` vorhanden ist.", flush=True)
     raise
@@ -121,19 +121,14 @@ def _copy_task_for_scopes(run_dir: Path):
 def load_task_and_context() -> Tuple[Dict[str, Any], Dict[str, Any], Path]:
     run_dir = _resolve_run_dir()
     task_path = run_dir / "solver_task.json"
-    ctx_path  = run_dir / "solver_input.json"
     task = {}
-    ctx = {}
     if task_path.exists():
         try:
             task = json.loads(task_path.read_text(encoding="utf-8"))
         except Exception:
             task = {}
-    if ctx_path.exists():
-        try:
-            ctx = json.loads(ctx_path.read_text(encoding="utf-8"))
-        except Exception:
-            ctx = {}
+    # Nur Kopf-Abschnitte (issue_context, analysis, ...); Datei-Einträge bei Bedarf über den Offset-Index
+    ctx = context_stream.read_head(run_dir)
     _copy_task_for_scopes(run_dir)
     return task, ctx, run_dir
 
@@ -374,7 +369,7 @@ def main():
     - Auswahl einzelner Patches: Nutze *Rebase & Merge* um Commits selektiv zu übernehmen; alternativ `SOLVER_SEPARATE_PRS=true`, um je Datei einen separaten PR zu erstellen.
     
     **Artefakte**
-    - Kontext: `{(run_dir/'solver_input.json').as_posix()}`
+    - Kontext: `{(context_stream.find_document(run_dir) or run_dir/'solver_input.json').as_posix()}`
     - Auftrag: `{(run_dir/'solver_task.json').as_posix()}`
     """).strip()
 
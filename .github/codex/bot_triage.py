@@ -28,7 +28,7 @@ for _lib in LIB_CANDIDATES:
         sys.path.insert(0, _lib)
 
 try:
-    import gh, io_utils, repo_utils, logging_utils, patching, ai_utils
+    import gh, io_utils, repo_utils, context_stream, logging_utils, patching, ai_utils
 except Exception as e:
     print("::error::Shared‑Library nicht gefunden. Stelle sicher, dass `.github/codex/lib/` vorhanden ist.", flush=True)
     raise
@@ -120,7 +120,7 @@ def _read_json_safe(p: Path) -> dict:
 def load_context() -> Tuple[dict, dict, dict, Path]:
     run_dir = _resolve_run_dir()
     solver_task = _read_json_safe(run_dir / "solver_task.json")
-    solver_input = _read_json_safe(run_dir / "solver_input.json")
+    solver_input = context_stream.read_head(run_dir)  # ohne Datei-Einträge
     solver_state = {}
     st = Path(".github/codex/solver_state.json")
     if st.exists():
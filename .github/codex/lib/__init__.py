@@ -1,6 +1,6 @@
 # Shared library for Codex 3-bot workflow
 __all__ = [
-    "gh", "io_utils", "patching", "repo_utils", "logging_utils",
+    "gh", "io_utils", "patching", "repo_utils", "blobstore", "context_stream", "logging_utils",
     "scopes", "profiles", "ai_utils", "task_schema",
 ]
 __version__ = "0.1.0"
@@ -0,0 +1,251 @@
+"""
+Content-addressed blob store for repository file bodies, shared across bot runs.
+
+Keys are git blob SHAs (sha1 of "blob <size>\\0" + content), so files that are
+unchanged in the working tree take their key from the index without being read.
+Layout (restored/saved by actions/cache between runs):
+
+    <root>/index.json          {"format", "commit", "blobs": {key: meta}}
+    <root>/objects/ab/cdef...  zlib-compressed file content
+"""
+from __future__ import annotations
+import os, zlib, hashlib, subprocess, threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    from . import io_utils
+except ImportError:  # lib/ on sys.path (bots)
+    import io_utils
+
+STORE_FORMAT = 1
+DEFAULT_STORE_DIR = os.getenv("CODEX_BLOB_STORE", os.path.join(".github", "codex", "blobstore"))
+
+# Always text regardless of content sniffing (box-drawing / umlaut-heavy sources fail the ASCII ratio)
+TEXT_LIKE_EXT = (".gradle",".kts",".xml",".md",".txt",".json",".yml",".yaml",".kt",".java",
+                 ".py",".sh",".bat",".ps1",".properties",".cfg",".ini",".csv",".proto",".tl",
+                 ".go",".rs",".swift",".dart",".html",".css",".scss",".ts",".tsx",".jsx",
+                 ".c",".h",".cc",".cpp",".hpp",".sql")
+
+def text_like_path(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in TEXT_LIKE_EXT
+
+def io_workers() -> int:
+    """Bounded pool size for reading/hashing (I/O and zlib/hashlib release the GIL); 1 = no pool."""
+    try:
+        return max(1, int(os.getenv("CODEX_IO_WORKERS", "")))
+    except ValueError:
+        cpus = os.cpu_count() or 1
+        return 1 if cpus == 1 else min(8, 2 * cpus)  # single core: pool overhead outweighs overlap
+
+def git_blob_sha(data: bytes) -> str:
+    h = hashlib.sha1(b"blob %d\0" % len(data)); h.update(data); return h.hexdigest()
+
+def dirty_paths() -> set:
+    """Tracked paths whose working-tree content differs from the index."""
+    try:
+        out = subprocess.check_output(["git", "diff-files", "--name-only", "-z"], stderr=subprocess.DEVNULL)
+    except Exception:
+        return set()
+    return {p for p in out.decode("utf-8", "surrogateescape").split("\0") if p}
+
+class BlobStore:
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        self.commit: Optional[str] = None
+        self.blobs: Dict[str, Dict[str, Any]] = {}
+        self.written = 0          # blobs materialized by this run
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        try:
+            data = io_utils.read_json(os.path.join(root, "index.json"))
+            if data.get("format") == STORE_FORMAT:
+                self.commit = data.get("commit")
+                self.blobs = data.get("blobs") or {}
+        except Exception:
+            pass
+
+    def _object_path(self, key: str) -> str:
+        return os.path.join(self.root, "objects", key[:2], key[2:])
+
+    def put(self, key: str, data: bytes, max_text: int, max_binary: int, text_like: bool = False) -> Dict[str, Any]:
+        """Record metadata for `key`; the compressed body is written if within the size limit.
+
+        text_like (from the path's extension) forces text, as content sniffing alone
+        misses sources with many non-ASCII characters. A blob first recorded as
+        binary is upgraded when it shows up under a text-like path.
+        Thread-safe: detection and compression run unlocked, only bookkeeping is locked.
+        """
+        is_text = text_like or io_utils.is_probably_text(data)
+        store = len(data) <= (max_text if is_text else max_binary)
+        meta: Dict[str, Any] = {"size": len(data), "is_text": is_text,
+                                "encoding": io_utils.detect_encoding(data) if is_text else None,
+                                "stored": store}
+        if store:
+            path = self._object_path(key)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            io_utils.write_bytes(tmp, zlib.compress(data, 1))
+            os.replace(tmp, path)
+        with self._lock:
+            known = self.blobs.get(key)
+            if known is not None and (known["is_text"] or not is_text):
+                return known  # same content written concurrently under another path
+            if store and not (known or {}).get("stored"):
+                self.bytes_written += len(data)
+                self.written += 1
+            self.blobs[key] = meta
+        return meta
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._object_path(key), "rb") as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    def get_text(self, key: str) -> Optional[str]:
+        data = self.get(key)
+        if data is None:
+            return None
+        return data.decode((self.blobs.get(key) or {}).get("encoding") or "utf-8", errors="replace")
+
+    def save(self, commit: Optional[str], keep: Optional[set] = None):
+        """Write index.json; with `keep`, drop blobs no longer referenced by the tree."""
+        if keep is not None:
+            for key in [k for k in self.blobs if k not in keep]:
+                del self.blobs[key]
+                try:
+                    os.remove(self._object_path(key))
+                except OSError:
+                    pass
+        self.commit = commit
+        io_utils.write_json(os.path.join(self.root, "index.json"),
+                            {"format": STORE_FORMAT, "commit": commit, "blobs": self.blobs}, indent=None)
+
+    def _entry(self, e: Any, dirty: set, max_text: int, max_binary: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        key, data = e.sha, None
+        if key is None or e.path in dirty:
+            try:
+                data = io_utils.read_bytes(e.path)
+            except OSError:
+                return None
+            key = git_blob_sha(data)
+        forced = text_like_path(e.path)
+        meta = self.blobs.get(key)
+        if meta is None or (forced and not meta["is_text"]):
+            if data is None:
+                try:
+                    data = io_utils.read_bytes(e.path)
+                except OSError:
+                    return None
+            meta = self.put(key, data, max_text, max_binary, forced)
+        return e.path, {"size": e.size, "mode": oct(e.mode)[2:], "blob": key,
+                        "is_text": meta["is_text"], "encoding": meta["encoding"],
+                        "stored": meta["stored"]}
+
+    def iter_sync(self, entries: Iterable[Any], max_text: int, max_binary: int,
+                  workers: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(path, {size, mode, blob, is_text, encoding, stored}) per inventory entry, in order.
+
+        Only files that are untracked, modified, or whose key the store has not
+        seen (or saw only as binary, for text-like extensions) are read; that work (read, hash, detect, compress) runs in a bounded
+        thread pool. Bodies above max_text/max_binary bytes get metadata only.
+        """
+        dirty = dirty_paths()
+        workers = workers or io_workers()
+        if workers == 1:
+            for e in entries:
+                result = self._entry(e, dirty, max_text, max_binary)
+                if result is not None:
+                    yield result
+            return
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending: deque = deque()   # futures, or finished results for entries without I/O
+            for e in entries:
+                meta = self.blobs.get(e.sha) if e.sha is not None and e.path not in dirty else None
+                if meta is not None and (meta["is_text"] or not text_like_path(e.path)):
+                    pending.append(self._entry(e, dirty, max_text, max_binary))
+                else:
+                    pending.append(pool.submit(self._entry, e, dirty, max_text, max_binary))
+                while pending and (len(pending) > workers * 4 or not isinstance(pending[0], Future)):
+                    result = pending.popleft()
+                    result = result.result() if isinstance(result, Future) else result
+                    if result is not None:
+                        yield result
+            while pending:
+                result = pending.popleft()
+                result = result.result() if isinstance(result, Future) else result
+                if result is not None:
+                    yield result
+
+    def sync(self, entries: Iterable[Any], max_text: int, max_binary: int,
+             workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        return dict(self.iter_sync(entries, max_text, max_binary, workers))
+
+def head_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+def summary(store: BlobStore, previous_commit: Optional[str]) -> Dict[str, Any]:
+    return {"path": io_utils.safe_relpath(store.root), "format": STORE_FORMAT,
+            "base_commit": previous_commit, "blobs": len(store.blobs),
+            "new_blobs": store.written, "new_bytes": store.bytes_written}
+
+# ---------- Benchmark: python .github/codex/lib/blobstore.py [--workers N] ----------
+
+def _bench(workers: Optional[int]) -> int:
+    """Scan of the working tree (read, hash, sniff, detect): sequential baseline vs. tiered + pooled."""
+    import sys, time, tempfile, shutil
+    import repo_utils
+
+    def baseline_is_text(data: bytes) -> bool:
+        if b"\0" in data[:4096]:
+            return False
+        sample = data[:4096]
+        return sum(c >= 9 and c <= 13 or (32 <= c <= 126) for c in sample) / max(1, len(sample)) > 0.85
+
+    def baseline_encoding(data: bytes) -> str:
+        return (io_utils.chardet.detect(data).get("encoding") or "utf-8") if io_utils.HAVE_CHARDET else "utf-8"
+
+    def scan(path: str, is_text, encoding) -> Tuple[str, str, bool, Optional[str]]:
+        data = io_utils.read_bytes(path)
+        text = is_text(data)
+        return path, git_blob_sha(data), text, encoding(data) if text else None
+
+    paths = list(repo_utils.inventory())
+    workers = workers or io_workers()
+    start = time.perf_counter()
+    baseline = [scan(p, baseline_is_text, baseline_encoding) for p in paths]
+    t_base = time.perf_counter() - start
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        tiered = list(pool.map(lambda p: scan(p, io_utils.is_probably_text, io_utils.detect_encoding), paths))
+    t_tiered = time.perf_counter() - start
+    print(f"scan baseline     workers=1  {t_base*1000:8.0f} ms  {len(paths)} files")
+    print(f"scan tiered+pool  workers={workers:<2} {t_tiered*1000:8.0f} ms")
+
+    root = tempfile.mkdtemp(prefix="blobstore-bench-")
+    try:
+        start = time.perf_counter()
+        BlobStore(root).sync(repo_utils.inventory().values(), 1 << 20, 1 << 19, workers=workers)
+        print(f"cold store sync   workers={workers:<2} {(time.perf_counter() - start)*1000:8.0f} ms (incl. compress + write)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    # Baseline chardet may name a UTF-8 superset ("ascii") where the fast path says "utf-8"
+    same = lambda a, b: a[:3] == b[:3] and (a[3] == b[3] or (a[3] or "").lower() in ("ascii", "utf-8"))
+    mismatched = [b[0] for b, t in zip(baseline, tiered) if not same(b, t)]
+    print(f"speedup {t_base / t_tiered:.1f}x, chardet={'yes' if io_utils.HAVE_CHARDET else 'no'}, "
+          f"output {'identical' if not mismatched else f'differs for {len(mismatched)} paths'}")
+    for p in mismatched[:10]:
+        print(f"  {p}", file=sys.stderr)
+    return 1 if mismatched else 0
+
+if __name__ == "__main__":
+    import argparse, sys
+    ap = argparse.ArgumentParser(description="Blob store benchmark on the working tree")
+    ap.add_argument("--workers", type=int, default=None, help="Pool size (default: CODEX_IO_WORKERS or 2 per CPU, max 8)")
+    sys.exit(_bench(ap.parse_args().workers))
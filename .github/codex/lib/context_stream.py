@@ -0,0 +1,236 @@
+"""
+Streaming writer/reader for solver_input.json with a sidecar offset index.
+
+The document stays one JSON object (json.load / jq still work), written key by
+key so file entries go to disk as they are produced. Compressed output
+(gzip, or zstd if `zstandard` is installed) is cut into independent members of
+about BLOCK_SIZE uncompressed bytes. solver_input.index.json records, for every
+section and file entry, [compressed block offset, offset in block, length], so a
+reader decompresses one block to get one entry.
+"""
+from __future__ import annotations
+import os, json, zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+    HAVE_ZSTD = True
+except Exception:
+    HAVE_ZSTD = False
+
+INDEX_FORMAT = 1
+BLOCK_SIZE = 256 * 1024
+SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+INDEX_NAME = "solver_input.index.json"
+BASE_NAME = "solver_input.json"
+
+def default_compression() -> Optional[str]:
+    c = os.getenv("CODEX_CONTEXT_COMPRESSION", "gzip").strip().lower()
+    if c in ("", "none", "off", "false", "0"):
+        return None
+    if c == "zstd" and not HAVE_ZSTD:
+        return "gzip"
+    return c if c in SUFFIXES else "gzip"
+
+def _compressor(compression: Optional[str]):
+    if compression == "gzip":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    return None
+
+def _decompressor(compression: Optional[str]):
+    if compression == "gzip":
+        return zlib.decompressobj(31)
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj()
+    return None
+
+_Span = List[int]  # [block offset, offset in block, length]
+
+class ContextWriter:
+    """Incremental JSON object writer: section(), begin()/end() and file() entries."""
+
+    def __init__(self, run_dir: str | Path, compression: Optional[str] = None):
+        self.compression = compression
+        self.path = Path(run_dir) / (BASE_NAME + SUFFIXES[compression])
+        self.index_path = Path(run_dir) / INDEX_NAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._raw = open(self.path, "wb")
+        self._comp = _compressor(compression)
+        self._block_start = 0   # compressed offset of the current block
+        self._block_pos = 0     # uncompressed bytes written in the current block
+        self._stack: List[Tuple[str, bool]] = []   # (dotted name, has entries)
+        self.sections: Dict[str, _Span] = {}
+        self.files: Dict[str, _Span] = {}
+        self._emit(b"{")
+        self._stack.append(("", False))
+
+    def _emit(self, data: bytes):
+        self._block_pos += len(data)
+        self._raw.write(self._comp.compress(data) if self._comp else data)
+
+    def _cut_block(self):
+        """Close the current compressed member so the next value starts a fresh one."""
+        if self._comp is None or self._block_pos < BLOCK_SIZE:
+            return
+        self._raw.write(self._comp.flush())
+        self._comp = _compressor(self.compression)
+        self._block_start = self._raw.tell()
+        self._block_pos = 0
+
+    def _key(self, name: str):
+        prefix, has_entries = self._stack[-1]
+        self._stack[-1] = (prefix, True)
+        self._emit(((b",\n" if has_entries else b"\n") + json.dumps(name, ensure_ascii=False).encode("utf-8") + b":"))
+        return f"{prefix}.{name}" if prefix else name
+
+    def _value(self, value: Any) -> _Span:
+        self._cut_block()
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if self._comp is None:
+            span = [0, self._raw.tell(), len(data)]
+        else:
+            span = [self._block_start, self._block_pos, len(data)]
+        self._emit(data)
+        return span
+
+    def section(self, name: str, value: Any):
+        dotted = self._key(name)
+        self.sections[dotted] = self._value(value)
+
+    def begin(self, name: str):
+        dotted = self._key(name)
+        self._emit(b"{")
+        self._stack.append((dotted, False))
+
+    def end(self):
+        self._stack.pop()
+        self._emit(b"\n}")
+
+    def file(self, path: str, entry: Dict[str, Any]):
+        self._key(path)
+        self.files[path] = self._value(entry)
+
+    def close(self):
+        while self._stack:
+            self.end()
+        if self._comp is not None:
+            self._raw.write(self._comp.flush())
+        self._raw.close()
+        index = {"format": INDEX_FORMAT, "document": self.path.name, "compression": self.compression,
+                 "sections": self.sections, "files": self.files}
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp.write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def find_document(run_dir: str | Path) -> Optional[Path]:
+    for suffix in ("", ".gz", ".zst"):
+        p = Path(run_dir) / (BASE_NAME + suffix)
+        if p.exists():
+            return p
+    return None
+
+class ContextReader:
+    """Random access to sections and file entries through the sidecar index.
+
+    Without an index (documents written by older bots) the whole document is
+    parsed once and served from memory.
+    """
+
+    def __init__(self, run_dir: str | Path):
+        self.run_dir = Path(run_dir)
+        self.path = find_document(run_dir)
+        self.index: Dict[str, Any] = {}
+        self._doc: Optional[Dict[str, Any]] = None
+        self._block: Tuple[int, bytes] = (-1, b"")
+        try:
+            index = json.loads((self.run_dir / INDEX_NAME).read_text(encoding="utf-8"))
+            if index.get("format") == INDEX_FORMAT and (self.run_dir / index.get("document", "")).exists():
+                self.index = index
+                self.path = self.run_dir / index["document"]
+        except Exception:
+            pass
+        if not self.index and self.path is not None and self.path.suffix == ".json":
+            try:
+                self._doc = json.loads(self.path.read_text(encoding="utf-8"))
+            except Exception:
+                self._doc = {}
+
+    def _read(self, span: _Span) -> Any:
+        block, offset, length = span
+        with open(self.path, "rb") as f:
+            if not self.index.get("compression"):
+                f.seek(offset)
+                return json.loads(f.read(length))
+            if self._block[0] != block or len(self._block[1]) < offset + length:
+                f.seek(block)
+                d = _decompressor(self.index["compression"])
+                out = bytearray()
+                while len(out) < offset + length:
+                    chunk = f.read(64 * 1024)
+                    if not chunk:
+                        break
+                    out += d.decompress(chunk)
+                    if getattr(d, "eof", False):
+                        break
+                self._block = (block, bytes(out))
+        return json.loads(self._block[1][offset:offset + length])
+
+    def _lookup(self, dotted: str) -> Any:
+        node: Any = self._doc or {}
+        for part in dotted.split("."):
+            node = node.get(part) if isinstance(node, dict) else None
+        return node
+
+    def section(self, name: str, default: Any = None) -> Any:
+        """Top-level or dotted ("repo.blob_store") section."""
+        if self._doc is not None:
+            value = self._lookup(name)
+            return default if value is None else value
+        span = self.index.get("sections", {}).get(name)
+        return default if span is None else self._read(span)
+
+    def head(self) -> Dict[str, Any]:
+        """All sections as a nested dict, without file entries."""
+        if self._doc is not None:
+            return {k: v for k, v in self._doc.items() if k != "repo"} | {
+                "repo": {k: v for k, v in (self._doc.get("repo") or {}).items() if k not in ("file_index", "files")}}
+        out: Dict[str, Any] = {}
+        for dotted in self.index.get("sections", {}):
+            *parents, last = dotted.split(".")
+            node = out
+            for p in parents:
+                node = node.setdefault(p, {})
+            node[last] = self.section(dotted)
+        return out
+
+    def paths(self) -> List[str]:
+        if self._doc is not None:
+            return list(self._lookup("repo.file_index") or {})
+        return list(self.index.get("files", {}))
+
+    def file(self, path: str) -> Optional[Dict[str, Any]]:
+        if self._doc is not None:
+            return (self._lookup("repo.file_index") or {}).get(path)
+        span = self.index.get("files", {}).get(path)
+        return None if span is None else self._read(span)
+
+    def iter_files(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(path, entry) in document order; each block is decompressed once."""
+        for path in self.paths():
+            yield path, self.file(path)
+
+def read_head(run_dir: str | Path) -> Dict[str, Any]:
+    """Context sections of a run (issue_context, analysis, meta, ...) without file entries."""
+    try:
+        return ContextReader(run_dir).head()
+    except Exception:
+        return {}
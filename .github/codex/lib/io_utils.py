@@ -26,17 +26,27 @@ except Exception:
 
 # ---------- Encoding / Heuristics ----------
 
+# Bytes counted as text: \t..\r and printable ASCII; translate() deletes them in C
+_TEXT_BYTES = bytes(range(9, 14)) + bytes(range(32, 127))
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
 def is_probably_text(data: bytes) -> bool:
-    if b"\x00" in data[:4096]:
-        return False
     sample = data[:4096]
-    text_chars = sum(c >= 9 and c <= 13 or (32 <= c <= 126) for c in sample)
+    if b"\x00" in sample:
+        return False
+    text_chars = len(sample) - len(sample.translate(None, _TEXT_BYTES))
     return (text_chars / max(1, len(sample))) > 0.85
 
 def detect_encoding(data: bytes) -> str:
+    # Tiered: strict UTF-8 (covers ASCII) first; chardet only on failure and on a sample
+    try:
+        data.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
     if not HAVE_CHARDET:
         return "utf-8"
-    res = chardet.detect(data)
+    res = chardet.detect(data[:ENCODING_SAMPLE_BYTES])
     return (res.get("encoding") or "utf-8")
 
 # ---------- Path helpers ----------
@@ -1,14 +1,23 @@
 """
-Repository discovery, file listing, stack detection, keywording, and simple symbol extraction.
+Repository discovery, file inventory, stack detection, keywording, and simple symbol extraction.
 """
 from __future__ import annotations
 import os, re, json
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Dict, List, NamedTuple, Tuple, Optional
 from collections import Counter
 
 DEFAULT_EXCLUDE_DIRS = {".git", ".github", ".gradle", "build", "out", ".idea", ".vscode", ".venv", "node_modules", ".dart_tool"}
 
+class FileEntry(NamedTuple):
+    path: str
+    sha: Optional[str]   # index blob SHA; None for untracked files
+    mode: int            # 0o100644, 0o100755, 0o120000 (symlink)
+    size: int            # bytes, from a single lstat
+
+# Inventory per (working dir, exclude set); one git listing per bot run
+_INVENTORY: Dict[Tuple[str, frozenset], Dict[str, FileEntry]] = {}
+
 def git_ls_files() -> List[str]:
     import subprocess
     try:
@@ -17,35 +26,100 @@ def git_ls_files() -> List[str]:
     except Exception:
         return []
 
-def list_all_files(exclude_dirs: Optional[set] = None) -> List[str]:
-    exclude = exclude_dirs or DEFAULT_EXCLUDE_DIRS
-    files: List[str] = []
-    root = Path(".").resolve()
+def _excluded(path: str, exclude: set) -> bool:
+    # .github stays listed (the bots' own sources); other excluded names at any depth
+    return any(seg in exclude and seg != ".github" for seg in path.split("/")[:-1])
+
+def _git_entries(root: str) -> Optional[List[Tuple[str, Optional[str], Optional[int]]]]:
+    """(path, sha, mode) of index and untracked-not-ignored files; None if git is unavailable."""
+    import subprocess
+    try:
+        # both listings run concurrently
+        staged = subprocess.Popen(["git", "ls-files", "-s", "-z"], cwd=root,
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        others = subprocess.Popen(["git", "ls-files", "-z", "--others", "--exclude-standard"], cwd=root,
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        staged_out, _ = staged.communicate()
+        others_out, _ = others.communicate()
+    except OSError:
+        return None
+    if staged.returncode != 0 or others.returncode != 0:
+        return None
+    entries = []
+    for rec in staged_out.decode("utf-8", "surrogateescape").split("\0"):
+        if not rec:
+            continue
+        meta, _, path = rec.partition("\t")
+        mode, sha, _stage = meta.split(" ")
+        if mode == "160000":
+            continue  # submodule commit, not a file
+        entries.append((path, sha, int(mode, 8)))
+    for path in others_out.decode("utf-8", "surrogateescape").split("\0"):
+        if path:
+            entries.append((path, None, None))
+    return entries
+
+def _walk_entries(root: str, exclude: set) -> List[Tuple[str, Optional[str], Optional[int]]]:
+    entries = []
     for r, dirs, fnames in os.walk(root):
-        # mutate dirs to prune
-        pruned = []
-        for d in list(dirs):
-            if d in exclude and (root / d).resolve() != (root / ".github").resolve():
-                pruned.append(d)
-        for d in pruned:
-            dirs.remove(d)
-        for fn in fnames:
-            p = (Path(r) / fn).resolve()
-            rel = p.relative_to(root).as_posix()
-            if rel.startswith(".git/"):
-                continue
-            files.append(rel)
-    return sorted(set(files))
+        dirs[:] = [d for d in dirs if d == ".github" or (d not in exclude and d != ".git")]
+        rel = os.path.relpath(r, root).replace(os.sep, "/")
+        prefix = "" if rel == "." else rel + "/"
+        entries.extend((prefix + fn, None, None) for fn in fnames)
+    return entries
+
+def inventory(exclude_dirs: Optional[set] = None, refresh: bool = False) -> Dict[str, FileEntry]:
+    """path → FileEntry for every file of the working tree, memoized for the process.
+
+    Built from `git ls-files -s` plus untracked, not ignored files (os.walk outside
+    a git checkout); every file is lstat'ed exactly once. Files deleted from the
+    working tree are left out. Pass refresh=True after creating or deleting files.
+    """
+    exclude = exclude_dirs or DEFAULT_EXCLUDE_DIRS
+    root = os.path.abspath(".")
+    key = (root, frozenset(exclude))
+    if not refresh and key in _INVENTORY:
+        return _INVENTORY[key]
+    entries = _git_entries(root)
+    if entries is None:
+        entries = _walk_entries(root, exclude)
+    files: Dict[str, FileEntry] = {}
+    for path, sha, mode in entries:
+        if path in files or _excluded(path, exclude):
+            continue  # unmerged paths are listed once per stage
+        try:
+            st = os.lstat(os.path.join(root, path))
+        except OSError:
+            continue
+        files[path] = FileEntry(path, sha, mode or st.st_mode, st.st_size)
+    _INVENTORY[key] = dict(sorted(files.items()))
+    return _INVENTORY[key]
+
+def list_all_files(exclude_dirs: Optional[set] = None) -> List[str]:
+    return list(inventory(exclude_dirs))
+
+def file_size(path: str) -> int:
+    """Size from the inventory; files outside it (e.g. created since) are stat'ed."""
+    entry = inventory().get(path)
+    if entry is not None:
+        return entry.size
+    try:
+        return os.lstat(path).st_size
+    except OSError:
+        return 0
+
+def largest_files(files: List[str], n: int = 15) -> List[Dict[str, Any]]:
+    sized = sorted(((file_size(p), p) for p in files), key=lambda t: t[0], reverse=True)[:n]
+    return [{"path": p, "bytes": s} for s, p in sized]
+
+def total_size_kb(files: List[str]) -> float:
+    return round(sum(file_size(p) for p in files)/1024, 2)
 
 def language_stats(files: List[str]) -> Dict[str, float]:
     exts = {}
     for p in files:
         ext = Path(p).suffix.lower().lstrip(".") or "(none)"
-        exts.setdefault(ext, 0)
-        try:
-            exts[ext] += Path(p).stat().st_size
-        except Exception:
-            pass
+        exts[ext] = exts.get(ext, 0) + file_size(p)
     return {k: round(v/1024, 2) for k, v in sorted(exts.items(), key=lambda kv: kv[1], reverse=True)}
 
 def detect_stack_files(files: List[str]) -> Dict[str, List[str]]:
@@ -82,10 +82,12 @@ echo -e "${GREEN}═════════════════════
 echo -e "${GREEN}  Scope Guard hooks installed successfully!${NC}"
 echo -e "${GREEN}═══════════════════════════════════════════════════════════════${NC}"
 echo ""
-echo "The pre-commit hook will now check all staged files before each commit."
+echo "The pre-commit hook will now check all staged files before each commit"
+echo "(scope, forbidden patterns, naming and layer rules, run concurrently)."
 echo ""
 echo "Commands:"
 echo "  python3 tools/scope-guard-cli.py check <file>      # Check single file"
+echo "  python3 tools/scope-guard-cli.py pre-commit        # All commit-time checks (the hook)"
 echo "  python3 tools/scope-guard-cli.py check-staged      # Check staged files"
 echo "  python3 tools/scope-guard-cli.py status <file>     # Show file status"
 echo ""
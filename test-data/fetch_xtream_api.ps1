@@ -22,9 +22,13 @@ Write-Host "Username: $USER"
 Write-Host "Password: $PASS"
 Write-Host ""
 
-# Output directory
+# Output directory; responses land in a staging directory and replace the
+# snapshot in OUT_DIR only once the schema drift gate passes
 $OUT_DIR = ".\xtream-responses"
+$STAGE_DIR = "$OUT_DIR.new"
+if (Test-Path $STAGE_DIR) { Remove-Item -Recurse -Force $STAGE_DIR }
 New-Item -ItemType Directory -Force -Path $OUT_DIR | Out-Null
+New-Item -ItemType Directory -Force -Path $STAGE_DIR | Out-Null
 
 $BASE_URL = "http://${HOST_NAME}:${PORT}/player_api.php"
 
@@ -49,7 +53,7 @@ $endpoints = @{
 Write-Host "=== Fetching API Responses ===" -ForegroundColor Cyan
 foreach ($name in $endpoints.Keys) {
     $url = "$BASE_URL`?$($endpoints[$name])"
-    $outfile = "$OUT_DIR\$name.json"
+    $outfile = "$STAGE_DIR\$name.json"
     
     Write-Host "Fetching $name... " -NoNewline
     
@@ -70,7 +74,7 @@ Write-Host "=== Fetching Sample VOD Category (384) ===" -ForegroundColor Cyan
 try {
     $url = "$BASE_URL`?username=$USER&password=$PASS&action=get_vod_streams&category_id=384"
     $response = Invoke-WebRequest -Uri $url -Headers $headers -TimeoutSec 60 -UseBasicParsing
-    $response.Content | Out-File -FilePath "$OUT_DIR\vod_streams_cat_384.json" -Encoding UTF8
+    $response.Content | Out-File -FilePath "$STAGE_DIR\vod_streams_cat_384.json" -Encoding UTF8
     Write-Host "Saved: vod_streams_cat_384.json" -ForegroundColor Green
 }
 catch {
@@ -80,7 +84,7 @@ catch {
 # Fetch sample series info
 Write-Host ""
 Write-Host "=== Fetching Sample Series Info ===" -ForegroundColor Cyan
-$seriesFile = "$OUT_DIR\series.json"
+$seriesFile = "$STAGE_DIR\series.json"
 if (Test-Path $seriesFile) {
     $seriesData = Get-Content $seriesFile | ConvertFrom-Json
     if ($seriesData.Count -gt 0) {
@@ -88,7 +92,7 @@ if (Test-Path $seriesFile) {
         try {
             $url = "$BASE_URL`?username=$USER&password=$PASS&action=get_series_info&series_id=$seriesId"
             $response = Invoke-WebRequest -Uri $url -Headers $headers -TimeoutSec 60 -UseBasicParsing
-            $response.Content | Out-File -FilePath "$OUT_DIR\series_info_sample.json" -Encoding UTF8
+            $response.Content | Out-File -FilePath "$STAGE_DIR\series_info_sample.json" -Encoding UTF8
             Write-Host "Saved: series_info_sample.json (series_id=$seriesId)" -ForegroundColor Green
         }
         catch {
@@ -97,6 +101,29 @@ if (Test-Path $seriesFile) {
     }
 }
 
+# Schema drift gate: validate the fresh snapshot before it replaces the old one
+Write-Host ""
+Write-Host "=== Schema Drift Gate ===" -ForegroundColor Cyan
+$gateFailed = $false
+$python = Get-Command python3 -ErrorAction SilentlyContinue
+if (-not $python) { $python = Get-Command python -ErrorAction SilentlyContinue }
+if ($python) {
+    & $python.Source "$PSScriptRoot\xtream_schema_drift.py" --dir $STAGE_DIR --gate --json "$STAGE_DIR\schema_drift.json"
+    if ($LASTEXITCODE -ne 0) { $gateFailed = $true }
+}
+else {
+    Write-Host "python not found - skipped" -ForegroundColor Yellow
+}
+
+if ($gateFailed) {
+    Write-Host ""
+    Write-Host "Schema drift gate failed - $OUT_DIR was left unchanged." -ForegroundColor Red
+    Write-Host "Review $STAGE_DIR\schema_drift.json; the rejected snapshot stays in $STAGE_DIR." -ForegroundColor Red
+    exit 1
+}
+Move-Item -Force "$STAGE_DIR\*.json" $OUT_DIR
+Remove-Item -Recurse -Force $STAGE_DIR
+
 Write-Host ""
 Write-Host "=== Summary ===" -ForegroundColor Cyan
 Get-ChildItem "$OUT_DIR\*.json" | ForEach-Object { Write-Host "$($_.Name) - $($_.Length) bytes" }
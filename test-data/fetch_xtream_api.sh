@@ -21,9 +21,12 @@ echo "Username: $USER"
 echo "Password: $PASS"
 echo ""
 
-# Output directory
+# Output directory; responses land in a staging directory and replace the
+# snapshot in OUT_DIR only once the schema drift gate passes
 OUT_DIR="./xtream-responses"
-mkdir -p "$OUT_DIR"
+STAGE_DIR="$OUT_DIR.new"
+rm -rf "$STAGE_DIR"
+mkdir -p "$OUT_DIR" "$STAGE_DIR"
 
 # Common headers (IBOPlayer style)
 HEADERS=(
@@ -50,7 +53,7 @@ declare -A ENDPOINTS=(
 echo "=== Fetching API Responses ==="
 for name in "${!ENDPOINTS[@]}"; do
   url="$BASE_URL?${ENDPOINTS[$name]}"
-  outfile="$OUT_DIR/${name}.json"
+  outfile="$STAGE_DIR/${name}.json"
   
   echo -n "Fetching $name... "
   
@@ -76,21 +79,41 @@ echo ""
 echo "=== Fetching Sample VOD Category (384) ==="
 curl -s --max-time 60 "${HEADERS[@]}" --compressed \
   "$BASE_URL?username=$USER&password=$PASS&action=get_vod_streams&category_id=384" \
-  -o "$OUT_DIR/vod_streams_cat_384.json"
-echo "Saved: vod_streams_cat_384.json ($(wc -c < "$OUT_DIR/vod_streams_cat_384.json") bytes)"
+  -o "$STAGE_DIR/vod_streams_cat_384.json"
+echo "Saved: vod_streams_cat_384.json ($(wc -c < "$STAGE_DIR/vod_streams_cat_384.json") bytes)"
 
 # Fetch one series info as sample
 echo ""
 echo "=== Fetching Sample Series Info ==="
 # First get series list to find an ID
-SERIES_ID=$(cat "$OUT_DIR/series.json" 2>/dev/null | grep -o '"series_id":[0-9]*' | head -1 | cut -d: -f2)
+SERIES_ID=$(cat "$STAGE_DIR/series.json" 2>/dev/null | grep -o '"series_id":[0-9]*' | head -1 | cut -d: -f2)
 if [ -n "$SERIES_ID" ]; then
   curl -s --max-time 60 "${HEADERS[@]}" --compressed \
     "$BASE_URL?username=$USER&password=$PASS&action=get_series_info&series_id=$SERIES_ID" \
-    -o "$OUT_DIR/series_info_sample.json"
+    -o "$STAGE_DIR/series_info_sample.json"
   echo "Saved: series_info_sample.json for series_id=$SERIES_ID"
 fi
 
+# Schema drift gate: validate the fresh snapshot before it replaces the old one
+echo ""
+echo "=== Schema Drift Gate ==="
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+GATE_FAILED=0
+if command -v python3 >/dev/null 2>&1; then
+  python3 "$SCRIPT_DIR/xtream_schema_drift.py" --dir "$STAGE_DIR" --gate --json "$STAGE_DIR/schema_drift.json" || GATE_FAILED=1
+else
+  echo "python3 not found - skipped"
+fi
+
+if [ "$GATE_FAILED" -ne 0 ]; then
+  echo ""
+  echo "⚠️  Schema drift gate failed - $OUT_DIR was left unchanged."
+  echo "    Review $STAGE_DIR/schema_drift.json; the rejected snapshot stays in $STAGE_DIR."
+  exit 1
+fi
+mv -f "$STAGE_DIR"/*.json "$OUT_DIR"/
+rmdir "$STAGE_DIR" 2>/dev/null
+
 echo ""
 echo "=== Summary ==="
 ls -la "$OUT_DIR"/*.json 2>/dev/null | awk '{print $9, $5}'
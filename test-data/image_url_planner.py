@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Poster/Icon URL Deduplication & Prefetch Planner.
+
+`stream_icon` / `cover` / `backdrop_path` URLs (mostly image.tmdb.org) repeat
+heavily across VOD, series and category duplicates, while the app's image
+pipeline fetches them per item. This tool answers "how big does the image
+cache need to be?":
+
+1. Extracts every image URL from a snapshot (live, VOD, series).
+2. Canonicalizes size variants: image.tmdb.org/t/p/<size>/<file> → one key per
+   file (w600_and_h900_bestv2, w300, original, ... collapse); the key is
+   host + path, so scheme (http/https) and query string are dropped.
+3. Reports unique-URL cardinality (raw vs canonical) and per-host distribution.
+4. Builds a prefetch order: categories by popularity (item count), items in
+   provider order, first occurrence of each canonical URL wins.
+5. Starts a local stand-in image server and replays a popularity-skewed
+   browsing trace through an LRU byte cache of several sizes, measuring the
+   hit ratio and fetched bytes with raw URL keys vs canonical keys. Every
+   miss fetches the variant actually requested, sized by its TMDB width.
+
+Usage:
+  python3 test-data/image_url_planner.py
+  python3 test-data/image_url_planner.py --cache-sizes 16,32,64,128 --requests 50000
+  python3 test-data/image_url_planner.py --plan prefetch.txt --json image_report.json
+"""
+import argparse
+import hashlib
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+from urllib.parse import quote, urlsplit
+
+DATA_DIR = Path(__file__).parent / "xtream-responses"
+DEFAULT_LIVE = DATA_DIR / "live_streams.json"
+DEFAULT_VOD = DATA_DIR / "vod_streams.json"
+DEFAULT_SERIES = DATA_DIR / "series.json"
+
+IMAGE_FIELDS = {
+    "live": ("stream_icon",),
+    "vod": ("stream_icon", "cover"),
+    "series": ("cover", "backdrop_path"),
+}
+TMDB_HOST = "image.tmdb.org"
+TMDB_ORIGINAL_WIDTH = 2000   # "original" variants, for size simulation
+
+
+class ImageRef(NamedTuple):
+    kind: str
+    category: str
+    item: int
+    field: str
+    url: str
+    key: str
+
+
+# ============================================================================
+# Extraction & canonicalization
+# ============================================================================
+
+def canonicalize(url: str) -> Optional[tuple[str, str]]:
+    """
+    Return (host, canonical_key) or None for empty/invalid URLs.
+
+    TMDB size variants map to one key per image file.
+    """
+    url = (url or "").strip()
+    if not url or "://" not in url:
+        return None
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if not host:
+        return None
+    path = parts.path
+    if host == TMDB_HOST and path.startswith("/t/p/"):
+        segments = path.split("/", 4)  # ['', 't', 'p', '<size>', '<file>']
+        if len(segments) == 5:
+            path = f"/t/p/*/{segments[4]}"
+    return host, f"{host}{path}"
+
+
+def _field_urls(value) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for v in value:
+            if isinstance(v, str):
+                yield v
+
+
+def extract_refs(kind: str, items: list[dict]) -> Iterator[ImageRef]:
+    fields = IMAGE_FIELDS[kind]
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        category = str(item.get("category_id") or "")
+        for field in fields:
+            for url in _field_urls(item.get(field)):
+                canon = canonicalize(url)
+                if canon:
+                    yield ImageRef(kind, category, index, field, url.strip(), canon[1])
+
+
+def load_snapshot(paths: dict[str, Path]) -> list[ImageRef]:
+    refs: list[ImageRef] = []
+    for kind, path in paths.items():
+        if not path.exists():
+            print(f"⚠️  {kind}: {path} not found - skipped")
+            continue
+        with open(path, encoding="utf-8") as f:
+            refs.extend(extract_refs(kind, json.load(f)))
+    return refs
+
+
+# ============================================================================
+# Analysis
+# ============================================================================
+
+def cardinality(refs: list[ImageRef]) -> dict:
+    hosts_refs = Counter()
+    hosts_unique: dict[str, set] = defaultdict(set)
+    tmdb_sizes = Counter()
+    for ref in refs:
+        host = ref.key.split("/", 1)[0]
+        hosts_refs[host] += 1
+        hosts_unique[host].add(ref.key)
+        if host == TMDB_HOST:
+            segments = urlsplit(ref.url).path.split("/")
+            if len(segments) > 3:
+                tmdb_sizes[segments[3]] += 1
+    return {
+        "references": len(refs),
+        "unique_raw": len({r.url for r in refs}),
+        "unique_canonical": len({r.key for r in refs}),
+        "hosts": [
+            {"host": h, "references": c, "unique": len(hosts_unique[h])}
+            for h, c in hosts_refs.most_common()
+        ],
+        "tmdb_sizes": dict(tmdb_sizes.most_common()),
+    }
+
+
+def category_popularity(refs: list[ImageRef]) -> Counter:
+    """Popularity = number of distinct items per (kind, category)."""
+    return Counter({cat: len(items) for cat, items in _items_by_category(refs).items()})
+
+
+def _items_by_category(refs: list[ImageRef]) -> dict[tuple[str, str], dict[int, list[ImageRef]]]:
+    grouped: dict[tuple[str, str], dict[int, list[ImageRef]]] = defaultdict(lambda: defaultdict(list))
+    for ref in refs:
+        grouped[(ref.kind, ref.category)][ref.item].append(ref)
+    return grouped
+
+
+def prefetch_order(refs: list[ImageRef]) -> list[str]:
+    """Canonical keys ordered by category popularity, then provider order."""
+    grouped = _items_by_category(refs)
+    popularity = category_popularity(refs)
+    order: dict[str, None] = {}
+    for cat, _count in popularity.most_common():
+        for item in sorted(grouped[cat]):
+            for ref in grouped[cat][item]:
+                order.setdefault(ref.key, None)
+    return list(order)
+
+
+# ============================================================================
+# Stand-in image server & cache simulation
+# ============================================================================
+
+def _image_size(path: str) -> int:
+    """
+    Deterministic payload size per requested variant.
+
+    The image file sets a base of 15-120 KiB at 500 px width; a TMDB width
+    segment (w92, w600_and_h900_bestv2, original, ...) scales it by pixel
+    area, so variants of one poster differ in bytes as real ones do.
+    """
+    file_path, width = path, 500
+    segments = path.split("/", 4)  # ['', 't', 'p', '<size>', '<file>']
+    if len(segments) == 5 and segments[1:3] == ["t", "p"]:
+        file_path = segments[4]
+        size_segment = segments[3]
+        digits = size_segment[1:].split("_", 1)[0]
+        if size_segment == "original":
+            width = TMDB_ORIGINAL_WIDTH
+        elif size_segment[:1] == "w" and digits.isdigit():
+            width = int(digits)
+    digest = int.from_bytes(hashlib.blake2b(file_path.encode("utf-8"), digest_size=4).digest(), "big")
+    base = 15 * 1024 + digest % (105 * 1024)
+    return max(2 * 1024, int(base * (width / 500) ** 2))
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    """
+    Answers any path with a small placeholder body and the simulated image size
+    in X-Image-Size; the simulation accounts bytes from that header instead of
+    pushing gigabytes through the loopback.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # keep-alive + small writes would hit delayed ACKs
+    _placeholder = b"\xff\xd8\xff\xd9"  # empty JPEG (SOI + EOI)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(self._placeholder)))
+        self.send_header("X-Image-Size", str(_image_size(self.path)))
+        self.end_headers()
+        self.wfile.write(self._placeholder)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInImageServer:
+    """Local HTTP server answering any image path with deterministic bytes."""
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+
+class LruByteCache:
+    """LRU cache bounded by total payload bytes."""
+
+    def __init__(self, capacity_bytes: int):
+        self.capacity = capacity_bytes
+        self.entries: OrderedDict[str, int] = OrderedDict()
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.fetched_bytes = 0
+
+    def get(self, key: str) -> bool:
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def put(self, key: str, size: int):
+        self.fetched_bytes += size
+        if size > self.capacity:
+            return
+        self.entries[key] = size
+        self.used += size
+        while self.used > self.capacity:
+            _, evicted = self.entries.popitem(last=False)
+            self.used -= evicted
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def browsing_trace(refs: list[ImageRef], requests: int, seed: int) -> list[ImageRef]:
+    """
+    Popularity-skewed browsing: pick a category weighted by item count, then an
+    item near the top of that category (rows are scrolled from the start).
+    """
+    rng = random.Random(seed)
+    grouped = _items_by_category(refs)
+    categories = list(grouped)
+    weights = [len(grouped[c]) for c in categories]
+    item_lists = {c: sorted(grouped[c]) for c in categories}
+    trace: list[ImageRef] = []
+    while len(trace) < requests:
+        cat = rng.choices(categories, weights)[0]
+        items = item_lists[cat]
+        position = min(len(items) - 1, int(rng.expovariate(1 / 25)))
+        trace.extend(grouped[cat][items[position]])
+    return trace[:requests]
+
+
+def simulate(trace: list[ImageRef], capacity_mb: float, port: int, canonical: bool) -> dict:
+    cache = LruByteCache(int(capacity_mb * 1024 * 1024))
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    start = time.perf_counter()
+    for ref in trace:
+        key = ref.key if canonical else ref.url
+        if cache.get(key):
+            continue
+        # Fetch the requested variant; with canonical keys it serves every other size too
+        conn.request("GET", quote(urlsplit(ref.url).path or "/", safe="/%"))
+        response = conn.getresponse()
+        response.read()
+        cache.put(key, int(response.getheader("X-Image-Size", "0")))
+    conn.close()
+    return {
+        "capacity_mb": capacity_mb,
+        "keys": "canonical" if canonical else "raw",
+        "hit_ratio": round(cache.hit_ratio, 4),
+        "misses": cache.misses,
+        "fetched_mb": round(cache.fetched_bytes / (1024 * 1024), 1),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Image URL dedup & prefetch planner",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--live", type=Path, default=DEFAULT_LIVE, help="get_live_streams JSON")
+    parser.add_argument("--vod", type=Path, default=DEFAULT_VOD, help="get_vod_streams JSON")
+    parser.add_argument("--series", type=Path, default=DEFAULT_SERIES, help="get_series JSON")
+    parser.add_argument("--cache-sizes", default="16,32,64,128,256,512,1024",
+                        help="Cache sizes in MiB to simulate (default: 16,32,64,128,256,512,1024)")
+    parser.add_argument("--requests", type=int, default=20000, help="Browsing trace length")
+    parser.add_argument("--target-hit-ratio", type=float, default=0.9,
+                        help="Hit ratio the recommended cache size must reach")
+    parser.add_argument("--seed", type=int, default=42, help="Trace seed")
+    parser.add_argument("--plan", type=Path, help="Write prefetch order (one canonical key per line)")
+    parser.add_argument("--json", type=Path, help="Write machine-readable report")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("=== IMAGE URL DEDUP & PREFETCH PLANNER ===")
+    print("=" * 70)
+
+    refs = load_snapshot({"live": args.live, "vod": args.vod, "series": args.series})
+    if not refs:
+        print("ERROR: no image URLs found", file=sys.stderr)
+        sys.exit(2)
+
+    card = cardinality(refs)
+    print(f"\nReferences:        {card['references']}")
+    print(f"Unique raw URLs:   {card['unique_raw']}")
+    print(f"Unique canonical:  {card['unique_canonical']} "
+          f"(-{card['unique_raw'] - card['unique_canonical']} size variants)")
+    print("\nPer host (references / unique):")
+    for h in card["hosts"][:10]:
+        print(f"  {h['host']:<40} {h['references']:>7} / {h['unique']:>7}")
+    if card["tmdb_sizes"]:
+        print("TMDB size variants: " + ", ".join(f"{k}={v}" for k, v in card["tmdb_sizes"].items()))
+
+    order = prefetch_order(refs)
+    popularity = category_popularity(refs)
+    print(f"\nPrefetch order: {len(order)} canonical images across {len(popularity)} categories")
+    for (kind, cat), count in popularity.most_common(5):
+        print(f"  {kind}:{cat} ({count} items)")
+    if args.plan:
+        args.plan.write_text("\n".join(order) + "\n", encoding="utf-8")
+        print(f"Prefetch plan written: {args.plan}")
+
+    sizes = [float(s) for s in args.cache_sizes.split(",") if s.strip()]
+    trace = browsing_trace(refs, args.requests, args.seed)
+    print(f"\nCache simulation: {len(trace)} requests against local stand-in server")
+    results = []
+    with StandInImageServer() as server:
+        for size in sizes:
+            raw = simulate(trace, size, server.port, canonical=False)
+            canon = simulate(trace, size, server.port, canonical=True)
+            results += [raw, canon]
+            print(f"  {size:>6.0f} MiB  raw keys: {raw['hit_ratio']:6.1%} "
+                  f"({raw['fetched_mb']:>6.1f} MiB fetched)   "
+                  f"canonical: {canon['hit_ratio']:6.1%} ({canon['fetched_mb']:>6.1f} MiB fetched)")
+
+    recommended = next((r["capacity_mb"] for r in results
+                        if r["keys"] == "canonical" and r["hit_ratio"] >= args.target_hit_ratio), None)
+    if recommended is not None:
+        print(f"\n✅ Recommended image cache: {recommended:.0f} MiB "
+              f"(≥ {args.target_hit_ratio:.0%} hit ratio with canonical keys)")
+    else:
+        print(f"\n⚠️  No simulated size reaches {args.target_hit_ratio:.0%} - try larger --cache-sizes")
+
+    if args.json:
+        report = {"cardinality": card, "prefetch_count": len(order),
+                  "simulation": results, "recommended_cache_mb": recommended}
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
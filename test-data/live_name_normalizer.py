@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Live Channel Name Normalizer - reusable normalization + memo cache for Xtream live names.
+
+analyze_pipeline_compatibility.py flags that live names contain box-drawing
+decorators (▃ ▅ ▆ █); golden/real-chain/live_unicode_decorators.json pins the
+expected result ("▃ ▅ ▆ █ DE HEVC █ ▆ ▅ ▃" → "DE HEVC").
+
+Per name this module produces:
+  display   NFKC-normalized, decorators stripped, whitespace collapsed
+            (matches step3_raw.originalTitle of the golden fixtures)
+  country   Country prefix ("DE: SAT.1" → "DE"), or None
+  quality   Resolution tier from the suffix (UHD/FHD/HD/SD), or None
+  base      display without country prefix and quality/codec suffix
+  key       casefolded, punctuation-free base for joins and dedup
+  decorated True if the raw name carried decorators (category header rows)
+
+The translate table is precomputed once, ASCII names skip NFKC entirely, and
+results are memoized: the same ~11.5k names recur in every snapshot.
+
+Usage as library:
+  from live_name_normalizer import normalize_name, normalize_batch
+  normalize_name("DE: SAT.1 HEVC").country  # "DE"
+
+Usage as script:
+  python3 test-data/live_name_normalizer.py                 # summary over live_streams.json
+  python3 test-data/live_name_normalizer.py --check-golden  # verify golden fixtures
+  python3 test-data/live_name_normalizer.py --bench         # throughput benchmark
+"""
+import argparse
+import json
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+DATA_DIR = Path(__file__).parent / "xtream-responses"
+GOLDEN_DIR = Path(__file__).parent / "golden" / "real-chain"
+DEFAULT_LIVE = DATA_DIR / "live_streams.json"
+
+CACHE_SIZE = 65536
+BENCH_TARGET_NAMES_PER_SEC = 150_000  # cold cache, full live list
+
+# ============================================================================
+# Translate table (built once)
+# ============================================================================
+
+# Decorative code point ranges → space
+DECORATOR_RANGES = [
+    (0x2190, 0x21FF),  # Arrows
+    (0x2500, 0x257F),  # Box Drawing
+    (0x2580, 0x259F),  # Block Elements (▃ ▅ ▆ █)
+    (0x25A0, 0x25FF),  # Geometric Shapes
+    (0x2600, 0x26FF),  # Miscellaneous Symbols (★ ☆)
+    (0x2700, 0x27BF),  # Dingbats (✪ ➾)
+    (0x2B00, 0x2BFF),  # Miscellaneous Symbols and Arrows
+]
+# Invisible characters → removed
+INVISIBLE_CODEPOINTS = [0x200B, 0x200C, 0x200D, 0x2060, 0xFEFF]
+
+
+def _build_translate_table() -> dict[int, Optional[str]]:
+    table: dict[int, Optional[str]] = {}
+    for start, end in DECORATOR_RANGES:
+        for cp in range(start, end + 1):
+            table[cp] = " "
+    for cp in INVISIBLE_CODEPOINTS:
+        table[cp] = None
+    return table
+
+
+DECORATOR_TABLE = _build_translate_table()
+_DECORATOR_CHARS = frozenset(chr(cp) for cp, repl in DECORATOR_TABLE.items() if repl == " ")
+
+COUNTRY_PREFIX_RE = re.compile(r"^(?:\|\s*([A-Z]{2,3})\s*\||\[\s*([A-Z]{2,3})\s*\]|([A-Z]{2,3})\s*[:|])\s*")
+QUALITY_SUFFIX_RE = re.compile(r"(?:[\s\-|]+(?:UHD|FHD|HD|SD|4K|8K|HEVC|H\.?265|H\.?264|RAW|50FPS|60FPS))+\s*$", re.I)
+QUALITY_TIERS = (("UHD", "UHD"), ("4K", "UHD"), ("8K", "UHD"), ("FHD", "FHD"), ("HD", "HD"), ("SD", "SD"))
+NON_ALNUM_RE = re.compile(r"[\W_]+")
+
+
+class NormalizedName(NamedTuple):
+    raw: str
+    display: str
+    country: Optional[str]
+    quality: Optional[str]
+    base: str
+    key: str
+    decorated: bool
+
+
+# ============================================================================
+# Normalization
+# ============================================================================
+
+def strip_decorators(text: str) -> str:
+    """NFKC-normalize and replace decorator glyphs with spaces (ASCII fast path)."""
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFKC", text).translate(DECORATOR_TABLE)
+
+
+def _quality_tier(suffix: str) -> Optional[str]:
+    tokens = set(suffix.upper().replace("-", " ").replace("|", " ").split())
+    for token, tier in QUALITY_TIERS:
+        if token in tokens:
+            return tier
+    return None
+
+
+def _normalize_uncached(raw: str) -> NormalizedName:
+    decorated = not raw.isascii() and any(ch in _DECORATOR_CHARS for ch in raw)
+    display = " ".join(strip_decorators(raw).split())
+
+    base = display
+    country = None
+    m = COUNTRY_PREFIX_RE.match(base)
+    if m:
+        country = m.group(1) or m.group(2) or m.group(3)
+        base = base[m.end():]
+
+    quality = None
+    m = QUALITY_SUFFIX_RE.search(base)
+    if m and m.start() > 0:
+        quality = _quality_tier(m.group(0))
+        base = base[:m.start()]
+    base = base.strip(" -|")
+
+    key = NON_ALNUM_RE.sub(" ", base.casefold()).strip()
+    return NormalizedName(raw, display, country, quality, base, key, decorated)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_name(raw: str) -> NormalizedName:
+    """Normalize a single live channel name (memoized)."""
+    return _normalize_uncached(raw or "")
+
+
+def normalize_batch(names: Iterable[str]) -> list[NormalizedName]:
+    """
+    Normalize many names at once.
+
+    Duplicates inside the batch are resolved through a local dict before
+    touching the shared LRU cache, so a snapshot with repeated names costs one
+    normalization per distinct name.
+    """
+    local: dict[str, NormalizedName] = {}
+    out = []
+    for name in names:
+        result = local.get(name)
+        if result is None:
+            result = normalize_name(name)
+            local[name] = result
+        out.append(result)
+    return out
+
+
+def cache_info():
+    return normalize_name.cache_info()
+
+
+def cache_clear():
+    normalize_name.cache_clear()
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def load_live_names(path: Path) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return [str(item.get("name") or "") for item in data if isinstance(item, dict)]
+
+
+def check_golden() -> int:
+    """Verify display names against step3_raw.originalTitle of live golden fixtures."""
+    failures = 0
+    fixtures = sorted(GOLDEN_DIR.glob("live_*.json"))
+    for fixture in fixtures:
+        data = json.loads(fixture.read_text(encoding="utf-8"))
+        raw = (data.get("step1_transport") or {}).get("name", "")
+        expected = (data.get("step3_raw") or {}).get("originalTitle", "")
+        got = normalize_name(raw).display
+        ok = got == expected.strip()
+        failures += not ok
+        print(f"  {'✅' if ok else '❌'} {fixture.name}: '{raw}' → '{got}' (expected '{expected}')")
+    print(f"\n{len(fixtures) - failures}/{len(fixtures)} golden fixtures match")
+    return 0 if failures == 0 else 1
+
+
+def bench(names: list[str], rounds: int) -> int:
+    """Cold and warm throughput over the full live list."""
+    print(f"Benchmark: {len(names)} names, {len(set(names))} distinct, {rounds} rounds")
+
+    cold = []
+    for _ in range(rounds):
+        cache_clear()
+        start = time.perf_counter()
+        normalize_batch(names)
+        cold.append(time.perf_counter() - start)
+
+    warm = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        normalize_batch(names)
+        warm.append(time.perf_counter() - start)
+
+    best_cold, best_warm = min(cold), min(warm)
+    cold_rate = len(names) / best_cold
+    print(f"  Cold: {best_cold * 1000:7.1f} ms  ({cold_rate:,.0f} names/s)")
+    print(f"  Warm: {best_warm * 1000:7.1f} ms  ({len(names) / best_warm:,.0f} names/s)")
+    print(f"  Cache: {cache_info()}")
+
+    if cold_rate < BENCH_TARGET_NAMES_PER_SEC:
+        print(f"❌ Below target of {BENCH_TARGET_NAMES_PER_SEC:,} names/s (cold)")
+        return 1
+    print(f"✅ Target met: ≥ {BENCH_TARGET_NAMES_PER_SEC:,} names/s (cold)")
+    return 0
+
+
+def summarize(names: list[str]):
+    results = normalize_batch(names)
+    countries = Counter(r.country for r in results if r.country)
+    qualities = Counter(r.quality for r in results if r.quality)
+    decorated = [r for r in results if r.decorated]
+
+    print(f"Live names: {len(results)} ({len(set(names))} distinct)")
+    print(f"  Decorated (header rows): {len(decorated)}")
+    for r in decorated[:5]:
+        print(f"    '{r.raw}' → '{r.display}'")
+    print(f"  With country prefix: {sum(countries.values())}")
+    for country, count in countries.most_common(10):
+        print(f"    {country}: {count}")
+    print(f"  With quality suffix: {sum(qualities.values())}")
+    for quality, count in qualities.most_common():
+        print(f"    {quality}: {count}")
+    print(f"  Distinct keys: {len({r.key for r in results})}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Live channel name normalizer",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--live", type=Path, default=DEFAULT_LIVE, help="get_live_streams JSON")
+    parser.add_argument("--check-golden", action="store_true", help="Verify golden fixtures")
+    parser.add_argument("--bench", action="store_true", help="Run throughput benchmark")
+    parser.add_argument("--rounds", type=int, default=5, help="Benchmark rounds (default: 5)")
+    args = parser.parse_args()
+
+    if args.check_golden:
+        sys.exit(check_golden())
+
+    if not args.live.exists():
+        print(f"ERROR: {args.live} not found", file=sys.stderr)
+        sys.exit(2)
+    names = load_live_names(args.live)
+
+    if args.bench:
+        sys.exit(bench(names, args.rounds))
+    summarize(names)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Trigram Fuzzy Title Index - duplicate / near-duplicate detection for Xtream catalogs.
+
+Providers list the same film many times across categories and quality variants:
+
+    "Sisu: Road to Revenge | 2025 | 7.4"
+    "Sisu.Road.to.Revenge.2025.German.DL.2160p.WEB.H265"
+    "▃ Sisu - Road to Revenge (2025) [4K] ▃"
+
+This tool normalizes titles (pipes, years, quality tags, unicode decorators,
+country prefixes) and clusters them in two stages:
+
+1. Exact stage: items with the same normalized key + compatible year collapse
+   into one document (cheap dict grouping).
+2. Fuzzy stage: documents are compared by trigram Jaccard similarity using an
+   inverted index with prefix filtering (AllPairs), bucketed by year. Only
+   documents of the same year sharing one of their rarest trigrams become
+   candidates, so we never do O(n²) comparisons.
+
+Usage:
+  python3 test-data/title_dedup_index.py
+  python3 test-data/title_dedup_index.py --vod path/to/vod_streams.json --series path/to/series.json
+  python3 test-data/title_dedup_index.py --threshold 0.8 --top 20 --json dedup_report.json
+"""
+import argparse
+import json
+import math
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from live_name_normalizer import strip_decorators
+
+DATA_DIR = Path(__file__).parent / "xtream-responses"
+DEFAULT_VOD = DATA_DIR / "vod_streams.json"
+DEFAULT_SERIES = DATA_DIR / "series.json"
+
+# ============================================================================
+# Title normalization
+# ============================================================================
+
+YEAR_RE = re.compile(r"(?<!\d)(19[0-9]{2}|20[0-9]{2})(?!\d)")
+COUNTRY_PREFIX_RE = re.compile(r"^\s*[A-Z]{2,3}\s*[:|]\s*")
+BRACKET_RE = re.compile(r"[\[(\{][^\])\}]*[\])\}]")
+QUALITY_RE = re.compile(
+    r"\b(?:2160p|1080p|720p|576p|480p|4k|8k|uhd|fhd|hd|sd|hdr(?:10)?|sdr|dv|hevc|avc|"
+    r"x26[45]|h\s?26[45]|web\s?dl|web\s?rip|webrip|bluray|blu\s?ray|bdrip|brrip|dvdrip|"
+    r"hdtv|remux|dts|ac3|eac3|aac|atmos|ddp?5\s?1|dl|lowq|multi|german|ger|eng|"
+    r"subbed|3d|imax|extended|remastered|uncut|proper|repack)\b"
+)
+NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+SCENE_SEPARATORS = str.maketrans({".": " ", "_": " "})
+
+
+def _fold(text: str) -> str:
+    """Casefold and drop diacritics (ä → a) so transliterated variants match."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def normalize_title(name: str) -> tuple[str, int | None]:
+    """
+    Normalize a provider title into (key, year).
+
+    The key is lowercase ASCII-ish words separated by single spaces; year is the
+    release year when one could be identified, else None.
+    """
+    text = strip_decorators(name or "").strip()
+    text = COUNTRY_PREFIX_RE.sub("", text)
+    year = None
+
+    if "|" in text:
+        # "Title | 2025 | 7.4 | 4K" → title + year field
+        parts = [p.strip() for p in text.split("|")]
+        text = parts[0]
+        for part in parts[1:]:
+            m = YEAR_RE.fullmatch(part)
+            if m:
+                year = int(m.group(1))
+                break
+    else:
+        if " " not in text.strip() and ("." in text or "_" in text):
+            # Scene style: "Title.2025.German.DL.2160p"
+            text = text.translate(SCENE_SEPARATORS)
+        # Cut at the last year-like token that is not the start of the title
+        # ("2012 (2009)" keeps "2012" as title, "1917.2019.4K" keeps "1917").
+        for m in reversed(list(YEAR_RE.finditer(text))):
+            if m.start() > 0:
+                year = int(m.group(1))
+                text = text[:m.start()]
+                break
+
+    text = BRACKET_RE.sub(" ", text)
+    key = _fold(text)
+    key = QUALITY_RE.sub(" ", key)
+    key = NON_ALNUM_RE.sub(" ", key).strip()
+    return key, year
+
+
+# ============================================================================
+# Trigram index
+# ============================================================================
+
+def trigrams(key: str) -> set[str]:
+    """Character trigrams of a key, padded so short words still contribute."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class UnionFind:
+    """Minimal union-find with path halving."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+def build_clusters(names: list[str], threshold: float) -> dict:
+    """
+    Cluster names into duplicate groups.
+
+    Returns dict with documents, clusters (lists of item indexes), and stats
+    about how many candidate pairs were actually verified.
+    """
+    # --- Stage 1: exact grouping on (key, year) ---
+    # A year-less variant joins its keyed siblings only when the key has exactly
+    # one known year; otherwise it would bridge remakes ("Dune" 1984 vs 2021).
+    normalized = [normalize_title(name) for name in names]
+    years_by_key: dict[str, set[int]] = defaultdict(set)
+    for key, year in normalized:
+        if year is not None:
+            years_by_key[key].add(year)
+
+    doc_index: dict[tuple[str, int | None], int] = {}
+    doc_keys: list[tuple[str, int | None]] = []
+    item_doc: list[int] = []
+    for key, year in normalized:
+        if year is None and len(years_by_key.get(key, ())) == 1:
+            year = next(iter(years_by_key[key]))
+        norm = (key, year)
+        doc = doc_index.get(norm)
+        if doc is None:
+            doc = len(doc_keys)
+            doc_index[norm] = doc
+            doc_keys.append(norm)
+        item_doc.append(doc)
+
+    # --- Stage 2: fuzzy grouping (AllPairs prefix filter, bucketed by year) ---
+    uf = UnionFind(len(doc_keys))
+    grams = [trigrams(key) for key, _year in doc_keys]
+    df = Counter(g for gs in grams for g in gs)
+    ordered = [sorted(gs, key=lambda g: (df[g], g)) for gs in grams]
+    order = sorted(range(len(doc_keys)), key=lambda i: len(grams[i]))
+
+    postings: dict[tuple[int | None, str], list[int]] = defaultdict(list)
+    candidates_checked = 0
+    similar_pairs = 0
+    for i in order:
+        size = len(grams[i])
+        if size == 0:
+            continue
+        year = doc_keys[i][1]
+        prefix_len = size - math.ceil(threshold * size) + 1
+        min_size = threshold * size
+        seen: set[int] = set()
+        for g in ordered[i][:prefix_len]:
+            bucket = postings[(year, g)]
+            for j in bucket:
+                if j in seen or len(grams[j]) < min_size:
+                    continue
+                seen.add(j)
+                candidates_checked += 1
+                inter = len(grams[i] & grams[j])
+                if inter / (size + len(grams[j]) - inter) >= threshold:
+                    similar_pairs += 1
+                    uf.union(i, j)
+            bucket.append(i)
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for item, doc in enumerate(item_doc):
+        groups[uf.find(doc)].append(item)
+    clusters = sorted((g for g in groups.values() if len(g) > 1), key=len, reverse=True)
+
+    return {
+        "documents": len(doc_keys),
+        "unique_keys": len(years_by_key.keys() | {k for k, _y in doc_keys}),
+        "clusters": clusters,
+        "candidates_checked": candidates_checked,
+        "similar_pairs": similar_pairs,
+        "naive_pairs": len(doc_keys) * (len(doc_keys) - 1) // 2,
+    }
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def load_names(path: Path) -> list[str] | None:
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return [str(item.get("name") or "") for item in data if isinstance(item, dict)]
+
+
+def analyze(label: str, names: list[str], threshold: float, top: int) -> dict:
+    start = time.perf_counter()
+    result = build_clusters(names, threshold)
+    elapsed = time.perf_counter() - start
+
+    clusters = result["clusters"]
+    clustered_items = sum(len(c) for c in clusters)
+    reduction = clustered_items - len(clusters)
+
+    print(f"\n--- {label}: {len(names)} items ---")
+    print(f"  Normalized documents:  {result['documents']}")
+    print(f"  Unique title keys:     {result['unique_keys']}")
+    print(f"  Duplicate clusters:    {len(clusters)} ({clustered_items} items)")
+    print(f"  Potential reduction:   {reduction} items "
+          f"({100 * reduction / max(1, len(names)):.1f}% of catalog)")
+    print(f"  Candidate pairs:       {result['candidates_checked']} verified "
+          f"(naive: {result['naive_pairs']})")
+    print(f"  Time:                  {elapsed * 1000:.0f} ms")
+
+    samples = []
+    for cluster in clusters[:top]:
+        members = [names[i] for i in cluster]
+        samples.append({"size": len(cluster), "names": members[:8]})
+        print(f"  [{len(cluster):>3}] " + "  ≈  ".join(f"'{n[:40]}'" for n in members[:3]))
+
+    return {
+        "items": len(names),
+        "documents": result["documents"],
+        "unique_keys": result["unique_keys"],
+        "clusters": len(clusters),
+        "clustered_items": clustered_items,
+        "potential_reduction": reduction,
+        "candidates_checked": result["candidates_checked"],
+        "naive_pairs": result["naive_pairs"],
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "top_clusters": samples,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Trigram fuzzy title index for duplicate detection",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--vod", type=Path, default=DEFAULT_VOD, help="get_vod_streams JSON")
+    parser.add_argument("--series", type=Path, default=DEFAULT_SERIES, help="get_series JSON")
+    parser.add_argument("--threshold", type=float, default=0.85,
+                        help="Trigram Jaccard similarity for near-duplicates (default: 0.85)")
+    parser.add_argument("--top", type=int, default=10, help="Largest clusters to print")
+    parser.add_argument("--json", type=Path, help="Write machine-readable report")
+    args = parser.parse_args()
+
+    if not 0 < args.threshold <= 1:
+        print("ERROR: --threshold must be in (0, 1]", file=sys.stderr)
+        sys.exit(2)
+
+    print("=" * 70)
+    print("=== TRIGRAM TITLE DEDUPLICATION ===")
+    print("=" * 70)
+
+    report = {"threshold": args.threshold}
+    total_items = total_reduction = 0
+    for label, path in (("VOD", args.vod), ("SERIES", args.series)):
+        names = load_names(path)
+        if names is None:
+            print(f"\n⚠️  {label}: {path} not found - skipped")
+            continue
+        section = analyze(label, names, args.threshold, args.top)
+        report[label.lower()] = section
+        total_items += section["items"]
+        total_reduction += section["potential_reduction"]
+
+    if total_items:
+        print("\n" + "=" * 70)
+        print(f"📊 Catalog: {total_items} items → {total_items - total_reduction} "
+              f"after dedup (-{total_reduction}, {100 * total_reduction / total_items:.1f}%)")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Report written: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
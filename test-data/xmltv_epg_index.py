@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+Streaming XMLTV EPG Indexer - joins provider guides against live `epg_channel_id`.
+
+Live streams carry `epg_channel_id` (mapped in the XtreamLiveStream DTO), but
+provider XMLTV guides are often 100+ MB. This tool:
+
+1. Streams the XMLTV file with iterparse, clearing every element after use, so
+   parser memory stays flat regardless of guide size (.xml or .xml.gz).
+2. Writes a compact on-disk index: per channel, sorted int64 start/stop arrays
+   plus title references into a deduplicated UTF-8 string heap.
+3. Memory-maps the index for lookups: "now/next" for a channel is a bisect over
+   the channel's slice of the start array (microseconds, no parsing).
+
+Index layout (.epgidx, little endian):
+  8 bytes   magic  b"FXEPG1\\0\\0"
+  4 bytes   header length H
+  H bytes   JSON header {channels: {id: [offset, count, display_name]}, programmes, heap_len, ...}
+  pad to 8-byte alignment
+  int64[N]  programme start (epoch seconds, UTC)
+  int64[N]  programme stop
+  uint32[N] title offset into heap
+  uint32[N] title length
+  heap      UTF-8 titles
+
+Usage:
+  python3 test-data/xmltv_epg_index.py build guide.xml.gz -o guide.epgidx
+  python3 test-data/xmltv_epg_index.py coverage guide.epgidx
+  python3 test-data/xmltv_epg_index.py now guide.epgidx --channels ard.de,zdf.de
+  python3 test-data/xmltv_epg_index.py now guide.epgidx --n 1000 --at 1767225600
+
+  # Synthetic guide for local testing / benchmarking (no provider needed)
+  python3 test-data/xmltv_epg_index.py synth /tmp/guide.xml --channels 2000 --days 7
+  python3 test-data/xmltv_epg_index.py bench
+  python3 test-data/xmltv_epg_index.py check   # self-check on a small fixed guide
+"""
+import argparse
+import bisect
+import calendar
+import gzip
+import json
+import mmap
+import random
+import resource
+import struct
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from array import array
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+from xml.sax.saxutils import escape, quoteattr
+
+DATA_DIR = Path(__file__).parent / "xtream-responses"
+DEFAULT_LIVE = DATA_DIR / "live_streams.json"
+DEFAULT_LIVE_CATEGORIES = DATA_DIR / "live_categories.json"
+
+MAGIC = b"FXEPG1\0\0"
+ALIGN = 8
+
+# ============================================================================
+# Time parsing
+# ============================================================================
+
+@lru_cache(maxsize=4096)
+def _day_epoch(ymd: str) -> int:
+    return calendar.timegm((int(ymd[0:4]), int(ymd[4:6]), int(ymd[6:8]), 0, 0, 0))
+
+
+@lru_cache(maxsize=64)
+def _tz_offset(tz: str) -> int:
+    if len(tz) != 5 or tz[0] not in "+-":
+        return 0
+    seconds = int(tz[1:3]) * 3600 + int(tz[3:5]) * 60
+    return seconds if tz[0] == "+" else -seconds
+
+
+def parse_xmltv_time(value: str) -> int:
+    """Parse 'YYYYMMDDhhmmss +ZZZZ' (seconds and zone optional) to UTC epoch seconds."""
+    value = value.strip()
+    digits, _, tz = value.partition(" ")
+    digits = digits.ljust(14, "0")
+    seconds = int(digits[8:10]) * 3600 + int(digits[10:12]) * 60 + int(digits[12:14])
+    return _day_epoch(digits[:8]) + seconds - _tz_offset(tz.strip())
+
+
+def format_epoch(ts: int) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.gmtime(ts))
+
+
+# ============================================================================
+# Build
+# ============================================================================
+
+def _open_guide(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def build_index(source: Path, out: Path) -> dict:
+    """Stream-parse an XMLTV guide and write the compact index. Returns stats."""
+    names: dict[str, str] = {}
+    starts: dict[str, array] = defaultdict(lambda: array("q"))
+    stops: dict[str, array] = defaultdict(lambda: array("q"))
+    titles: dict[str, array] = defaultdict(lambda: array("I"))
+    title_ids: dict[str, int] = {}
+    title_list: list[str] = []
+    skipped = 0
+
+    with _open_guide(source) as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event != "end":
+                continue
+            tag = elem.tag
+            if tag == "programme":
+                channel = elem.get("channel")
+                start = elem.get("start")
+                if channel and start:
+                    begin = parse_xmltv_time(start)
+                    stop_attr = elem.get("stop")
+                    end = parse_xmltv_time(stop_attr) if stop_attr else begin
+                    title = elem.findtext("title") or ""
+                    tid = title_ids.get(title)
+                    if tid is None:
+                        tid = title_ids[title] = len(title_list)
+                        title_list.append(title)
+                    starts[channel].append(begin)
+                    stops[channel].append(end)
+                    titles[channel].append(tid)
+                else:
+                    skipped += 1
+                root.clear()
+            elif tag == "channel":
+                channel = elem.get("id")
+                if channel:
+                    names[channel] = elem.findtext("display-name") or ""
+                root.clear()
+
+    # Title heap (dedup'd strings, UTF-8)
+    heap = bytearray()
+    heap_offsets = array("I")
+    heap_lengths = array("I")
+    for title in title_list:
+        encoded = title.encode("utf-8")
+        heap_offsets.append(len(heap))
+        heap_lengths.append(len(encoded))
+        heap.extend(encoded)
+
+    # Flatten per-channel arrays, sorted by start
+    all_starts, all_stops = array("q"), array("q")
+    all_title_off, all_title_len = array("I"), array("I")
+    directory: dict[str, list] = {}
+    for channel in sorted(set(starts) | set(names)):
+        ch_starts = starts.get(channel, array("q"))
+        order = sorted(range(len(ch_starts)), key=ch_starts.__getitem__)
+        directory[channel] = [len(all_starts), len(order), names.get(channel, "")]
+        ch_stops, ch_titles = stops[channel], titles[channel]
+        for i in order:
+            all_starts.append(ch_starts[i])
+            all_stops.append(ch_stops[i])
+            tid = ch_titles[i]
+            all_title_off.append(heap_offsets[tid])
+            all_title_len.append(heap_lengths[tid])
+
+    header = json.dumps({
+        "version": 1,
+        "source": str(source),
+        "built_at": int(time.time()),
+        "programmes": len(all_starts),
+        "heap_len": len(heap),
+        "channels": directory,
+    }, ensure_ascii=False).encode("utf-8")
+
+    with open(out, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * (-f.tell() % ALIGN))
+        for arr in (all_starts, all_stops, all_title_off, all_title_len):
+            if sys.byteorder != "little":
+                arr.byteswap()
+            arr.tofile(f)
+        f.write(heap)
+
+    return {
+        "channels": len(directory),
+        "programmes": len(all_starts),
+        "unique_titles": len(title_list),
+        "skipped": skipped,
+        "index_bytes": out.stat().st_size,
+    }
+
+
+# ============================================================================
+# Lookup
+# ============================================================================
+
+class EpgIndex:
+    """Memory-mapped, read-only view of an .epgidx file."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:8] != MAGIC:
+            raise ValueError(f"Not an EPG index: {path}")
+        (header_len,) = struct.unpack_from("<I", self._mm, 8)
+        header_end = 12 + header_len
+        self.header = json.loads(self._mm[12:header_end].decode("utf-8"))
+        self.channels: dict[str, list] = self.header["channels"]
+        self._lower = {cid.lower(): cid for cid in self.channels}
+
+        n = self.header["programmes"]
+        base = header_end + (-header_end % ALIGN)
+        view = memoryview(self._mm)
+        self.starts = view[base:base + 8 * n].cast("q")
+        self.stops = view[base + 8 * n:base + 16 * n].cast("q")
+        self.title_off = view[base + 16 * n:base + 20 * n].cast("I")
+        self.title_len = view[base + 20 * n:base + 24 * n].cast("I")
+        self._heap_base = base + 24 * n
+
+    def close(self):
+        for arr in (self.starts, self.stops, self.title_off, self.title_len):
+            arr.release()
+        self._mm.close()
+        self._file.close()
+
+    def resolve(self, channel_id: str) -> Optional[str]:
+        """Exact id, or case-insensitive fallback (providers mix 'ARD.de'/'ard.de')."""
+        if channel_id in self.channels:
+            return channel_id
+        return self._lower.get(channel_id.lower())
+
+    def title(self, i: int) -> str:
+        start = self._heap_base + self.title_off[i]
+        return self._mm[start:start + self.title_len[i]].decode("utf-8", errors="replace")
+
+    def now_next(self, channel_id: str, at: int) -> tuple[Optional[int], Optional[int]]:
+        """Programme indexes (now, next) for a channel at epoch `at`."""
+        cid = self.resolve(channel_id)
+        if cid is None:
+            return None, None
+        offset, count, _ = self.channels[cid]
+        if count == 0:
+            return None, None
+        hi = offset + count
+        i = bisect.bisect_right(self.starts, at, offset, hi) - 1
+        current = i if i >= offset and self.stops[i] > at else None
+        upcoming = i + 1 if i + 1 < hi else None
+        return current, upcoming
+
+    def describe(self, i: Optional[int]) -> str:
+        if i is None:
+            return "-"
+        return f"{format_epoch(self.starts[i])}–{format_epoch(self.stops[i])[11:]} {self.title(i)}"
+
+
+# ============================================================================
+# Commands
+# ============================================================================
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def cmd_build(args) -> int:
+    source = Path(args.xmltv)
+    out = Path(args.output) if args.output else source.with_suffix(".epgidx")
+    start = time.perf_counter()
+    stats = build_index(source, out)
+    elapsed = time.perf_counter() - start
+    print(f"Indexed {source} → {out}")
+    print(f"  Channels:      {stats['channels']}")
+    print(f"  Programmes:    {stats['programmes']} ({stats['skipped']} skipped)")
+    print(f"  Unique titles: {stats['unique_titles']}")
+    print(f"  Index size:    {stats['index_bytes'] / 1024:.0f} KiB "
+          f"(source {source.stat().st_size / 1024:.0f} KiB)")
+    print(f"  Time:          {elapsed:.2f} s")
+    print(f"  Peak RSS:      {_peak_rss_mb():.0f} MiB")
+    return 0
+
+
+def coverage_counts(index: EpgIndex, live: list[dict]) -> dict[str, list[int]]:
+    """Per category_id: [streams, streams with epg_channel_id, streams with programmes]."""
+    per_category: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0])
+    for stream in live:
+        counts = per_category[str(stream.get("category_id"))]
+        counts[0] += 1
+        epg_id = (stream.get("epg_channel_id") or "").strip()
+        if epg_id:
+            counts[1] += 1
+            cid = index.resolve(epg_id)
+            if cid is not None and index.channels[cid][1] > 0:
+                counts[2] += 1
+    return dict(per_category)
+
+
+def cmd_coverage(args) -> int:
+    index = EpgIndex(Path(args.index))
+    with open(args.live, encoding="utf-8") as f:
+        live = json.load(f)
+    category_names = {}
+    if Path(args.categories).exists():
+        with open(args.categories, encoding="utf-8") as f:
+            category_names = {str(c.get("category_id")): c.get("category_name", "") for c in json.load(f)}
+
+    per_category = coverage_counts(index, live)
+    total = [sum(c[i] for c in per_category.values()) for i in range(3)]
+    print(f"EPG coverage: {total[2]}/{total[0]} live streams "
+          f"({100 * total[2] / max(1, total[0]):.1f}%), "
+          f"{total[1]} carry an epg_channel_id")
+    print(f"\n{'Category':<40} {'Streams':>8} {'EPG id':>8} {'Matched':>8} {'Cov.':>6}")
+    rows = sorted(per_category.items(), key=lambda kv: (-kv[1][0], kv[0]))
+    for cat_id, (streams, with_id, matched) in rows[:args.top]:
+        label = f"{category_names.get(cat_id, '?')} [{cat_id}]"[:40]
+        print(f"{label:<40} {streams:>8} {with_id:>8} {matched:>8} {100 * matched / streams:>5.0f}%")
+    if len(rows) > args.top:
+        print(f"... and {len(rows) - args.top} more categories")
+    index.close()
+    return 0
+
+
+def cmd_now(args) -> int:
+    index = EpgIndex(Path(args.index))
+    at = args.at or int(time.time())
+    if args.channels:
+        channels = [c.strip() for c in args.channels.split(",") if c.strip()]
+    else:
+        pool = list(index.channels)
+        channels = random.Random(42).sample(pool, min(args.n, len(pool)))
+
+    start = time.perf_counter()
+    results = [(cid, index.now_next(cid, at)) for cid in channels]
+    elapsed = time.perf_counter() - start
+
+    for cid, (current, upcoming) in results[:args.show]:
+        print(f"{cid:<28} now: {index.describe(current)}")
+        print(f"{'':<28} next: {index.describe(upcoming)}")
+    print(f"\n{len(channels)} lookups at {format_epoch(at)} UTC in {elapsed * 1e6:.0f} µs "
+          f"({elapsed * 1e6 / max(1, len(channels)):.2f} µs/channel)")
+    index.close()
+    return 0
+
+
+def write_synthetic_guide(out: Path, channels: int, days: int, slot_minutes: int,
+                          channel_ids: Optional[list[str]] = None, seed: int = 7) -> int:
+    """Write a synthetic XMLTV guide (streamed, constant memory). Returns programme count."""
+    rng = random.Random(seed)
+    ids = list(channel_ids or [])[:channels]
+    ids += [f"synthetic{i}.de" for i in range(len(ids), channels)]
+    shows = [f"Show {i}" for i in range(2000)]
+    day0 = (int(time.time()) // 86400) * 86400 - 86400
+    opener = gzip.open if out.suffix == ".gz" else open
+    count = 0
+    with opener(out, "wt", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<tv generator-info-name="synthetic">\n')
+        for cid in ids:
+            f.write(f'  <channel id={quoteattr(cid)}><display-name>{escape(cid)}</display-name></channel>\n')
+        for cid in ids:
+            attr = quoteattr(cid)
+            ts = day0 + rng.randrange(0, slot_minutes) * 60
+            end_of_guide = day0 + days * 86400
+            while ts < end_of_guide:
+                length = slot_minutes * 60 * rng.choice((1, 1, 2, 3))
+                begin = time.strftime("%Y%m%d%H%M%S", time.gmtime(ts))
+                end = time.strftime("%Y%m%d%H%M%S", time.gmtime(ts + length))
+                f.write(f'  <programme start="{begin} +0000" stop="{end} +0000" channel={attr}>'
+                        f'<title>{rng.choice(shows)}</title><desc>Synthetic programme</desc></programme>\n')
+                ts += length
+                count += 1
+        f.write("</tv>\n")
+    return count
+
+
+def _live_epg_ids(path: Path) -> list[str]:
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        live = json.load(f)
+    return list(dict.fromkeys((s.get("epg_channel_id") or "").strip() for s in live if s.get("epg_channel_id")))
+
+
+def cmd_synth(args) -> int:
+    ids = _live_epg_ids(Path(args.live)) if args.from_live else None
+    count = write_synthetic_guide(Path(args.output), args.channels, args.days, args.slot, ids)
+    print(f"Wrote {args.output}: {args.channels} channels, {count} programmes "
+          f"({Path(args.output).stat().st_size / (1024 * 1024):.1f} MiB)")
+    return 0
+
+
+def cmd_bench(args) -> int:
+    """Synthetic end-to-end run: generate → build → N now/next lookups."""
+    with tempfile.TemporaryDirectory() as tmp:
+        guide = Path(tmp) / "guide.xml"
+        index_path = Path(tmp) / "guide.epgidx"
+        count = write_synthetic_guide(guide, args.channels, args.days, args.slot,
+                                      _live_epg_ids(Path(args.live)))
+        size_mb = guide.stat().st_size / (1024 * 1024)
+        print(f"Synthetic guide: {args.channels} channels, {count} programmes, {size_mb:.1f} MiB")
+
+        rss_before = _peak_rss_mb()
+        start = time.perf_counter()
+        stats = build_index(guide, index_path)
+        build_s = time.perf_counter() - start
+        print(f"Build: {build_s:.2f} s ({size_mb / build_s:.1f} MiB/s), "
+              f"index {stats['index_bytes'] / (1024 * 1024):.1f} MiB, "
+              f"peak RSS {rss_before:.0f} → {_peak_rss_mb():.0f} MiB")
+
+        index = EpgIndex(index_path)
+        channels = list(index.channels)
+        at = int(time.time())
+        lookups = [channels[i % len(channels)] for i in range(args.n)]
+        start = time.perf_counter()
+        for cid in lookups:
+            index.now_next(cid, at)
+        elapsed = time.perf_counter() - start
+        print(f"Lookup: {args.n} now/next in {elapsed * 1000:.1f} ms "
+              f"({elapsed * 1e6 / args.n:.2f} µs/channel)")
+        index.close()
+    return 0
+
+
+# 2026-01-01 00:00 UTC; CHECK_MIDNIGHT is the following midnight
+CHECK_DAY0 = 1767225600
+CHECK_MIDNIGHT = CHECK_DAY0 + 86400
+
+CHECK_GUIDE = """<?xml version="1.0" encoding="UTF-8"?>
+<tv generator-info-name="check">
+  <channel id="ard.de"><display-name>Das Erste</display-name></channel>
+  <channel id="zdf.de"><display-name>ZDF</display-name></channel>
+  <channel id="empty.de"><display-name>Leer</display-name></channel>
+  <programme start="20260102003000 +0000" stop="20260102010000 +0000" channel="ard.de"><title>Nachtmagazin</title></programme>
+  <programme start="20260101200000 +0000" stop="20260101221500 +0000" channel="ard.de"><title>Abendshow</title></programme>
+  <programme start="20260101221500 +0000" stop="20260102003000 +0000" channel="ard.de"><title>Spätfilm</title></programme>
+  <programme start="20260102000000 +0100" stop="20260102013000 +0100" channel="zdf.de"><title>Tom &amp; Jerry</title></programme>
+  <programme start="20260102020000 +0100" stop="20260102030000 +0100" channel="zdf.de"><title>Nachrichten</title></programme>
+  <programme start="20260101230000 +0000" stop="20260102000000 +0000" channel="orphan.de"><title>Ohne Kanal</title></programme>
+  <programme stop="20260102000000 +0000" channel="ard.de"><title>Ohne Start</title></programme>
+</tv>
+"""
+
+CHECK_LIVE = [
+    {"category_id": 1, "epg_channel_id": "ard.de"},
+    {"category_id": 1, "epg_channel_id": "ZDF.de"},
+    {"category_id": 1, "epg_channel_id": ""},
+    {"category_id": 2, "epg_channel_id": "empty.de"},
+    {"category_id": 2, "epg_channel_id": "unknown.de"},
+    {"category_id": 2, "epg_channel_id": "orphan.de"},
+    {"category_id": 3},
+    {"category_id": 3, "epg_channel_id": "  "},
+]
+
+
+def cmd_check(args) -> int:
+    """Build an index from a small hand-written guide and verify lookups and coverage."""
+    failures = 0
+    total = 0
+
+    def expect(label: str, got, expected):
+        nonlocal failures, total
+        ok = got == expected
+        total += 1
+        failures += not ok
+        print(f"  {'✅' if ok else '❌'} {label}: {got!r}" + ("" if ok else f" (expected {expected!r})"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        guide = Path(tmp) / "guide.xml"
+        guide.write_text(CHECK_GUIDE, encoding="utf-8")
+        with gzip.open(Path(tmp) / "guide.xml.gz", "wt", encoding="utf-8") as f:
+            f.write(CHECK_GUIDE)
+
+        print("Build:")
+        stats = build_index(guide, Path(tmp) / "guide.epgidx")
+        expect("channels (incl. programmes without <channel>)", stats["channels"], 4)
+        expect("programmes", stats["programmes"], 6)
+        expect("skipped without start", stats["skipped"], 1)
+        expect("unique titles", stats["unique_titles"], 6)
+        build_index(Path(tmp) / "guide.xml.gz", Path(tmp) / "guide-gz.epgidx")
+
+        index = EpgIndex(Path(tmp) / "guide.epgidx")
+        gz_index = EpgIndex(Path(tmp) / "guide-gz.epgidx")
+        same = (gz_index.channels, gz_index.starts.tolist(), gz_index.stops.tolist()) == \
+               (index.channels, index.starts.tolist(), index.stops.tolist())
+        expect(".xml.gz gives the same index", same, True)
+        gz_index.close()
+
+        def titles(channel_id: str, at: int) -> tuple[Optional[str], Optional[str]]:
+            return tuple(None if i is None else index.title(i) for i in index.now_next(channel_id, at))
+
+        print("\nNow/next:")
+        cases = [
+            ("ard.de before the guide", "ard.de", CHECK_DAY0, (None, "Abendshow")),
+            ("ard.de 23:59 (crosses midnight)", "ard.de", CHECK_MIDNIGHT - 60, ("Spätfilm", "Nachtmagazin")),
+            ("ard.de 00:00 exactly", "ard.de", CHECK_MIDNIGHT, ("Spätfilm", "Nachtmagazin")),
+            ("ard.de 00:10 (after midnight)", "ard.de", CHECK_MIDNIGHT + 600, ("Spätfilm", "Nachtmagazin")),
+            ("ard.de 00:30 (stop is exclusive)", "ard.de", CHECK_MIDNIGHT + 1800, ("Nachtmagazin", None)),
+            ("ard.de 01:00 (last programme ended)", "ard.de", CHECK_MIDNIGHT + 3600, (None, None)),
+            ("ARD.DE case-insensitive", "ARD.DE", CHECK_MIDNIGHT + 600, ("Spätfilm", "Nachtmagazin")),
+            ("zdf.de 00:15 UTC (+0100 zone)", "zdf.de", CHECK_MIDNIGHT + 900, ("Tom & Jerry", "Nachrichten")),
+            ("zdf.de 00:45 UTC (gap)", "zdf.de", CHECK_MIDNIGHT + 2700, (None, "Nachrichten")),
+            ("empty.de (channel, no programmes)", "empty.de", CHECK_MIDNIGHT, (None, None)),
+            ("unknown.de (not in guide)", "unknown.de", CHECK_MIDNIGHT, (None, None)),
+            ("orphan.de (programmes, no <channel>)", "orphan.de", CHECK_MIDNIGHT - 60, ("Ohne Kanal", None)),
+        ]
+        for label, channel_id, at, expected in cases:
+            expect(label, titles(channel_id, at), expected)
+
+        print("\nCoverage [streams, with epg id, matched]:")
+        counts = coverage_counts(index, CHECK_LIVE)
+        expect("category 1 (case mismatch, empty id)", counts.get("1"), [3, 2, 2])
+        expect("category 2 (no data, unknown, orphan)", counts.get("2"), [3, 3, 1])
+        expect("category 3 (missing, blank id)", counts.get("3"), [2, 0, 0])
+        index.close()
+
+    print(f"\n{total - failures}/{total} checks pass")
+    return 0 if failures == 0 else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Streaming XMLTV EPG indexer",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Commands")
+
+    build_parser = subparsers.add_parser("build", help="Build index from XMLTV (.xml / .xml.gz)")
+    build_parser.add_argument("xmltv", help="XMLTV guide")
+    build_parser.add_argument("-o", "--output", help="Index path (default: <guide>.epgidx)")
+
+    coverage_parser = subparsers.add_parser("coverage", help="EPG coverage per live category")
+    coverage_parser.add_argument("index", help=".epgidx file")
+    coverage_parser.add_argument("--live", default=str(DEFAULT_LIVE), help="get_live_streams JSON")
+    coverage_parser.add_argument("--categories", default=str(DEFAULT_LIVE_CATEGORIES),
+                                 help="get_live_categories JSON")
+    coverage_parser.add_argument("--top", type=int, default=30, help="Categories to print")
+
+    now_parser = subparsers.add_parser("now", help="Now/next lookups")
+    now_parser.add_argument("index", help=".epgidx file")
+    now_parser.add_argument("--channels", help="Comma-separated epg_channel_ids")
+    now_parser.add_argument("--n", type=int, default=100, help="Random channels when --channels is omitted")
+    now_parser.add_argument("--at", type=int, help="Epoch seconds (default: now)")
+    now_parser.add_argument("--show", type=int, default=10, help="Results to print")
+
+    for name, help_text in (("synth", "Write a synthetic XMLTV guide"),
+                            ("bench", "Synthetic build + lookup benchmark")):
+        sub = subparsers.add_parser(name, help=help_text)
+        if name == "synth":
+            sub.add_argument("output", help="Output .xml or .xml.gz")
+            sub.add_argument("--from-live", action="store_true",
+                             help="Use epg_channel_ids from live_streams.json")
+        else:
+            sub.add_argument("--n", type=int, default=10000, help="Lookups to time")
+        sub.add_argument("--channels", type=int, default=2000, help="Channel count")
+        sub.add_argument("--days", type=int, default=7, help="Guide length in days")
+        sub.add_argument("--slot", type=int, default=30, help="Base slot length in minutes")
+        sub.add_argument("--live", default=str(DEFAULT_LIVE), help="get_live_streams JSON")
+
+    subparsers.add_parser("check", help="Verify build, now/next and coverage on a small fixed guide")
+
+    args = parser.parse_args()
+    commands = {
+        "build": cmd_build,
+        "coverage": cmd_coverage,
+        "now": cmd_now,
+        "synth": cmd_synth,
+        "bench": cmd_bench,
+        "check": cmd_check,
+    }
+    if args.command not in commands:
+        parser.print_help()
+        sys.exit(2)
+    sys.exit(commands[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Xtream Schema Drift Detector - compiled validators/coercers for player_api payloads.
+
+Panels silently change JSON types between snapshots:
+
+    rating       "7.413" vs 7.4 vs null
+    added        "1612597620" (string epoch) instead of an int
+    series_id    negative values (-441, see analyze_pipeline_compatibility.py)
+    stream_icon  "" instead of null
+
+Each action (get_live_streams, get_vod_streams, get_series, *_categories) has
+an expected schema below. The schema is compiled once into a Python function
+(generated source, exec'd) that walks a whole stream list with inline type
+checks; only values that do not already have the canonical type fall through
+to a coercer. Coerced values are written back in place, and every deviation is
+counted per (field, observed type, outcome) for the drift report.
+
+Outcomes:
+  coerced     value converted to the canonical type ("7.4" → 7.4)
+  empty       empty string mapped to null (stream_icon "")
+  null        null in a nullable field (informational)
+  flagged     value kept but suspicious (series_id < 0)
+  absent      optional field missing (informational)
+  missing     required field missing                      → fails --gate
+  invalid     value could not be coerced                  → fails --gate
+  unexpected  field not in the schema (new panel field)   → fails --gate --strict
+
+Usage as library:
+  from xtream_schema_drift import validate_payload
+  items, drift = validate_payload("get_vod_streams", json.load(f))
+
+Usage as script:
+  python3 test-data/xtream_schema_drift.py                       # all snapshots in xtream-responses/
+  python3 test-data/xtream_schema_drift.py --gate                # exit 1 on invalid/missing
+  python3 test-data/xtream_schema_drift.py --file get_vod_streams=vod.json --show-source
+  python3 test-data/xtream_schema_drift.py --check                # verify coercion of fixed samples
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+DATA_DIR = Path(__file__).parent / "xtream-responses"
+
+GATE_OUTCOMES = ("missing", "invalid")
+STRICT_OUTCOMES = GATE_OUTCOMES + ("unexpected",)
+
+# ============================================================================
+# Schemas
+# ============================================================================
+
+
+class Field(NamedTuple):
+    kind: str             # int | id | epoch | float | str | url | str_list
+    required: bool = False
+    nullable: bool = True
+
+
+STREAM_COMMON = {
+    "num": Field("int"),
+    "name": Field("str", required=True, nullable=False),
+    "stream_type": Field("str"),
+    "stream_id": Field("id", required=True, nullable=False),
+    "stream_icon": Field("url"),
+    "added": Field("epoch"),
+    "category_id": Field("str", required=True),
+    "custom_sid": Field("str"),
+    "direct_source": Field("str"),
+}
+
+SCHEMAS: dict[str, dict[str, Field]] = {
+    "get_live_streams": {
+        **STREAM_COMMON,
+        "epg_channel_id": Field("str"),
+        "tv_archive": Field("int"),
+        "tv_archive_duration": Field("int"),
+    },
+    "get_vod_streams": {
+        **STREAM_COMMON,
+        "rating": Field("float"),
+        "rating_5based": Field("float"),
+        "container_extension": Field("str"),
+    },
+    "get_series": {
+        "num": Field("int"),
+        "name": Field("str", required=True, nullable=False),
+        "series_id": Field("id", required=True, nullable=False),
+        "cover": Field("url"),
+        "plot": Field("str"),
+        "cast": Field("str"),
+        "director": Field("str"),
+        "genre": Field("str"),
+        "releaseDate": Field("str"),
+        "last_modified": Field("epoch"),
+        "rating": Field("float"),
+        "rating_5based": Field("float"),
+        "backdrop_path": Field("str_list"),
+        "youtube_trailer": Field("str"),
+        "episode_run_time": Field("str"),
+        "category_id": Field("str", required=True),
+    },
+    "get_categories": {
+        "category_id": Field("str", required=True, nullable=False),
+        "category_name": Field("str", required=True, nullable=False),
+        "parent_id": Field("int"),
+    },
+}
+
+# Snapshot file → action (fetch_xtream_api.sh naming)
+DEFAULT_FILES = {
+    "live_streams.json": "get_live_streams",
+    "vod_streams.json": "get_vod_streams",
+    "series.json": "get_series",
+    "live_categories.json": "get_categories",
+    "vod_categories.json": "get_categories",
+    "series_categories.json": "get_categories",
+}
+DEFAULT_GLOBS = {
+    "vod_streams_cat_*.json": "get_vod_streams",
+}
+
+# ============================================================================
+# Slow-path coercers (only called when the fast type check fails)
+# ============================================================================
+
+_MISSING = object()
+
+
+def _type_name(value) -> str:
+    return "missing" if value is _MISSING else type(value).__name__
+
+
+def _null(value, field, spec, drift):
+    """Shared handling for missing / None; returns (handled, result)."""
+    if value is _MISSING:
+        drift[(field, "missing", "missing" if spec.required else "absent")] += 1
+        return True, value
+    if value is None:
+        drift[(field, "NoneType", "null" if spec.nullable else "invalid")] += 1
+        return True, value
+    return False, value
+
+
+def _to_int(value):
+    if value.__class__ is bool:
+        return int(value)
+    if value.__class__ is float and value.is_integer():
+        return int(value)
+    if value.__class__ is str:
+        text = value.strip()
+        if text.isascii() and text.lstrip("-").isdigit():
+            try:
+                return int(text)
+            except (ValueError, OverflowError):  # "--5"
+                pass
+    return _MISSING
+
+
+def _coerce_int(value, field, spec, drift):
+    handled, value = _null(value, field, spec, drift)
+    if handled:
+        return value
+    if value == "" and spec.nullable:
+        drift[(field, "str", "empty")] += 1
+        return None
+    result = _to_int(value)
+    if result is _MISSING:
+        drift[(field, _type_name(value), "invalid")] += 1
+        return value
+    drift[(field, _type_name(value), "coerced")] += 1
+    return result
+
+
+def _coerce_id(value, field, spec, drift):
+    if value.__class__ is not int:
+        value = _coerce_int(value, field, spec, drift)
+    if value.__class__ is int and value <= 0:
+        drift[(field, "int", "flagged")] += 1
+    return value
+
+
+def _coerce_epoch(value, field, spec, drift):
+    if value.__class__ is float:
+        try:
+            result = int(value)
+        except (ValueError, OverflowError):  # NaN / Infinity
+            drift[(field, "float", "invalid")] += 1
+            return value
+        drift[(field, "float", "coerced")] += 1
+        return result
+    return _coerce_int(value, field, spec, drift)
+
+
+def _coerce_float(value, field, spec, drift):
+    handled, value = _null(value, field, spec, drift)
+    if handled:
+        return value
+    if value.__class__ is int:
+        drift[(field, "int", "coerced")] += 1
+        return float(value)
+    if value.__class__ is str:
+        text = value.strip()
+        if not text and spec.nullable:
+            drift[(field, "str", "empty")] += 1
+            return None
+        try:
+            result = float(text.replace(",", ".")) if text.isascii() else None
+        except ValueError:
+            result = None
+        if result is not None:
+            drift[(field, "str", "coerced")] += 1
+            return result
+    drift[(field, _type_name(value), "invalid")] += 1
+    return value
+
+
+def _coerce_str(value, field, spec, drift):
+    handled, value = _null(value, field, spec, drift)
+    if handled:
+        return value
+    if value.__class__ in (int, float):
+        drift[(field, _type_name(value), "coerced")] += 1
+        return str(value)
+    drift[(field, _type_name(value), "invalid")] += 1
+    return value
+
+
+def _coerce_url(value, field, spec, drift):
+    if value == "":
+        drift[(field, "str", "empty")] += 1
+        return None
+    return _coerce_str(value, field, spec, drift)
+
+
+def _coerce_str_list(value, field, spec, drift):
+    handled, value = _null(value, field, spec, drift)
+    if handled:
+        return value
+    if value.__class__ is str:
+        drift[(field, "str", "coerced")] += 1
+        return [value] if value else []
+    drift[(field, _type_name(value), "invalid")] += 1
+    return value
+
+
+COERCERS = {
+    "int": _coerce_int,
+    "id": _coerce_id,
+    "epoch": _coerce_epoch,
+    "float": _coerce_float,
+    "str": _coerce_str,
+    "url": _coerce_url,
+    "str_list": _coerce_str_list,
+}
+
+# Fast-path condition per kind: True means "not canonical, take the slow path"
+FAST_CHECKS = {
+    "int": "v.__class__ is not int",
+    "id": "v.__class__ is not int or v <= 0",
+    "epoch": "v.__class__ is not int",
+    "float": "v.__class__ is not float",
+    "str": "v.__class__ is not str",
+    "url": "v.__class__ is not str or not v",
+    "str_list": "v.__class__ is not list",
+}
+
+# Inline coercion for the common string drift ("1612597620", "7.413"): handled
+# inside the generated loop with a local counter instead of a coercer call.
+INLINE_STR_COERCIONS = {
+    "int": ("v.isascii() and v.isdigit()", "int(v)"),
+    "epoch": ("v.isascii() and v.isdigit()", "int(v)"),
+    "float": ("v.isascii() and v[:1].isdigit() and v.replace('.', '', 1).isdigit()", "float(v)"),
+}
+
+# ============================================================================
+# Compiler
+# ============================================================================
+
+
+def generate_source(action: str) -> str:
+    """Python source of the batch validator for one action."""
+    schema = SCHEMAS[action]
+    lines = [
+        f"def validate_{action}(items, drift):",
+        "    known = KNOWN",
+    ]
+    inline = [(i, name) for i, (name, spec) in enumerate(schema.items())
+              if spec.kind in INLINE_STR_COERCIONS]
+    lines += [f"    n_{i} = 0" for i, _name in inline]
+    lines += [
+        "    for item in items:",
+        "        if item.__class__ is not dict:",
+        "            drift[('<item>', type(item).__name__, 'invalid')] += 1",
+        "            continue",
+        "        get = item.get",
+    ]
+    for index, (name, spec) in enumerate(schema.items()):
+        lines += [
+            f"        v = get({name!r}, MISSING)",
+            f"        if {FAST_CHECKS[spec.kind]}:",
+        ]
+        indent = "            "
+        if spec.kind in INLINE_STR_COERCIONS:
+            test, convert = INLINE_STR_COERCIONS[spec.kind]
+            lines += [
+                f"            if v.__class__ is str and {test}:",
+                f"                item[{name!r}] = {convert}",
+                f"                n_{index} += 1",
+                "            else:",
+            ]
+            indent += "    "
+        lines += [
+            f"{indent}r = {spec.kind.upper()}(v, {name!r}, SPEC_{index}, drift)",
+            f"{indent}if r is not v:",
+            f"{indent}    item[{name!r}] = r",
+        ]
+    lines += [
+        "        if not known.issuperset(item):",
+        "            for name in item.keys() - known:",
+        "                drift[(name, type(item[name]).__name__, 'unexpected')] += 1",
+    ]
+    for index, name in inline:
+        lines += [
+            f"    if n_{index}:",
+            f"        drift[({name!r}, 'str', 'coerced')] += n_{index}",
+        ]
+    lines.append("    return items")
+    return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=None)
+def compile_schema(action: str):
+    """Compile (once) and return the batch validator for an action."""
+    if action not in SCHEMAS:
+        raise KeyError(f"No schema for action '{action}' (known: {', '.join(SCHEMAS)})")
+    schema = SCHEMAS[action]
+    namespace = {
+        "MISSING": _MISSING,
+        "KNOWN": frozenset(schema),
+        **{kind.upper(): fn for kind, fn in COERCERS.items()},
+        **{f"SPEC_{i}": spec for i, spec in enumerate(schema.values())},
+    }
+    code = compile(generate_source(action), f"<schema:{action}>", "exec")
+    exec(code, namespace)
+    return namespace[f"validate_{action}"]
+
+
+def validate_payload(action: str, items: list, drift: Counter | None = None) -> tuple[list, Counter]:
+    """
+    Validate and coerce a whole stream list in place.
+
+    Returns (items, drift) where drift counts (field, observed type, outcome).
+    """
+    if drift is None:
+        drift = Counter()
+    if not isinstance(items, list):
+        drift[("<payload>", type(items).__name__, "invalid")] += 1
+        return items, drift
+    compile_schema(action)(items, drift)
+    return items, drift
+
+
+def gate_failures(drift: Counter, strict: bool = False) -> int:
+    outcomes = STRICT_OUTCOMES if strict else GATE_OUTCOMES
+    return sum(count for (_f, _t, outcome), count in drift.items() if outcome in outcomes)
+
+
+# ============================================================================
+# Self-check
+# ============================================================================
+
+# (action, field, raw value, value after coercion, outcomes counted for the field)
+CHECK_CASES = [
+    ("get_vod_streams", "stream_id", 42, 42, ()),
+    ("get_vod_streams", "stream_id", "42", 42, ("coerced",)),
+    ("get_vod_streams", "stream_id", " 42 ", 42, ("coerced",)),
+    ("get_vod_streams", "stream_id", "-5", -5, ("coerced", "flagged")),
+    ("get_vod_streams", "stream_id", "--5", "--5", ("invalid",)),
+    ("get_vod_streams", "stream_id", "²", "²", ("invalid",)),
+    ("get_vod_streams", "stream_id", "٣", "٣", ("invalid",)),
+    ("get_vod_streams", "added", "1612597620", 1612597620, ("coerced",)),
+    ("get_vod_streams", "added", 1612597620.0, 1612597620, ("coerced",)),
+    ("get_vod_streams", "added", "¹²", "¹²", ("invalid",)),
+    ("get_vod_streams", "added", float("nan"), float("nan"), ("invalid",)),
+    ("get_vod_streams", "added", float("inf"), float("inf"), ("invalid",)),
+    ("get_vod_streams", "rating", "7.413", 7.413, ("coerced",)),
+    ("get_vod_streams", "rating", "7,4", 7.4, ("coerced",)),
+    ("get_vod_streams", "rating", "", None, ("empty",)),
+    ("get_vod_streams", "rating", "¹", "¹", ("invalid",)),
+    ("get_vod_streams", "rating", "٣.5", "٣.5", ("invalid",)),
+    ("get_live_streams", "tv_archive", "1", 1, ("coerced",)),
+    ("get_live_streams", "tv_archive", "¹", "¹", ("invalid",)),
+]
+
+_CHECK_BASE = {"name": "a", "stream_id": 1, "category_id": "1"}
+
+
+def check_cases() -> int:
+    """Run CHECK_CASES through the compiled validators; malformed values must count as invalid."""
+    failures = 0
+    for action, field, raw, expected, outcomes in CHECK_CASES:
+        item = {**_CHECK_BASE, field: raw}
+        try:
+            _items, drift = validate_payload(action, [item])
+        except Exception as e:
+            got, seen = f"{type(e).__name__}: {e}", ()
+        else:
+            got = item[field]
+            seen = tuple(sorted(o for (f, _t, o) in drift if f == field))
+        # repr() compares type too (1 vs 1.0) and matches NaN
+        ok = repr(got) == repr(expected) and seen == outcomes
+        failures += not ok
+        print(f"  {'✅' if ok else '❌'} {action}.{field} {raw!r} → {got!r} {', '.join(seen)}"
+              + ("" if ok else f" (expected {expected!r} {', '.join(outcomes)})"))
+    print(f"\n{len(CHECK_CASES) - failures}/{len(CHECK_CASES)} cases pass")
+    return 0 if failures == 0 else 1
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def collect_targets(data_dir: Path, overrides: list[str]) -> list[tuple[str, Path]]:
+    targets = []
+    if overrides:
+        for spec in overrides:
+            action, _, path = spec.partition("=")
+            if not path:
+                raise ValueError(f"--file expects ACTION=PATH, got '{spec}'")
+            targets.append((action, Path(path)))
+        return targets
+    for filename, action in DEFAULT_FILES.items():
+        path = data_dir / filename
+        if path.exists():
+            targets.append((action, path))
+    for pattern, action in DEFAULT_GLOBS.items():
+        for path in sorted(data_dir.glob(pattern)):
+            targets.append((action, path))
+    return targets
+
+
+def report_file(action: str, path: Path, strict: bool) -> dict:
+    with open(path, encoding="utf-8") as f:
+        items = json.load(f)
+
+    start = time.perf_counter()
+    _items, drift = validate_payload(action, items)
+    elapsed = time.perf_counter() - start
+
+    count = len(items) if isinstance(items, list) else 0
+    failures = gate_failures(drift, strict)
+    print(f"\n--- {path.name} ({action}): {count} items, "
+          f"{elapsed * 1000:.1f} ms ({count / max(elapsed, 1e-9):,.0f} items/s) ---")
+
+    by_field: dict[str, list] = {}
+    for (field, type_name, outcome), n in sorted(drift.items()):
+        by_field.setdefault(field, []).append((type_name, outcome, n))
+    if not by_field:
+        print("  ✅ No drift")
+    for field, rows in by_field.items():
+        parts = ", ".join(f"{t}→{o}: {n}" for t, o, n in rows)
+        bad = any(o in (STRICT_OUTCOMES if strict else GATE_OUTCOMES) for _t, o, _n in rows)
+        print(f"  {'❌' if bad else '  '} {field:<22} {parts}")
+
+    return {
+        "file": str(path),
+        "action": action,
+        "items": count,
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "gate_failures": failures,
+        "drift": [
+            {"field": f, "type": t, "outcome": o, "count": n}
+            for (f, t, o), n in sorted(drift.items())
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Xtream schema drift detector",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("--dir", type=Path, default=DATA_DIR, help="Snapshot directory")
+    parser.add_argument("--file", action="append", default=[], metavar="ACTION=PATH",
+                        help="Validate a specific file (repeatable, replaces --dir scan)")
+    parser.add_argument("--gate", action="store_true", help="Exit 1 on missing/invalid values")
+    parser.add_argument("--strict", action="store_true", help="With --gate: also fail on unexpected fields")
+    parser.add_argument("--show-source", action="store_true", help="Print generated validator source")
+    parser.add_argument("--json", type=Path, help="Write machine-readable drift report")
+    parser.add_argument("--check", action="store_true", help="Verify coercion of fixed sample values")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(check_cases())
+
+    try:
+        targets = collect_targets(args.dir, args.file)
+        unknown = sorted({action for action, _p in targets if action not in SCHEMAS})
+        if unknown:
+            raise ValueError(f"No schema for action(s): {', '.join(unknown)}")
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.show_source:
+        for action in dict.fromkeys(action for action, _p in targets):
+            print(generate_source(action))
+
+    print("=" * 70)
+    print("=== XTREAM SCHEMA DRIFT ===")
+    print("=" * 70)
+
+    if not targets:
+        print(f"\n⚠️  No snapshot files found in {args.dir}")
+        sys.exit(2 if args.gate else 0)
+
+    sections = []
+    for action, path in targets:
+        if not path.exists():
+            print(f"\n⚠️  {path} not found - skipped")
+            continue
+        sections.append(report_file(action, path, args.strict))
+
+    total_failures = sum(s["gate_failures"] for s in sections)
+    print("\n" + "=" * 70)
+    if total_failures:
+        print(f"❌ {total_failures} gate-relevant values across {len(sections)} files")
+    else:
+        print(f"✅ {len(sections)} files pass the schema gate")
+
+    if args.json:
+        args.json.write_text(json.dumps({"files": sections}, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Report written: {args.json}")
+
+    if args.gate and total_failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
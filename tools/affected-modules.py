@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Affected Modules - Gradle test tasks for the modules a change can break.
+
+Builds the module DAG from settings.gradle.kts (include(":a:b")) and every
+module's build.gradle.kts (<configuration>(project(":x:y"))), maps changed
+files to their owning module (longest module directory prefix) and prints the
+test tasks of the reverse-dependency closure: the changed modules plus every
+module that depends on one of them, directly or transitively. Modules without
+a src/test source set are left out.
+
+A change to root build files (settings.gradle.kts, build.gradle.kts,
+gradle.properties, gradle/**) affects every module; the root `test` task is
+printed instead. Files outside all modules (docs, .github, tools/*.py) affect
+none.
+
+Parsed build files are cached by content hash in .scope/.cache/modules.json.
+
+Usage:
+  # Changes of the working tree and index against HEAD, plus untracked files
+  python tools/affected-modules.py
+
+  # Changes of a range (CI): merge base of origin/main and HEAD
+  python tools/affected-modules.py origin/main...HEAD
+  ./gradlew $(python tools/affected-modules.py origin/main...HEAD) --no-daemon
+
+  # Explicit paths ('-' reads newline-separated paths from stdin)
+  python tools/affected-modules.py --files core/model/src/main/java/.../RawMediaMetadata.kt
+
+  # Only tasks from a fixed list (e.g. the pipeline test scripts)
+  python tools/affected-modules.py origin/main...HEAD --restrict :core:model:test,:pipeline:xtream:test
+
+  # Why each module is affected / machine-readable output
+  python tools/affected-modules.py origin/main...HEAD --explain
+  python tools/affected-modules.py origin/main...HEAD --json
+
+Exit Codes:
+  0 - Success (possibly no tasks)
+  2 - git or build file error
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Constants
+WORKSPACE_ROOT = Path(__file__).parent.parent
+SETTINGS_FILE = "settings.gradle.kts"
+BUILD_FILE = "build.gradle.kts"
+CACHE_FILE = WORKSPACE_ROOT / ".scope" / ".cache" / "modules.json"
+CACHE_FORMAT = 1
+
+# Root files that configure every module
+GLOBAL_FILES = {SETTINGS_FILE, BUILD_FILE, "gradle.properties", "gradlew", "gradlew.bat"}
+GLOBAL_DIRS = ("gradle/", "buildSrc/", "build-logic/")
+
+EXIT_OK = 0
+EXIT_ERROR = 2
+
+_COMMENT = re.compile(r'//[^\n]*|/\*.*?\*/|("(?:\\.|[^"\\\n])*")', re.S)
+_INCLUDE = re.compile(r'\binclude\s*\(([^)]*)\)')
+_PROJECT_DIR = re.compile(r'project\(\s*"(:[^"]+)"\s*\)\s*\.projectDir\s*=\s*file\(\s*"([^"]+)"\s*\)')
+_QUOTED = re.compile(r'"(:[^"]+)"')
+_DEPENDENCY = re.compile(r'\b(\w+)\s*\(\s*project\(\s*(?:path\s*=\s*)?"(:[^"]+)"')
+
+
+class ModuleGraph:
+    """Gradle modules, their directories and project dependencies."""
+
+    def __init__(self, directories: dict[str, str], dependencies: dict[str, dict[str, list[str]]]):
+        self.directories = directories      # ":core:model" → "core/model"
+        self.dependencies = dependencies    # module → {dependency: [configurations]}
+        self.dependents: dict[str, set[str]] = {m: set() for m in directories}
+        for module, deps in dependencies.items():
+            for dep in deps:
+                self.dependents.setdefault(dep, set()).add(module)
+        # Longest directory first, so nested modules win over their parent
+        self._by_directory = sorted(((d.rstrip("/") + "/", m) for m, d in directories.items()),
+                                    key=lambda item: -len(item[0]))
+
+    def owner(self, path: str) -> Optional[str]:
+        for prefix, module in self._by_directory:
+            if path.startswith(prefix):
+                return module
+        return None
+
+    def closure(self, modules: set[str]) -> dict[str, Optional[str]]:
+        """Reverse-dependency closure: module → the module it was reached from (None if changed)."""
+        reached: dict[str, Optional[str]] = {m: None for m in modules}
+        queue = list(modules)
+        while queue:
+            module = queue.pop()
+            for dependent in self.dependents.get(module, ()):
+                if dependent not in reached:
+                    reached[dependent] = module
+                    queue.append(dependent)
+        return reached
+
+
+def strip_comments(text: str) -> str:
+    """Kotlin script without comments (string literals kept)."""
+    return _COMMENT.sub(lambda m: m.group(1) or "", text)
+
+
+def parse_settings(text: str) -> dict[str, str]:
+    """Included module path → directory."""
+    text = strip_comments(text)
+    directories = {}
+    for args in _INCLUDE.findall(text):
+        for module in _QUOTED.findall(args):
+            directories[module] = module.strip(":").replace(":", "/")
+    for module, directory in _PROJECT_DIR.findall(text):
+        if module in directories:
+            directories[module] = directory.strip("/")
+    return directories
+
+
+def parse_build_file(text: str) -> dict[str, list[str]]:
+    """Project dependency → configurations it is declared in."""
+    dependencies: dict[str, list[str]] = {}
+    for configuration, module in _DEPENDENCY.findall(strip_comments(text)):
+        configurations = dependencies.setdefault(module, [])
+        if configuration not in configurations:
+            configurations.append(configuration)
+    return dependencies
+
+
+def _load_cache() -> dict:
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+        return {}
+    return data.get("files", {})
+
+
+def _save_cache(files: dict):
+    tmp = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT, "files": files}, f, separators=(",", ":"))
+        os.replace(tmp, CACHE_FILE)
+    except OSError:
+        pass
+
+
+def load_graph(use_cache: bool = True) -> ModuleGraph:
+    """Parse settings and build files; unchanged files come from the cache."""
+    cache = _load_cache() if use_cache else {}
+    used = {}
+    parsed_now = []
+
+    def parsed(path: Path, parse):
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        key = f"{parse.__name__}:{hashlib.sha1(data).hexdigest()}"
+        if key not in cache:
+            cache[key] = parse(data.decode("utf-8", "replace"))
+            parsed_now.append(key)
+        used[key] = cache[key]
+        return used[key]
+
+    directories = parsed(WORKSPACE_ROOT / SETTINGS_FILE, parse_settings)
+    if directories is None:
+        raise FileNotFoundError(f"{SETTINGS_FILE} not found in {WORKSPACE_ROOT}")
+    dependencies = {}
+    for module, directory in directories.items():
+        deps = parsed(WORKSPACE_ROOT / directory / BUILD_FILE, parse_build_file)
+        dependencies[module] = {d: c for d, c in (deps or {}).items() if d in directories}
+
+    if use_cache and (parsed_now or used.keys() != cache.keys()):
+        _save_cache(used)  # new entries, or stale ones to drop
+    return ModuleGraph(directories, dependencies)
+
+
+def git_paths(*args: str) -> list[str]:
+    result = subprocess.run(["git", *args], capture_output=True, cwd=WORKSPACE_ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip())
+    return [p for p in result.stdout.decode("utf-8", "surrogateescape").split("\0") if p]
+
+
+def changed_files(revision: str) -> list[str]:
+    """
+    Paths changed in a range (A..B, A...B) or against a single revision.
+
+    A single revision is diffed against the working tree, so untracked (not
+    ignored) files count as well: a module with only brand-new files is affected.
+    """
+    # Deletions count: removing a file can break the module and its dependents
+    paths = git_paths("diff", "--name-only", "-z", "--no-renames", revision, "--")
+    if ".." not in revision:
+        paths += git_paths("ls-files", "--others", "--exclude-standard", "-z")
+    return paths
+
+
+def is_global(path: str) -> bool:
+    return path in GLOBAL_FILES or path.startswith(GLOBAL_DIRS)
+
+
+def modules_with_tests(graph: ModuleGraph) -> set[str]:
+    """Modules that have a tracked src/test source set."""
+    prefixes = {f"{d}/src/test/": m for m, d in graph.directories.items()}
+    tested = set()
+    for path in git_paths("ls-files", "-z", "--", *(f"{d}/src/test" for d in graph.directories.values())):
+        for prefix, module in prefixes.items():
+            if path.startswith(prefix):
+                tested.add(module)
+    return tested
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Affected Modules - Gradle test tasks for changed files",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("revision", nargs="?", default="HEAD",
+                        help="Revision or range to diff (default: HEAD, i.e. uncommitted changes)")
+    parser.add_argument("--files", nargs="+", help="Changed paths instead of git diff ('-' = stdin)")
+    parser.add_argument("--task", default="test", help="Task name per module (default: test)")
+    parser.add_argument("--restrict", help="Only print these tasks (comma-separated), if affected")
+    parser.add_argument("--include-untested", action="store_true",
+                        help="Also print tasks of modules without src/test")
+    parser.add_argument("--explain", action="store_true", help="Show why each module is affected")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse all build files")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        graph = load_graph(use_cache=not args.no_cache)
+        if args.files == ["-"]:
+            files = [line.strip() for line in sys.stdin if line.strip()]
+        elif args.files:
+            files = [f.replace("\\", "/").removeprefix("./") for f in args.files]
+        else:
+            files = changed_files(args.revision)
+        tested = None if args.include_untested else modules_with_tests(graph)
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(EXIT_ERROR)
+
+    global_files = [f for f in files if is_global(f)]
+    changed: dict[str, list[str]] = {}
+    unowned = []
+    for path in files:
+        module = graph.owner(path)
+        if module is not None:
+            changed.setdefault(module, []).append(path)
+        elif path not in global_files:
+            unowned.append(path)
+
+    if global_files:
+        reached = {m: None for m in graph.directories}
+    else:
+        reached = graph.closure(set(changed))
+    selected = sorted(m for m in reached if tested is None or m in tested)
+    if global_files and not args.restrict:
+        tasks = [args.task]
+    else:
+        tasks = [f"{m}:{args.task}" for m in selected]
+    if args.restrict:
+        affected = {f"{m}:{args.task}" for m in selected}
+        tasks = [t for t in (t.strip() for t in args.restrict.split(",")) if t in affected]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps({
+            "files": len(files),
+            "globalFiles": global_files,
+            "changedModules": sorted(changed),
+            "affectedModules": sorted(reached),
+            "unownedFiles": unowned,
+            "tasks": tasks,
+            "milliseconds": round(elapsed_ms, 1),
+        }, indent=2))
+        sys.exit(EXIT_OK)
+
+    if args.explain:
+        print(f"{len(files)} changed files, {len(graph.directories)} modules ({elapsed_ms:.0f} ms)",
+              file=sys.stderr)
+        if global_files:
+            print(f"  all modules: {', '.join(global_files[:5])}", file=sys.stderr)
+        for module in sorted(reached):
+            via = reached[module]
+            if global_files:
+                continue
+            reason = f"{len(changed[module])} changed files" if via is None else f"depends on {via}"
+            mark = "" if tested is None or module in tested else " (no tests)"
+            print(f"  {module}: {reason}{mark}", file=sys.stderr)
+        if unowned:
+            print(f"  {len(unowned)} files outside all modules", file=sys.stderr)
+    for task in tasks:
+        print(task)
+    sys.exit(EXIT_OK)
+
+
+if __name__ == "__main__":
+    main()
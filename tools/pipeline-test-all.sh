@@ -4,6 +4,8 @@
 #
 # Run all pipeline-related unit tests including transport and playback layers.
 #
+# Usage: pipeline-test-all.sh [--affected <revision|range>] [gradle args...]
+#
 
 set -e
 
@@ -12,15 +14,33 @@ echo
 
 cd "$(dirname "$0")/.."
 
+TASKS=(
+    :core:model:test
+    :core:metadata-normalizer:test
+    :infra:transport-telegram:test
+    :infra:transport-xtream:test
+    :pipeline:telegram:test
+    :pipeline:xtream:test
+    :playback:domain:test
+    :player:internal:test
+)
+
+# --affected <revision|range>: only the tasks of modules the change can break
+if [[ "${1:-}" == "--affected" ]]; then
+    RANGE="${2:?--affected needs a revision or range, e.g. origin/main...HEAD}"
+    shift 2
+    AFFECTED=$(python3 tools/affected-modules.py "$RANGE" --restrict "$(IFS=,; echo "${TASKS[*]}")")
+    if [[ -z "$AFFECTED" ]]; then
+        echo "✅ No module of this suite affected by $RANGE - nothing to run"
+        exit 0
+    fi
+    mapfile -t TASKS <<< "$AFFECTED"
+    echo "Affected by $RANGE: ${TASKS[*]}"
+    echo
+fi
+
 ./gradlew \
-    :core:model:test \
-    :core:metadata-normalizer:test \
-    :infra:transport-telegram:test \
-    :infra:transport-xtream:test \
-    :pipeline:telegram:test \
-    :pipeline:xtream:test \
-    :playback:domain:test \
-    :player:internal:test \
+    "${TASKS[@]}" \
     --no-daemon \
     "$@"
 
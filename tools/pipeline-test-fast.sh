@@ -5,6 +5,8 @@
 # Run fast pipeline-related unit tests.
 # Covers core model, metadata normalizer, and both pipelines.
 #
+# Usage: pipeline-test-fast.sh [--affected <revision|range>] [gradle args...]
+#
 
 set -e
 
@@ -13,11 +15,29 @@ echo
 
 cd "$(dirname "$0")/.."
 
+TASKS=(
+    :core:model:test
+    :core:metadata-normalizer:test
+    :pipeline:telegram:test
+    :pipeline:xtream:test
+)
+
+# --affected <revision|range>: only the tasks of modules the change can break
+if [[ "${1:-}" == "--affected" ]]; then
+    RANGE="${2:?--affected needs a revision or range, e.g. origin/main...HEAD}"
+    shift 2
+    AFFECTED=$(python3 tools/affected-modules.py "$RANGE" --restrict "$(IFS=,; echo "${TASKS[*]}")")
+    if [[ -z "$AFFECTED" ]]; then
+        echo "✅ No module of this suite affected by $RANGE - nothing to run"
+        exit 0
+    fi
+    mapfile -t TASKS <<< "$AFFECTED"
+    echo "Affected by $RANGE: ${TASKS[*]}"
+    echo
+fi
+
 ./gradlew \
-    :core:model:test \
-    :core:metadata-normalizer:test \
-    :pipeline:telegram:test \
-    :pipeline:xtream:test \
+    "${TASKS[@]}" \
     --no-daemon \
     "$@"
 
@@ -11,11 +11,51 @@ Usage:
   # Check multiple files (e.g., from git diff)
   python scope-guard-cli.py check-batch <file1> <file2> ...
   
-  # Check all staged files (for pre-commit hook)
-  python scope-guard-cli.py check-staged
+  # Check every path changed in a range (CI): renames, deletes, one git call
+  python scope-guard-cli.py check-range origin/main..HEAD
+  python scope-guard-cli.py check-range "$BASE...$HEAD" --json > annotations.json
+  python scope-guard-cli.py check-range "$BASE...$HEAD" --github   # ::error workflow commands
+  
+  # Pre-commit entry point: scope, content, naming and layer checks on the
+  # staged set, concurrently, one report with per-check timings
+  python scope-guard-cli.py pre-commit [--skip naming,layers] [--budget-ms 1500] [--json]
+  
+  # Check all staged files: paths, then added lines
+  python scope-guard-cli.py check-staged [--no-content]
+  
+  # forbiddenPatterns / layer rules on the lines added by the staged diff
+  python scope-guard-cli.py check-content [--json]
+  git diff -U0 main | python scope-guard-cli.py check-content --diff -
   
   # Show status of a file
   python scope-guard-cli.py status <file-path>
+  
+  # Benchmark the compiled matcher over all tracked files
+  python scope-guard-cli.py bench
+  
+  # Benchmark end-to-end startup of one-shot checks (compiled .scope/ snapshot)
+  python scope-guard-cli.py bench --startup
+  
+  # Scope coverage of all tracked files (tree report, UNTRACKED hot spots)
+  python scope-guard-cli.py coverage
+  python scope-guard-cli.py coverage --depth 3 --ext kt,java --json > coverage.json
+  
+  # Shadowed module paths and files claimed by several scopes
+  python scope-guard-cli.py overlaps [--json]
+  
+  # Layer boundaries over the Kotlin/Java import graph (imports cached per blob)
+  python scope-guard-cli.py layers [--json] [--workers 8] [--no-cache]
+  
+  # naming-rules.yaml over all sources, or only files changed since HEAD / a base ref
+  python scope-guard-cli.py naming [--changed [--base origin/main]] [--strict] [--json]
+  
+  # Query the audit log (all rotated segments, streamed)
+  python scope-guard-cli.py audit query --status BLOCKED,READ_ONLY --group-by day,scope
+  python scope-guard-cli.py audit query --file 'legacy/**' --since 2026-02-01 --limit 20
+  
+  # Run the persistent daemon (check commands use it automatically)
+  python scope-guard-cli.py serve
+  python scope-guard-cli.py serve --ping | --stop
 
 Exit Codes:
   0 - All files ALLOWED
@@ -24,14 +64,24 @@ Exit Codes:
 """
 
 import argparse
-import fnmatch
 import json
 import os
-import subprocess
 import sys
-from datetime import datetime
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional, Literal
+from typing import NamedTuple, Optional
+
+# subprocess and scope_guard.daemon (socketserver) are imported by the
+# commands that need them: a one-shot `check` should not pay for them.
+from scope_guard.audit import AuditWriter, aggregate, parse_timestamp, query as query_audit
+from scope_guard.client import ScopeGuardClient, default_socket_path
+from scope_guard.config import ConfigError, load_config as _load_config, load_layer_rules, load_scopes
+from scope_guard.content import ContentRules, parse_added_lines
+from scope_guard.coverage import ROOT_LABEL, build_tree, file_sizes, filter_paths, hot_spots
+from scope_guard.matcher import Classification, ScopeMatcher, Status
+from scope_guard.overlaps import contested_files, declared_files, shadowed_modules
 
 # ============================================================================
 # Constants
@@ -40,22 +90,25 @@ from typing import Optional, Literal
 WORKSPACE_ROOT = Path(__file__).parent.parent
 SCOPE_DIR = WORKSPACE_ROOT / ".scope"
 CONFIG_FILE = SCOPE_DIR / "scope-guard.config.json"
-AUDIT_LOG = SCOPE_DIR / "audit.log"
+AUDIT_LOG = Path(os.environ.get("SCOPE_GUARD_AUDIT_LOG") or SCOPE_DIR / "audit.log")
 
 # Exit codes
 EXIT_ALLOWED = 0
 EXIT_BLOCKED = 1
 EXIT_ERROR = 2
 
-# Status types
-Status = Literal[
-    "ALLOWED",      # File can be edited
-    "EXCLUDED",     # Build artifact, auto-allowed
-    "READ_ONLY",    # Protected path, HARD BLOCK
-    "UNTRACKED",    # Not in any scope, WARNING but allowed
-    "BUNDLE",       # In a bundle, allowed with warning
-    "SCOPE",        # In a scope, allowed
-]
+# Classifying every tracked file must stay well below this (ms)
+BENCH_TARGET_MS = 100
+
+# Wall time of `pre-commit` (all checks) above which a warning is printed (ms);
+# SCOPE_GUARD_HOOK_BUDGET_MS overrides it
+PRE_COMMIT_BUDGET_MS = 1500
+PRE_COMMIT_CHECKS = ("scope", "content", "naming", "layers")
+
+# Median wall time a one-shot `check <file>` process adds on top of a bare
+# `python -c pass` (snapshot warm, no daemon), in ms. Interpreter start-up
+# itself varies too much between machines to be part of the target.
+STARTUP_TARGET_MS = 60
 
 # ============================================================================
 # Configuration Loading
@@ -63,168 +116,46 @@ Status = Literal[
 
 def load_config() -> dict:
     """Load scope guard configuration."""
-    if not CONFIG_FILE.exists():
-        print(f"ERROR: Config not found: {CONFIG_FILE}", file=sys.stderr)
+    try:
+        return _load_config(CONFIG_FILE)
+    except ConfigError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(EXIT_ERROR)
-    
-    with open(CONFIG_FILE) as f:
-        return json.load(f)
-
-
-def load_scopes() -> dict[str, dict]:
-    """Load all scope files."""
-    scopes = {}
-    for scope_file in SCOPE_DIR.glob("*.scope.json"):
-        try:
-            with open(scope_file) as f:
-                scope = json.load(f)
-                scopes[scope["scopeId"]] = scope
-        except Exception as e:
-            print(f"WARNING: Failed to load {scope_file}: {e}", file=sys.stderr)
-    return scopes
-
-
-# ============================================================================
-# Path Matching
-# ============================================================================
-
-def matches_glob(file_path: str, pattern: str) -> bool:
-    """Check if file matches glob pattern."""
-    # Normalize path
-    file_path = file_path.replace("\\", "/")
-    pattern = pattern.replace("\\", "/")
-    
-    # Handle ** patterns
-    if "**" in pattern:
-        # Convert ** to regex-like matching
-        parts = pattern.split("**")
-        if len(parts) == 2:
-            prefix, suffix = parts
-            prefix = prefix.rstrip("/")
-            suffix = suffix.lstrip("/")
-            
-            # Check if path starts with prefix (if any) and ends with suffix pattern
-            if prefix and not file_path.startswith(prefix):
-                return False
-            if suffix:
-                # Check if any part of remaining path matches suffix
-                remaining = file_path[len(prefix):].lstrip("/") if prefix else file_path
-                return fnmatch.fnmatch(remaining, f"*{suffix}") or fnmatch.fnmatch(remaining, suffix)
-            return True
-    
-    # Standard glob
-    return fnmatch.fnmatch(file_path, pattern)
-
-
-def is_excluded(file_path: str, config: dict) -> bool:
-    """Check if file is in global excludes (build artifacts, etc.)."""
-    for pattern in config.get("globalExcludes", []):
-        if matches_glob(file_path, pattern):
-            return True
-    return False
-
-
-def is_read_only(file_path: str, config: dict) -> tuple[bool, Optional[str]]:
-    """Check if file is in read-only paths. Returns (is_read_only, reason)."""
-    for pattern in config.get("readOnlyPaths", []):
-        if matches_glob(file_path, pattern):
-            # Check if it's a generated file
-            for bundle_id, bundle in config.get("bundles", {}).items():
-                for gen_pattern in bundle.get("generated", []):
-                    if matches_glob(file_path, gen_pattern):
-                        ssot = bundle.get("ssot", "unknown")
-                        return True, f"GENERATED file. Edit source: {ssot}"
-            return True, f"Protected by readOnlyPaths: {pattern}"
-    return False, None
-
-
-def find_bundle(file_path: str, config: dict) -> Optional[tuple[str, dict]]:
-    """Find matching bundle for file."""
-    for bundle_id, bundle in config.get("bundles", {}).items():
-        for pattern in bundle.get("patterns", []):
-            if matches_glob(file_path, pattern):
-                return bundle_id, bundle
-    return None
-
-
-def find_scope(file_path: str, scopes: dict[str, dict]) -> Optional[tuple[str, dict]]:
-    """Find matching scope for file."""
-    for scope_id, scope in scopes.items():
-        for module_path in scope.get("modules", {}).keys():
-            if file_path.startswith(module_path) or file_path.startswith(module_path + "/"):
-                return scope_id, scope
-    return None
 
 
 # ============================================================================
 # File Checking
 # ============================================================================
 
-def check_file(file_path: str, config: dict, scopes: dict) -> tuple[Status, str, Optional[str]]:
+def check_file(file_path: str, client: ScopeGuardClient) -> Classification:
     """
-    Check if a file can be edited.
+    Check if a file can be edited (via the daemon when one is running).
     
     Returns:
-        (status, message, scope_or_bundle_id)
+        Classification(status, message, owner, pattern, ssot)
     """
-    # Normalize path
-    rel_path = file_path
-    if rel_path.startswith(str(WORKSPACE_ROOT)):
-        rel_path = rel_path[len(str(WORKSPACE_ROOT)):].lstrip("/\\")
-    rel_path = rel_path.replace("\\", "/")
-    
-    # 1. Check if excluded (build artifacts)
-    if is_excluded(rel_path, config):
-        return "EXCLUDED", "Build artifact - auto-allowed", None
-    
-    # 2. Check if read-only (HARD BLOCK)
-    is_ro, reason = is_read_only(rel_path, config)
-    if is_ro:
-        return "READ_ONLY", reason or "Protected path", None
-    
-    # 3. Check bundles
-    bundle_match = find_bundle(rel_path, config)
-    if bundle_match:
-        bundle_id, bundle = bundle_match
-        return "BUNDLE", f"In bundle '{bundle_id}': {bundle.get('description', '')}", bundle_id
-    
-    # 4. Check scopes
-    scope_match = find_scope(rel_path, scopes)
-    if scope_match:
-        scope_id, scope = scope_match
-        return "SCOPE", f"In scope '{scope_id}': {scope.get('description', '')}", scope_id
-    
-    # 5. Untracked
-    return "UNTRACKED", "Not in any scope or bundle", None
-
-
-def audit(action: str, file_path: str, status: str, details: str = ""):
-    """Write to audit log."""
-    entry = {
-        "timestamp": datetime.now().isoformat(),
-        "source": "cli",
-        "action": action,
-        "filePath": file_path,
-        "status": status,
-        "details": details,
-    }
-    
-    try:
-        with open(AUDIT_LOG, "a") as f:
-            f.write(json.dumps(entry) + "\n")
-    except Exception:
-        pass  # Don't fail on audit errors
+    return client.classify(file_path)
+
+
+# Buffered; flushed (and rotated if due) once per command in main()
+AUDIT = AuditWriter(AUDIT_LOG, source="cli")
+
+
+def audit(action: str, file_path: str, status: str, details: str = "",
+          scope_id: Optional[str] = None):
+    """Write to audit log (buffered)."""
+    AUDIT.log(action, file_path, status, details, scope_id)
 
 
 # ============================================================================
 # Commands
 # ============================================================================
 
-def cmd_check(file_path: str, config: dict, scopes: dict) -> int:
+def cmd_check(file_path: str, client: ScopeGuardClient) -> int:
     """Check a single file. Returns exit code."""
-    status, message, scope_id = check_file(file_path, config, scopes)
+    status, message, scope_id, _pattern, _ssot = check_file(file_path, client)
     
-    audit("cli_check", file_path, status, message)
+    audit("cli_check", file_path, status, message, scope_id)
     
     if status == "READ_ONLY":
         print(f"❌ BLOCKED: {file_path}")
@@ -244,15 +175,14 @@ def cmd_check(file_path: str, config: dict, scopes: dict) -> int:
         return EXIT_ALLOWED
 
 
-def cmd_check_batch(files: list[str], config: dict, scopes: dict) -> int:
+def cmd_check_batch(files: list[str], client: ScopeGuardClient) -> int:
     """Check multiple files. Returns EXIT_BLOCKED if any blocked."""
     blocked = []
     allowed = []
     warnings = []
     
-    for file_path in files:
-        status, message, scope_id = check_file(file_path, config, scopes)
-        audit("cli_check_batch", file_path, status, message)
+    for file_path, (status, message, scope_id, *_rest) in zip(files, client.classify_many(files)):
+        audit("cli_check_batch", file_path, status, message, scope_id)
         
         if status == "READ_ONLY":
             blocked.append((file_path, message))
@@ -283,8 +213,10 @@ def cmd_check_batch(files: list[str], config: dict, scopes: dict) -> int:
     return EXIT_ALLOWED
 
 
-def cmd_check_staged(config: dict, scopes: dict) -> int:
-    """Check all git staged files."""
+def cmd_check_staged(client: ScopeGuardClient, content: bool = True) -> int:
+    """Check all git staged files, then the lines they add (content rules)."""
+    import subprocess
+    
     try:
         result = subprocess.run(
             ["git", "diff", "--cached", "--name-only", "--diff-filter=ACMR"],
@@ -304,64 +236,828 @@ def cmd_check_staged(config: dict, scopes: dict) -> int:
             return EXIT_ALLOWED
         
         print(f"Checking {len(files)} staged files...")
-        return cmd_check_batch(files, config, scopes)
+        code = cmd_check_batch(files, client)
+        if content:
+            print()
+            code = max(code, cmd_check_content(None, as_json=False))
+        return code
         
     except FileNotFoundError:
         print("ERROR: git not found", file=sys.stderr)
         return EXIT_ERROR
 
 
-def cmd_status(file_path: str, config: dict, scopes: dict) -> int:
+def staged_diff() -> str:
+    """`git diff --cached -U0` of added/copied/modified/renamed files."""
+    import subprocess
+    
+    result = subprocess.run(
+        ["git", "-c", "core.quotePath=false", "diff", "--cached", "-U0", "--no-color",
+         "--no-ext-diff", "--diff-filter=ACMR"],
+        capture_output=True,
+        cwd=WORKSPACE_ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip())
+    return result.stdout.decode("utf-8", "replace")
+
+
+def cmd_check_content(diff_file: Optional[str], as_json: bool) -> int:
+    """
+    Scan only the lines added by a diff (default: the staged one) against the
+    owning scope's forbiddenPatterns and the layer verificationCommands.
+    """
+    from scope_guard.snapshot import load_matcher
+    
+    try:
+        if diff_file is None:
+            diff = staged_diff()
+        elif diff_file == "-":
+            diff = sys.stdin.buffer.read().decode("utf-8", "replace")
+        else:
+            diff = Path(diff_file).read_bytes().decode("utf-8", "replace")
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: reading diff failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    
+    start = time.perf_counter()
+    added = parse_added_lines(diff)
+    rules = ContentRules(load_matcher(SCOPE_DIR, WORKSPACE_ROOT), load_layer_rules())
+    violations = rules.scan(added)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for v in violations:
+        audit("cli_check_content", v.path, "BLOCKED", f"line {v.line}: {v.reason or v.pattern}",
+              v.rule if v.rule in rules.scope_rules else None)
+    
+    if as_json:
+        print(json.dumps({
+            "files": len(added),
+            "addedLines": sum(len(lines) for lines in added.values()),
+            "warnings": rules.warnings,
+            "violations": [v._asdict() for v in violations],
+        }, indent=2, ensure_ascii=False))
+        return EXIT_BLOCKED if violations else EXIT_ALLOWED
+    
+    for warning in rules.warnings:
+        print(f"⚠ {warning}", file=sys.stderr)
+    lines = sum(len(lines) for lines in added.values())
+    print(f"Content rules: {lines} added lines in {len(added)} files ({elapsed_ms:.1f} ms)")
+    if not violations:
+        print("✓ No forbidden patterns in added lines")
+        return EXIT_ALLOWED
+    
+    print(f"\n❌ FORBIDDEN ({len(violations)} lines):")
+    for v in violations:
+        print(f"   {v.path}:{v.line}: {v.text}")
+        print(f"      → [{v.rule}] {v.reason or v.pattern}")
+    print(f"\n🚫 COMMIT BLOCKED - Remove {len(violations)} forbidden patterns above")
+    return EXIT_BLOCKED
+
+
+def git_name_status(revision: Optional[str]) -> list[tuple[str, str, Optional[str]]]:
+    """
+    (status letter, path, old path) per change from one
+    `git diff --name-status -z` call; revision None means the staged changes.
+    Renames/copies carry the old path.
+    """
+    import subprocess
+    
+    result = subprocess.run(
+        ["git", "diff", "--name-status", "-z", "-M", "--no-ext-diff", revision or "--cached", "--"],
+        capture_output=True,
+        cwd=WORKSPACE_ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip())
+    fields = result.stdout.decode("utf-8", "surrogateescape").split("\0")
+    changes = []
+    i = 0
+    while i < len(fields) and fields[i]:
+        letter = fields[i][0]
+        if letter in "RC":
+            changes.append((letter, fields[i + 2], fields[i + 1]))
+            i += 3
+        else:
+            changes.append((letter, fields[i + 1], None))
+            i += 2
+    return changes
+
+
+def touched_paths(changes: list[tuple[str, str, Optional[str]]]) -> dict[str, str]:
+    """path → how the change touches it ("M", "D", "R (from old)", "R (to new)")."""
+    touched: dict[str, str] = {}
+    for letter, path, old_path in changes:
+        touched[path] = letter if old_path is None else f"{letter} (from {old_path})"
+        if letter == "R":
+            touched.setdefault(old_path, f"R (to {path})")
+    return touched
+
+
+def cmd_check_range(revision: str, client: ScopeGuardClient, as_json: bool, github: bool,
+                    list_limit: int) -> int:
+    """
+    Check every path a range touches. Added, modified, copied and renamed-to
+    paths are edits; deleted and renamed-from paths are edits too (removing a
+    READ_ONLY file is as blocked as changing it).
+    """
+    start = time.perf_counter()
+    try:
+        changes = git_name_status(revision)
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: git diff failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    
+    touched = touched_paths(changes)
+    paths = list(touched)
+    results = client.classify_many(paths)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    counts = Counter(str(r.status) for r in results)
+    letters = Counter(letter for letter, _p, _o in changes)
+    blocked = [(p, r) for p, r in zip(paths, results) if r.status == Status.READ_ONLY]
+    untracked = [(p, r) for p, r in zip(paths, results) if r.status == Status.UNTRACKED]
+    for path, result in blocked:
+        audit("cli_check_range", path, str(result.status), result.message, result.owner)
+    
+    def annotation(path: str, result: Classification, level: str, title: str) -> dict:
+        return {"path": path, "start_line": 1, "end_line": 1, "annotation_level": level,
+                "title": title, "message": f"{touched[path]}: {result.message}"}
+    
+    if as_json:
+        print(json.dumps({
+            "range": revision,
+            "changes": dict(sorted(letters.items())),
+            "paths": len(paths),
+            "byStatus": dict(sorted(counts.items())),
+            "elapsedMs": round(elapsed_ms, 1),
+            "annotations": [annotation(p, r, "failure", "Scope Guard: read-only path") for p, r in blocked]
+                           + [annotation(p, r, "warning", "Scope Guard: untracked path") for p, r in untracked],
+        }, indent=2))
+        return EXIT_BLOCKED if blocked else EXIT_ALLOWED
+    
+    if github:
+        for path, result in blocked:
+            print(f"::error file={path},title=Scope Guard: read-only path::{touched[path]}: {result.message}")
+        for path, result in untracked:
+            print(f"::warning file={path},title=Scope Guard: untracked path::{touched[path]}: {result.message}")
+    
+    summary = ", ".join(f"{n} {letter}" for letter, n in sorted(letters.items()))
+    print(f"Range {revision}: {len(changes)} changes ({summary or 'none'}), "
+          f"{len(paths)} paths classified in {elapsed_ms:.0f} ms ({client.mode})")
+    for status in Status:
+        if counts.get(status.value):
+            print(f"  {status.value:<10} {counts[status.value]:>7}")
+    
+    if untracked and not github:
+        print(f"\n⚠ WARNINGS ({len(untracked)} untracked files):")
+        for path, _result in untracked[:list_limit]:
+            print(f"   {path}")
+        if len(untracked) > list_limit:
+            print(f"   ... {len(untracked) - list_limit} more (--limit)")
+    
+    if blocked:
+        if not github:
+            print(f"\n❌ BLOCKED ({len(blocked)} files):")
+            for path, result in blocked:
+                print(f"   {touched[path]} {path}")
+                print(f"      → {result.message}")
+        print(f"\n🚫 RANGE BLOCKED - {len(blocked)} read-only violations")
+        return EXIT_BLOCKED
+    print(f"\n✅ No read-only paths touched")
+    return EXIT_ALLOWED
+
+
+class CheckResult(NamedTuple):
+    name: str
+    summary: str
+    failures: list[str]     # block the commit
+    warnings: list[str]
+    ms: float
+
+
+def hook_budget_ms() -> float:
+    """SCOPE_GUARD_HOOK_BUDGET_MS, or PRE_COMMIT_BUDGET_MS if unset or not a number."""
+    value = os.environ.get("SCOPE_GUARD_HOOK_BUDGET_MS")
+    if not value:
+        return PRE_COMMIT_BUDGET_MS
+    try:
+        return float(value)
+    except ValueError:
+        print(f"⚠ SCOPE_GUARD_HOOK_BUDGET_MS={value!r} is not a number; "
+              f"using {PRE_COMMIT_BUDGET_MS} ms", file=sys.stderr)
+        return PRE_COMMIT_BUDGET_MS
+
+
+def cmd_pre_commit(client: ScopeGuardClient, skip: set[str], budget_ms: float, as_json: bool) -> int:
+    """
+    Single pre-commit entry point. The staged set (name-status and -U0 diff)
+    is read once; the checks share it and run concurrently:
+    
+      scope    READ_ONLY paths, including deleted and renamed-from    → fail
+      content  forbiddenPatterns / layer greps on added lines          → fail
+      naming   naming-rules.yaml errors → fail, warnings → warn
+      layers   forbidden imports on added lines → fail, on other lines
+               of staged files (already there) → warn
+    
+    naming and layers read the staged blobs, not the working tree, so
+    partially staged files are checked as they will be committed.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from scope_guard.snapshot import load_matcher
+    
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            name_status = pool.submit(git_name_status, None)
+            diff = pool.submit(staged_diff) if {"content", "layers"} - skip else None
+            changes = name_status.result()
+            added = parse_added_lines(diff.result()) if diff is not None else {}
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: git diff failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    git_ms = (time.perf_counter() - start) * 1000
+    
+    if not changes:
+        print("No staged files to check")
+        return EXIT_ALLOWED
+    touched = touched_paths(changes)
+    edited = [path for letter, path, _old in changes if letter != "D"]
+    matcher = load_matcher(SCOPE_DIR, WORKSPACE_ROOT) if {"content", "layers"} - skip else None
+    
+    def scope_check() -> tuple[str, list[str], list[str]]:
+        paths = list(touched)
+        failures, warnings = [], []
+        for path, result in zip(paths, client.classify_many(paths)):
+            if result.status == Status.READ_ONLY:
+                audit("cli_pre_commit", path, str(result.status), result.message, result.owner)
+                failures.append(f"{touched[path]} {path}\n      → {result.message}")
+            elif result.status == Status.UNTRACKED:
+                warnings.append(f"{path} (untracked)")
+        return f"{len(paths)} paths", failures, warnings
+    
+    def content_check() -> tuple[str, list[str], list[str]]:
+        rules = ContentRules(matcher, load_layer_rules())
+        violations = rules.scan(added)
+        for v in violations:
+            audit("cli_pre_commit", v.path, "BLOCKED", f"line {v.line}: {v.reason or v.pattern}",
+                  v.rule if v.rule in rules.scope_rules else None)
+        lines = sum(len(lines) for lines in added.values())
+        return (f"{lines} added lines",
+                [f"{v.path}:{v.line}: {v.text}\n      → [{v.rule}] {v.reason or v.pattern}" for v in violations],
+                rules.warnings)
+    
+    def naming_check() -> tuple[str, list[str], list[str]]:
+        from scope_guard.layers import load_naming_rules
+        from scope_guard.naming import NamingRules, validate
+        
+        findings, files, _seconds = validate(NamingRules(load_naming_rules()), edited, WORKSPACE_ROOT,
+                                            staged=True)
+        return (f"{files} sources",
+                [f"{f.path}:{f.line}: {f.message}  [{f.rule}]" for f in findings if f.severity == "error"],
+                [f"{f.path}:{f.line}: {f.message}  [{f.rule}]" for f in findings if f.severity == "warning"])
+    
+    def layers_check() -> tuple[str, list[str], list[str]]:
+        from scope_guard.layers import LayerModel, load_naming_rules, scan_repository
+        
+        model = LayerModel(load_layer_rules(), load_naming_rules())
+        files, _stats = scan_repository(WORKSPACE_ROOT, staged=True)
+        failures, warnings = [], []
+        for v in model.check(files, set(edited)):
+            text = f"{v.path}:{v.line}: import {v.imported}\n      → [{v.layer} ↛ {v.target}] {v.reason}"
+            new = any(line == v.line for line, _text in added.get(v.path, ()))
+            (failures if new else warnings).append(text)
+        return f"{len(set(edited) & files.keys())} sources", failures, warnings
+    
+    def timed(name: str, check) -> CheckResult:
+        t0 = time.perf_counter()
+        try:
+            summary, failures, warnings = check()
+        except (ConfigError, OSError, RuntimeError) as e:
+            summary, failures, warnings = "error", [f"{name} check failed: {e}"], []
+        except Exception as e:  # malformed rules or input: fail this check, report the others
+            summary, failures, warnings = "error", [f"{name} check crashed: {type(e).__name__}: {e}"], []
+        return CheckResult(name, summary, failures, warnings, (time.perf_counter() - t0) * 1000)
+    
+    checks = {"scope": scope_check, "content": content_check, "naming": naming_check, "layers": layers_check}
+    selected = [name for name in PRE_COMMIT_CHECKS if name not in skip]
+    with ThreadPoolExecutor(max_workers=len(selected) or 1) as pool:
+        futures = [pool.submit(timed, name, checks[name]) for name in selected]
+        results = [f.result() for f in futures]
+    total_ms = (time.perf_counter() - start) * 1000
+    failed = any(r.failures for r in results)
+    
+    if as_json:
+        print(json.dumps({
+            "staged": len(changes),
+            "gitMs": round(git_ms, 1),
+            "totalMs": round(total_ms, 1),
+            "budgetMs": budget_ms,
+            "checks": [{**r._asdict(), "ms": round(r.ms, 1)} for r in results],
+        }, indent=2, ensure_ascii=False))
+        return EXIT_BLOCKED if failed else EXIT_ALLOWED
+    
+    letters = Counter(letter for letter, _p, _o in changes)
+    print(f"Staged: {len(changes)} changes ({', '.join(f'{n} {l}' for l, n in sorted(letters.items()))}), "
+          f"git {git_ms:.0f} ms")
+    for r in results:
+        mark = "❌" if r.failures else ("⚠" if r.warnings else "✓")
+        counts = f"{len(r.failures)} blocking, {len(r.warnings)} warnings" if r.failures or r.warnings else "ok"
+        print(f"  {mark} {r.name:<8} {r.summary:<18} {counts:<28} {r.ms:>6.0f} ms")
+    print(f"  total {total_ms:.0f} ms")
+    
+    for r in results:
+        if r.warnings:
+            print(f"\n⚠ {r.name.upper()} WARNINGS ({len(r.warnings)}):")
+            for w in r.warnings[:20]:
+                print(f"   {w}")
+            if len(r.warnings) > 20:
+                print(f"   ... {len(r.warnings) - 20} more")
+    for r in results:
+        if r.failures:
+            print(f"\n❌ {r.name.upper()} ({len(r.failures)}):")
+            for f in r.failures:
+                print(f"   {f}")
+    
+    if total_ms > budget_ms:
+        slowest = max(results, key=lambda r: r.ms) if results else None
+        print(f"\n⚠ pre-commit took {total_ms:.0f} ms, budget {budget_ms:.0f} ms"
+              f"{f' (slowest: {slowest.name}, {slowest.ms:.0f} ms)' if slowest else ''}"
+              f" - start the daemon (serve) or --skip slow checks")
+    if failed:
+        print(f"\n🚫 COMMIT BLOCKED - {sum(len(r.failures) for r in results)} blocking findings above")
+        return EXIT_BLOCKED
+    print("\n✅ All pre-commit checks passed")
+    return EXIT_ALLOWED
+
+
+def cmd_status(file_path: str, client: ScopeGuardClient) -> int:
     """Show detailed status of a file."""
-    status, message, scope_id = check_file(file_path, config, scopes)
+    result, details = client.status(file_path)
+    status, message, scope_id, _pattern, ssot = result
     
     print(f"File: {file_path}")
     print(f"Status: {status}")
     print(f"Message: {message}")
     
     if status == "READ_ONLY":
-        # Check if it's a generated file with a source
-        for bundle_id, bundle in config.get("bundles", {}).items():
-            for gen_pattern in bundle.get("generated", []):
-                if matches_glob(file_path, gen_pattern):
-                    ssot = bundle.get("ssot", "unknown")
-                    print(f"\nEdit source: {ssot}")
-                    print(f"Sync command: scripts/sync-agent-rules.sh")
-                    break
-    elif scope_id:
-        if status == "BUNDLE":
-            bundle = config.get("bundles", {}).get(scope_id, {})
-            print(f"\nBundle: {scope_id}")
-            print(f"Description: {bundle.get('description', 'N/A')}")
-            
-            if bundle.get("invariants"):
-                print(f"Invariants:")
-                for inv in bundle.get("invariants", []):
-                    print(f"  • {inv}")
-            
-            if bundle.get("mandatoryReadBeforeEdit"):
-                print(f"Must read before edit:")
-                for file in bundle.get("mandatoryReadBeforeEdit", []):
-                    print(f"  → {file}")
-                    
-        elif status == "SCOPE":
-            scope = scopes.get(scope_id, {})
-            print(f"\nScope: {scope_id}")
-            print(f"Description: {scope.get('description', 'N/A')}")
-            
-            if scope.get("globalInvariants"):
-                print(f"Invariants:")
-                for inv in scope.get("globalInvariants", []):
-                    print(f"  • {inv}")
-            
-            if scope.get("mandatoryReadBeforeEdit"):
-                print(f"Must read before edit:")
-                for file in scope.get("mandatoryReadBeforeEdit", []):
-                    print(f"  → {file}")
+        # Generated file with a source
+        if ssot:
+            print(f"\nEdit source: {ssot}")
+            print(f"Sync command: scripts/sync-agent-rules.sh")
+    elif scope_id and status in ("BUNDLE", "SCOPE"):
+        print(f"\n{'Bundle' if status == 'BUNDLE' else 'Scope'}: {scope_id}")
+        print(f"Description: {details.get('description') or 'N/A'}")
+        
+        if details.get("invariants"):
+            print(f"Invariants:")
+            for inv in details["invariants"]:
+                print(f"  • {inv}")
+        
+        if details.get("mandatoryReadBeforeEdit"):
+            print(f"Must read before edit:")
+            for file in details["mandatoryReadBeforeEdit"]:
+                print(f"  → {file}")
     
     return EXIT_ALLOWED if status != "READ_ONLY" else EXIT_BLOCKED
 
 
+def parse_time_arg(value: Optional[str]) -> Optional[datetime]:
+    """ISO date/datetime, or relative '7d' / '12h'."""
+    if not value:
+        return None
+    if value[-1:] in ("d", "h") and value[:-1].isdigit():
+        amount = int(value[:-1])
+        delta = timedelta(days=amount) if value[-1] == "d" else timedelta(hours=amount)
+        return datetime.now(timezone.utc) - delta
+    ts = parse_timestamp(value)
+    if ts is None:
+        raise ValueError(f"Invalid time: {value}")
+    return ts
+
+
+def cmd_audit_query(args) -> int:
+    """Stream the audit log with filters, optionally aggregated."""
+    try:
+        since, until = parse_time_arg(args.since), parse_time_arg(args.until)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    
+    matches = query_audit(AUDIT_LOG, scope=args.scope, status=args.status, action=args.action,
+                          source=args.source, file_glob=args.file, since=since, until=until)
+    
+    if args.group_by:
+        fields = [f.strip() for f in args.group_by.split(",") if f.strip()]
+        counts = aggregate(matches, fields)
+        rows = sorted(counts.items())
+        if args.json:
+            print(json.dumps([dict(zip(fields, key), count=n) for key, n in rows], indent=2))
+            return EXIT_ALLOWED
+        width = [max([len(f)] + [len(k[i]) for k, _n in rows]) for i, f in enumerate(fields)]
+        print("  ".join(f.upper().ljust(w) for f, w in zip(fields, width)) + "  COUNT")
+        for key, n in rows:
+            print("  ".join(k.ljust(w) for k, w in zip(key, width)) + f"  {n:>5}")
+        print(f"\n{sum(counts.values())} entries in {len(rows)} groups")
+        return EXIT_ALLOWED
+    
+    shown = total = 0
+    for entry, _ts in matches:
+        total += 1
+        if args.limit and shown >= args.limit:
+            continue
+        shown += 1
+        if args.json:
+            print(json.dumps(entry))
+        else:
+            print(f"{entry.get('timestamp', '-'):<26} {entry.get('status', '-'):<10} "
+                  f"{entry.get('scopeId') or '-':<24} {entry.get('filePath') or entry.get('action', '-')}")
+    if not args.json:
+        print(f"\n{total} matching entries" + (f" ({shown} shown)" if shown < total else ""))
+    return EXIT_ALLOWED
+
+
+def cmd_audit_rotate() -> int:
+    """Rotate the audit log now."""
+    segment = AUDIT.maybe_rotate(force=True)
+    if segment is None:
+        print("Nothing to rotate")
+    else:
+        print(f"Rotated: {segment.name}")
+    return EXIT_ALLOWED
+
+
+def cmd_serve(socket_path: Path, ping: bool, stop: bool) -> int:
+    """Run the daemon, or query/stop a running one."""
+    if not (ping or stop):
+        from scope_guard.daemon import serve
+        return serve(socket_path)
+    
+    with ScopeGuardClient(socket_path, strict=False) as client:
+        try:
+            response = client.request({"op": "shutdown" if stop else "ping"})
+        except RuntimeError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return EXIT_ERROR
+    if response is None:
+        print(f"No Scope Guard daemon running on {socket_path}"
+              f"{f' ({client.rejected})' if client.rejected else ''}")
+        return EXIT_BLOCKED
+    if stop:
+        print("Scope Guard daemon stopped")
+    else:
+        print(f"Scope Guard daemon pid {response['pid']} on {socket_path} "
+              f"(version {response['version']}, protocol {response.get('protocol', '-')})")
+        print(f"  Generation {response['generation']} loaded {response['loaded_at']}, "
+              f"{response['scopes']} scopes, {response['requests']} requests served")
+    return EXIT_ALLOWED
+
+
+def git_ls_files() -> list[str]:
+    """All tracked paths from a single `git ls-files -z` call."""
+    import subprocess
+    
+    result = subprocess.run(
+        ["git", "ls-files", "-z"],
+        capture_output=True,
+        cwd=WORKSPACE_ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip())
+    return [p for p in result.stdout.decode("utf-8", "surrogateescape").split("\0") if p]
+
+
+def git_changed_files(base: str) -> list[str]:
+    """Added/copied/modified/renamed paths, index and working tree, relative to `base`."""
+    import subprocess
+    
+    result = subprocess.run(
+        ["git", "diff", "--name-only", "-z", "--diff-filter=ACMR", base, "--"],
+        capture_output=True,
+        cwd=WORKSPACE_ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip())
+    return [p for p in result.stdout.decode("utf-8", "surrogateescape").split("\0") if p]
+
+
+def cmd_bench(rounds: int) -> int:
+    """Classify every tracked file with the compiled matcher."""
+    try:
+        files = git_ls_files()
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: git ls-files failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    
+    config = load_config()
+    scopes = load_scopes(SCOPE_DIR)
+    
+    start = time.perf_counter()
+    matcher = ScopeMatcher(config, scopes, WORKSPACE_ROOT)
+    compile_ms = (time.perf_counter() - start) * 1000
+    
+    timings = []
+    for _ in range(max(1, rounds)):
+        start = time.perf_counter()
+        results = matcher.classify_many(files)
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    best = min(timings)
+    counts = Counter(r.status for r in results)
+    
+    print(f"Benchmark: {len(files)} tracked files, {len(scopes)} scopes, {rounds} rounds")
+    print(f"  Compile:  {compile_ms:7.2f} ms")
+    print(f"  Classify: {best:7.2f} ms best, {sum(timings) / len(timings):7.2f} ms mean "
+          f"({best * 1000 / max(1, len(files)):.2f} µs/path)")
+    for status in Status:
+        if counts.get(status):
+            print(f"    {status.value:<10} {counts[status]:>6}")
+    
+    if best > BENCH_TARGET_MS:
+        print(f"❌ Above target of {BENCH_TARGET_MS} ms")
+        return EXIT_BLOCKED
+    print(f"✅ Target met: < {BENCH_TARGET_MS} ms")
+    return EXIT_ALLOWED
+
+
+def cmd_bench_startup(runs: int, file_path: str) -> int:
+    """Wall time of one-shot `check <file>` processes, as a hook pays it."""
+    import statistics
+    import subprocess
+    import tempfile
+    from scope_guard.snapshot import load_matcher, snapshot_path
+    
+    def in_process(use_cache: bool) -> float:
+        start = time.perf_counter()
+        load_matcher(SCOPE_DIR, WORKSPACE_ROOT, use_cache=use_cache)
+        return (time.perf_counter() - start) * 1000
+    
+    load_matcher(SCOPE_DIR, WORKSPACE_ROOT)  # make sure the snapshot exists
+    print(f"Startup benchmark: `check {file_path}`, {runs} runs each")
+    print(f"  Matcher from sources:  {min(in_process(False) for _ in range(runs)):7.2f} ms")
+    print(f"  Matcher from snapshot: {min(in_process(True) for _ in range(runs)):7.2f} ms")
+    
+    script = str(Path(__file__).resolve())
+    check = [sys.executable, script, "--no-daemon", "check", file_path]
+    
+    def drop_snapshot():
+        try:
+            snapshot_path(SCOPE_DIR).unlink()
+        except OSError:
+            pass
+    
+    cases = [
+        ("python -c pass", [sys.executable, "-c", "pass"], {}, None),
+        ("check, sources", check, {"SCOPE_GUARD_NO_CACHE": "1"}, None),
+        ("check, snapshot rebuild", check, {}, drop_snapshot),
+        ("check, snapshot", check, {}, None),
+    ]
+    with ScopeGuardClient(default_socket_path(WORKSPACE_ROOT)) as probe:
+        if probe.request({"op": "ping"}) is not None:
+            cases.append(("check, daemon", [sys.executable, script, "check", file_path], {}, None))
+    
+    medians = {}
+    # Benchmark checks must not end up in the real audit log
+    with tempfile.TemporaryDirectory() as tmp:
+        base_env = dict(os.environ, SCOPE_GUARD_AUDIT_LOG=str(Path(tmp) / "audit.log"))
+        for label, cmd, extra_env, before in cases:
+            timings = []
+            for _ in range(max(1, runs)):
+                if before is not None:
+                    before()
+                start = time.perf_counter()
+                subprocess.run(cmd, env=dict(base_env, **extra_env), cwd=WORKSPACE_ROOT,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                timings.append((time.perf_counter() - start) * 1000)
+            medians[label] = statistics.median(timings)
+            print(f"  {label:<24} {medians[label]:7.1f} ms median, {min(timings):7.1f} ms min")
+    
+    overhead = medians["check, snapshot"] - medians["python -c pass"]
+    print(f"  Overhead over bare interpreter: {overhead:.1f} ms")
+    if overhead > STARTUP_TARGET_MS:
+        print(f"❌ Above target of {STARTUP_TARGET_MS} ms")
+        return EXIT_BLOCKED
+    print(f"✅ Target met: < {STARTUP_TARGET_MS} ms")
+    return EXIT_ALLOWED
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def cmd_coverage(client: ScopeGuardClient, depth: int, extensions: Optional[str],
+                 top: int, as_json: bool) -> int:
+    """Classify every tracked path once and report coverage per directory."""
+    start = time.perf_counter()
+    try:
+        paths = git_ls_files()
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: git ls-files failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    paths = filter_paths(paths, {e.strip() for e in extensions.split(",")} if extensions else None)
+    
+    results = client.classify_many(paths)
+    tree = build_tree(paths, results, file_sizes(paths, WORKSPACE_ROOT), depth=max(1, depth))
+    spots = hot_spots(tree, top)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    if as_json:
+        print(json.dumps({
+            "files": tree.total_files,
+            "bytes": tree.total_bytes,
+            "owned": tree.owned_files,
+            "ownedRatio": round(tree.owned_ratio, 4),
+            "depth": depth,
+            "extensions": extensions,
+            "elapsedMs": round(elapsed_ms, 1),
+            "tree": tree.to_dict(),
+            "untrackedHotSpots": [
+                {"path": n.path, "files": n.files[Status.UNTRACKED], "bytes": n.bytes[Status.UNTRACKED]}
+                for n in spots
+            ],
+        }, indent=2))
+        return EXIT_ALLOWED
+    
+    print(f"Scope coverage: {tree.total_files} tracked files"
+          f"{f' (*.{{{extensions}}})' if extensions else ''}, {format_bytes(tree.total_bytes)}")
+    for status in Status:
+        if tree.files.get(status):
+            print(f"  {status.value:<10} {tree.files[status]:>6} files  {format_bytes(tree.bytes[status]):>9}")
+    print(f"  Owned (SCOPE/BUNDLE): {tree.owned_ratio:.1%}")
+    
+    print(f"\n{'DIRECTORY':<44} {'FILES':>6} {'OWNED':>7} {'UNTRACKED':>9} {'READ_ONLY':>9} {'SIZE':>9}")
+    
+    def print_node(node, level):
+        name = node.path if node.path == ROOT_LABEL else node.path.rsplit("/", 1)[-1] + "/"
+        label = ("  " * level) + name
+        print(f"{label:<44} {node.total_files:>6} {node.owned_ratio:>7.0%} "
+              f"{node.files.get(Status.UNTRACKED, 0):>9} {node.files.get(Status.READ_ONLY, 0):>9} "
+              f"{format_bytes(node.total_bytes):>9}")
+        for _name, child in sorted(node.children.items(), key=lambda kv: -kv[1].total_files):
+            print_node(child, level + 1)
+    
+    for _name, child in sorted(tree.children.items(), key=lambda kv: -kv[1].total_files):
+        print_node(child, 0)
+    
+    if spots:
+        print(f"\nUNTRACKED hot spots (top {len(spots)}):")
+        for node in spots:
+            print(f"  {node.files[Status.UNTRACKED]:>5} files  "
+                  f"{format_bytes(node.bytes[Status.UNTRACKED]):>9}  "
+                  f"{node.path if node.path == ROOT_LABEL else node.path + '/'}")
+    print(f"\n({elapsed_ms:.0f} ms, {client.mode or 'in-process'})")
+    return EXIT_ALLOWED
+
+
+def cmd_overlaps(as_json: bool) -> int:
+    """Report shadowed module paths and files claimed by more than one scope."""
+    from scope_guard.snapshot import load_matcher
+    
+    try:
+        paths = git_ls_files()
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: git ls-files failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    matcher = load_matcher(SCOPE_DIR, WORKSPACE_ROOT)
+    
+    shadowed = shadowed_modules(matcher, paths)
+    contested = contested_files(matcher, paths)
+    declared = declared_files(matcher)
+    duplicates = [s for s in shadowed if s.kind == "duplicate"]
+    conflicts = [d for d in declared if d.conflict]
+    
+    if as_json:
+        print(json.dumps({
+            "shadowedModules": [s._asdict() for s in shadowed],
+            "contestedFiles": [
+                {"path": c.path, "owner": c.owner, "ownerVia": c.owner_via,
+                 "others": [{"scopeId": s, "via": via} for s, via in c.others]}
+                for c in contested
+            ],
+            "declaredFiles": [
+                {"path": d.path, "resolved": d.resolved, "conflict": d.conflict, "mismatch": d.mismatch,
+                 "entries": [{"scopeId": s, "ownership": o, "sharedWith": sw} for s, o, sw in d.entries]}
+                for d in declared
+            ],
+        }, indent=2))
+        return EXIT_BLOCKED if duplicates or conflicts else EXIT_ALLOWED
+    
+    print(f"Shadowed module paths ({len(shadowed)}):")
+    for s in shadowed:
+        if s.kind == "duplicate":
+            print(f"  ❌ {s.scope_id}: {s.module_path}")
+            print(f"       identical to {s.outer_scope}, which wins - {s.files} files never reach {s.scope_id}")
+        else:
+            print(f"  {'⚠' if s.kind == 'nested' else '•'} {s.scope_id}: {s.module_path}")
+            print(f"       inside {s.outer_scope}: {s.outer_path} - {s.files} files resolve to "
+                  f"{s.scope_id}{' (redundant)' if s.kind == 'redundant' else ''}")
+    
+    print(f"\nFiles claimed by several scopes ({len(contested)}):")
+    for c in contested:
+        others = ", ".join(s for s, _via in c.others)
+        print(f"  {c.path}")
+        print(f"       → {c.owner} (via {c.owner_via}); also {others}")
+    
+    print(f"\nDeclared files shared, conflicting or owned elsewhere ({len(declared)}):")
+    for d in declared:
+        mark = "❌" if d.conflict else ("⚠" if d.mismatch else "•")
+        entries = ", ".join(f"{s}={o}" for s, o, _sw in d.entries)
+        print(f"  {mark} {d.path}")
+        print(f"       declared {entries}; resolves to {d.resolved}")
+    
+    if duplicates or conflicts:
+        print(f"\n❌ {len(duplicates)} duplicate module paths, {len(conflicts)} files with several OWNERs")
+        return EXIT_BLOCKED
+    print("\n✅ No duplicate module paths or OWNER conflicts")
+    return EXIT_ALLOWED
+
+
+def cmd_layers(as_json: bool, workers: Optional[int], use_cache: bool) -> int:
+    """Report imports that cross layer-boundaries.rules.json boundaries."""
+    from scope_guard.layers import LayerModel, load_naming_rules, scan_repository
+    
+    model = LayerModel(load_layer_rules(), load_naming_rules())
+    try:
+        files, stats = scan_repository(WORKSPACE_ROOT, SCOPE_DIR / ".cache" if use_cache else None, workers)
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: git ls-files failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    violations = model.check(files)
+    
+    if as_json:
+        print(json.dumps({
+            "files": stats.files,
+            "cached": stats.cached,
+            "scanned": stats.scanned,
+            "seconds": round(stats.seconds, 3),
+            "warnings": model.warnings,
+            "violations": [v._asdict() for v in violations],
+        }, indent=2))
+        return EXIT_BLOCKED if violations else EXIT_ALLOWED
+    
+    for warning in model.warnings:
+        print(f"⚠ {warning}", file=sys.stderr)
+    imports = sum(len(f.imports) for f in files.values())
+    print(f"Scanned {stats.files} files, {imports} imports in {stats.seconds * 1000:.0f} ms "
+          f"({stats.cached} cached, {stats.scanned} read)")
+    if not violations:
+        print("✅ No forbidden cross-layer imports")
+        return EXIT_ALLOWED
+    
+    by_rule = Counter((v.layer, v.target) for v in violations)
+    print(f"\n❌ FORBIDDEN IMPORTS ({len(violations)}):")
+    for v in violations:
+        print(f"   {v.path}:{v.line}: import {v.imported}")
+        print(f"      → [{v.layer} ↛ {v.target}] {v.reason}")
+    print("\nBy rule:")
+    for (layer, target), n in by_rule.most_common():
+        print(f"  {n:5}  {layer} ↛ {target}")
+    return EXIT_BLOCKED
+
+
+def cmd_naming(changed: bool, base: str, strict: bool, as_json: bool, workers: Optional[int]) -> int:
+    """Validate package and declaration names against naming-rules.yaml."""
+    from scope_guard.layers import load_naming_rules
+    from scope_guard.naming import NamingRules, validate
+    
+    rules = NamingRules(load_naming_rules())
+    try:
+        paths = git_changed_files(base) if changed else git_ls_files()
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: git failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    findings, files, seconds = validate(rules, paths, WORKSPACE_ROOT, workers)
+    errors = [f for f in findings if f.severity == "error"]
+    warnings = [f for f in findings if f.severity == "warning"]
+    failed = bool(errors or (strict and warnings))
+    
+    if as_json:
+        print(json.dumps({
+            "files": files,
+            "seconds": round(seconds, 3),
+            "findings": [f._asdict() for f in findings],
+        }, indent=2))
+        return EXIT_BLOCKED if failed else EXIT_ALLOWED
+    
+    print(f"Checked {files} {'changed ' if changed else ''}source files in {seconds * 1000:.0f} ms")
+    if warnings:
+        print(f"\n⚠ WARNINGS ({len(warnings)}):")
+        for f in warnings:
+            print(f"   {f.path}:{f.line}: {f.message}  [{f.rule}]")
+    if errors:
+        print(f"\n❌ ERRORS ({len(errors)}):")
+        for f in errors:
+            print(f"   {f.path}:{f.line}: {f.message}  [{f.rule}]")
+    if failed:
+        print(f"\n🚫 Naming rules violated ({len(errors)} errors, {len(warnings)} warnings)")
+        return EXIT_BLOCKED
+    print(f"\n✅ No naming errors{f' ({len(warnings)} warnings)' if warnings else ''}")
+    return EXIT_ALLOWED
+
+
 # ============================================================================
 # Main
 # ============================================================================
@@ -373,6 +1069,9 @@ def main():
         epilog=__doc__
     )
     
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="Always check in-process, even if a daemon is running")
+    
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     
     # check command
@@ -384,34 +1083,165 @@ def main():
     batch_parser.add_argument("files", nargs="+", help="File paths to check")
     
     # check-staged command
-    subparsers.add_parser("check-staged", help="Check all git staged files")
+    staged_parser = subparsers.add_parser("check-staged", help="Check all git staged files")
+    staged_parser.add_argument("--no-content", action="store_true",
+                               help="Only check paths, not the content rules on added lines")
+    
+    # pre-commit command
+    hook_parser = subparsers.add_parser("pre-commit", help="All commit-time checks on the staged set, concurrently")
+    hook_parser.add_argument("--skip", default="", help=f"Checks to skip: {','.join(PRE_COMMIT_CHECKS)}")
+    hook_parser.add_argument("--budget-ms", type=float,
+                             help=f"Warn above this total time (default: SCOPE_GUARD_HOOK_BUDGET_MS "
+                                  f"or {PRE_COMMIT_BUDGET_MS})")
+    hook_parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    
+    # check-range command
+    range_parser = subparsers.add_parser("check-range", help="Check all paths changed in a git range (CI)")
+    range_parser.add_argument("range", help="Revision range, e.g. origin/main..HEAD or BASE...HEAD")
+    range_parser.add_argument("--json", action="store_true",
+                              help="Summary plus GitHub check-run annotations as JSON")
+    range_parser.add_argument("--github", action="store_true",
+                              help="Emit ::error/::warning workflow commands")
+    range_parser.add_argument("--limit", type=int, default=20, help="Untracked files to list (default: 20)")
+    
+    # check-content command
+    content_parser = subparsers.add_parser("check-content", help="Content rules on lines added by the staged diff")
+    content_parser.add_argument("--diff", metavar="FILE", help="Scan this unified diff instead ('-' = stdin)")
+    content_parser.add_argument("--json", action="store_true", help="Machine-readable output")
     
     # status command
     status_parser = subparsers.add_parser("status", help="Show file status details")
     status_parser.add_argument("file", help="File path to check")
     
+    # bench command
+    bench_parser = subparsers.add_parser("bench", help="Benchmark classification of all tracked files")
+    bench_parser.add_argument("--rounds", type=int, default=5, help="Benchmark rounds (default: 5)")
+    bench_parser.add_argument("--startup", action="store_true",
+                              help="Measure end-to-end wall time of one-shot `check` processes")
+    bench_parser.add_argument("--file", default="core/model/build.gradle.kts",
+                              help="Path checked by --startup")
+    
+    # coverage command
+    coverage_parser = subparsers.add_parser("coverage", help="Scope coverage of all tracked files")
+    coverage_parser.add_argument("--depth", type=int, default=2, help="Directory levels in the report (default: 2)")
+    coverage_parser.add_argument("--ext", help="Only these extensions, e.g. kt,java")
+    coverage_parser.add_argument("--top", type=int, default=10, help="UNTRACKED hot spots to list (default: 10)")
+    coverage_parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    
+    # overlaps command
+    overlaps_parser = subparsers.add_parser("overlaps", help="Shadowed module paths and multi-scope files")
+    overlaps_parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    
+    # layers command
+    layers_parser = subparsers.add_parser("layers", help="Forbidden cross-layer imports (import graph)")
+    layers_parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    layers_parser.add_argument("--workers", type=int, default=None,
+                               help="Scanner processes (default: CPU count)")
+    layers_parser.add_argument("--no-cache", action="store_true", help="Rescan every file")
+    
+    # naming command
+    naming_parser = subparsers.add_parser("naming", help="Validate names against naming-rules.yaml")
+    naming_parser.add_argument("--changed", action="store_true", help="Only files changed relative to --base")
+    naming_parser.add_argument("--base", default="HEAD", help="Base ref for --changed (default: HEAD)")
+    naming_parser.add_argument("--strict", action="store_true", help="Fail on warnings too")
+    naming_parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    naming_parser.add_argument("--workers", type=int, default=None,
+                               help="Scanner processes (default: CPU count)")
+    
+    # audit command
+    audit_parser = subparsers.add_parser("audit", help="Query or rotate the audit log")
+    audit_sub = audit_parser.add_subparsers(dest="audit_command")
+    query_parser = audit_sub.add_parser("query", help="Filter/aggregate audit entries")
+    query_parser.add_argument("--scope", help="scopeId(s), comma-separated")
+    query_parser.add_argument("--status", help="Status(es), e.g. BLOCKED,READ_ONLY")
+    query_parser.add_argument("--action", help="Action(s), e.g. check,cli_check_batch")
+    query_parser.add_argument("--source", help="Entry source (cli, mcp)")
+    query_parser.add_argument("--file", help="File glob, e.g. 'legacy/*'")
+    query_parser.add_argument("--since", help="ISO date/time or relative (7d, 12h)")
+    query_parser.add_argument("--until", help="ISO date/time or relative (7d, 12h)")
+    query_parser.add_argument("--group-by", help="Aggregate by fields: day,scope,status,action,source,file")
+    query_parser.add_argument("--limit", type=int, default=0, help="Max entries to print")
+    query_parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    audit_sub.add_parser("rotate", help="Rotate and compress the live log now")
+    
+    # serve command
+    serve_parser = subparsers.add_parser("serve", help="Run the persistent Scope Guard daemon")
+    serve_parser.add_argument("--socket", type=Path, default=None,
+                              help="Unix socket path (default: per-user runtime dir)")
+    serve_parser.add_argument("--ping", action="store_true", help="Query a running daemon")
+    serve_parser.add_argument("--stop", action="store_true", help="Stop a running daemon")
+    
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         sys.exit(EXIT_ERROR)
     
-    # Load configuration
-    config = load_config()
-    scopes = load_scopes()
+    if args.command == "bench":
+        if args.startup:
+            sys.exit(cmd_bench_startup(args.rounds * 4, args.file))
+        sys.exit(cmd_bench(args.rounds))
     
-    # Execute command
-    if args.command == "check":
-        sys.exit(cmd_check(args.file, config, scopes))
-    elif args.command == "check-batch":
-        sys.exit(cmd_check_batch(args.files, config, scopes))
-    elif args.command == "check-staged":
-        sys.exit(cmd_check_staged(config, scopes))
-    elif args.command == "status":
-        sys.exit(cmd_status(args.file, config, scopes))
-    else:
-        parser.print_help()
+    if args.command in ("overlaps", "layers", "naming"):
+        try:
+            if args.command == "layers":
+                sys.exit(cmd_layers(args.json, args.workers, not args.no_cache))
+            if args.command == "naming":
+                sys.exit(cmd_naming(args.changed, args.base, args.strict, args.json, args.workers))
+            sys.exit(cmd_overlaps(args.json))
+        except ConfigError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(EXIT_ERROR)
+    
+    if args.command == "audit":
+        if args.audit_command == "query":
+            sys.exit(cmd_audit_query(args))
+        elif args.audit_command == "rotate":
+            sys.exit(cmd_audit_rotate())
+        audit_parser.print_help()
         sys.exit(EXIT_ERROR)
+    
+    if args.command == "serve":
+        sys.exit(cmd_serve(args.socket or default_socket_path(WORKSPACE_ROOT), args.ping, args.stop))
+    
+    # Daemon when running, in-process matcher otherwise
+    client = ScopeGuardClient(default_socket_path(WORKSPACE_ROOT), use_daemon=not args.no_daemon)
+    
+    # Execute command
+    try:
+        if args.command == "check":
+            code = cmd_check(args.file, client)
+        elif args.command == "check-batch":
+            code = cmd_check_batch(args.files, client)
+        elif args.command == "check-staged":
+            code = cmd_check_staged(client, content=not args.no_content)
+        elif args.command == "pre-commit":
+            skip = {c.strip() for c in args.skip.split(",") if c.strip()}
+            unknown = skip - set(PRE_COMMIT_CHECKS)
+            if unknown:
+                print(f"ERROR: unknown checks: {', '.join(sorted(unknown))}", file=sys.stderr)
+                code = EXIT_ERROR
+            else:
+                budget_ms = args.budget_ms if args.budget_ms is not None else hook_budget_ms()
+                code = cmd_pre_commit(client, skip, budget_ms, args.json)
+        elif args.command == "check-range":
+            code = cmd_check_range(args.range, client, args.json, args.github, args.limit)
+        elif args.command == "check-content":
+            code = cmd_check_content(args.diff, args.json)
+        elif args.command == "status":
+            code = cmd_status(args.file, client)
+        elif args.command == "coverage":
+            code = cmd_coverage(client, args.depth, args.ext, args.top, args.json)
+        else:
+            parser.print_help()
+            code = EXIT_ERROR
+    except ConfigError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        code = EXIT_ERROR
+    finally:
+        client.close()
+        AUDIT.flush()
+    sys.exit(code)
 
 
 if __name__ == "__main__":
@@ -13,19 +13,34 @@ Options:
   --verbose       Show SCOPE and BUNDLE details with invariants
   --quiet         Only show BLOCKED (no UNTRACKED warnings)
   --interval N    Poll interval in seconds (default: 1)
+  --window N      Coalescing window in seconds (default: 0.5)
+  --backend B     auto | watchdog | inotify | polling (default: auto)
 
-Requirements:
+Backends (auto picks the first that works):
   - watchdog: pip install watchdog
+  - inotify:  Linux, built in (ctypes)
+  - polling:  everywhere; stats directories, lists only changed/hot ones
+
+Files are classified in-process with the compiled Scope Guard matcher (or by the
+daemon from `scope-guard-cli.py serve` when it is running). Create/modify/move
+events are coalesced until the workspace has been quiet for one window, then
+the deduplicated set is checked in one batch on a worker thread. Large bursts
+(branch switch, Gradle sync, refactoring) produce a single grouped report.
 """
 
 import argparse
-import os
 import subprocess
 import sys
+import threading
 import time
-from datetime import datetime
+from collections import Counter, OrderedDict
 from pathlib import Path
 
+from scope_guard.config import ConfigError
+from scope_guard.client import ScopeGuardClient
+from scope_guard.fswatch import InotifyWatcher, SmartPoller, inotify_available
+from scope_guard.matcher import Status
+
 # Check for watchdog
 try:
     from watchdog.observers import Observer
@@ -45,7 +60,20 @@ CYAN = '\033[0;36m'
 NC = '\033[0m'  # No Color
 
 WORKSPACE_ROOT = Path(__file__).parent.parent
-CLI_TOOL = WORKSPACE_ROOT / "tools" / "scope-guard-cli.py"
+
+# Distinct paths pending in one burst; beyond this, events are dropped and
+# reported instead of growing without bound.
+MAX_PENDING = 50000
+# A continuous burst is flushed at least this often (seconds)
+MAX_BURST_WAIT = 5.0
+# Bursts larger than this get a grouped summary instead of one entry per file
+GROUP_THRESHOLD = 20
+# Files listed per status in a grouped summary
+GROUP_LIST_LIMIT = 10
+# Recently reported paths (bounded); a path is not re-reported with the same
+# status within REPORT_COOLDOWN seconds (editors often save twice).
+RECENT_SIZE = 10000
+REPORT_COOLDOWN = 2.0
 
 # Patterns to exclude
 EXCLUDE_PATTERNS = {
@@ -88,6 +116,22 @@ def should_ignore(path: Path) -> bool:
     return False
 
 
+def ignore_path(path: str) -> bool:
+    """should_ignore() for plain strings (fswatch backends)."""
+    return should_ignore(Path(path))
+
+
+def watch_roots() -> list[tuple[str, bool]]:
+    """(directory, recursive) for each existing entry of WATCH_DIRS."""
+    roots = []
+    for dir_name in WATCH_DIRS:
+        watch_path = WORKSPACE_ROOT / dir_name if dir_name else WORKSPACE_ROOT
+        if watch_path.is_dir():
+            # For root, don't recurse (we handle subdirs separately)
+            roots.append((str(watch_path), bool(dir_name)))
+    return roots
+
+
 def get_relative_path(path: Path) -> str:
     """Get workspace-relative path."""
     try:
@@ -96,111 +140,183 @@ def get_relative_path(path: Path) -> str:
         return str(path)
 
 
-def check_file(rel_path: str, verbose: bool = False) -> dict:
-    """Check file status using CLI tool."""
-    cmd = [sys.executable, str(CLI_TOOL)]
-    if verbose:
-        cmd.extend(['status', rel_path])
-    else:
-        cmd.extend(['check', rel_path])
-    
+def revert_file(rel_path: str) -> bool:
+    """Revert file using git checkout."""
     try:
         result = subprocess.run(
-            cmd,
+            ['git', 'checkout', rel_path],
             capture_output=True,
-            text=True,
             cwd=WORKSPACE_ROOT,
             timeout=5
         )
-        return {
-            'output': result.stdout + result.stderr,
-            'returncode': result.returncode
-        }
-    except subprocess.TimeoutExpired:
-        return {'output': 'Timeout checking file', 'returncode': 2}
-    except Exception as e:
-        return {'output': str(e), 'returncode': 2}
+        return result.returncode == 0
+    except Exception:
+        return False
 
 
-def revert_file(rel_path: str) -> bool:
-    """Revert file using git checkout."""
+def revert_files(rel_paths: list[str], chunk: int = 200) -> int:
+    """Revert many files with few git calls. Returns the number reverted."""
+    reverted = 0
+    for i in range(0, len(rel_paths), chunk):
+        part = rel_paths[i:i + chunk]
+        if revert_file_batch(part):
+            reverted += len(part)
+        else:
+            # New files (unknown to git) fail the whole call; retry one by one
+            reverted += sum(revert_file(p) for p in part)
+    return reverted
+
+
+def revert_file_batch(rel_paths: list[str]) -> bool:
     try:
         result = subprocess.run(
-            ['git', 'checkout', rel_path],
+            ['git', 'checkout', '--'] + rel_paths,
             capture_output=True,
             cwd=WORKSPACE_ROOT,
-            timeout=5
+            timeout=30
         )
         return result.returncode == 0
     except Exception:
         return False
 
 
-class ScopeGuardHandler(FileSystemEventHandler):
-    """Handler for file system events."""
+class EventCoalescer:
+    """
+    Collects changed paths until no new event arrived for `window` seconds.
+
+    Duplicate events for the same path collapse into one entry; the pending set
+    is bounded by MAX_PENDING.
+    """
     
-    def __init__(self, aggressive: bool = False, verbose: bool = False, quiet: bool = False):
-        super().__init__()
+    def __init__(self, window: float, max_pending: int = MAX_PENDING):
+        self.window = window
+        self.max_pending = max_pending
+        self._pending: dict[str, None] = {}  # insertion-ordered set
+        self._last_event = 0.0
+        self._dropped = 0
+        self._cond = threading.Condition()
+    
+    def add(self, rel_path: str):
+        with self._cond:
+            if rel_path not in self._pending:
+                if len(self._pending) >= self.max_pending:
+                    self._dropped += 1
+                    return
+                self._pending[rel_path] = None
+            self._last_event = time.monotonic()
+            self._cond.notify()
+    
+    def take(self) -> tuple[list[str], int]:
+        """Block until a burst is complete; returns (paths, dropped events)."""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            started = time.monotonic()
+            while True:
+                now = time.monotonic()
+                quiet = now - self._last_event
+                if quiet >= self.window or now - started >= MAX_BURST_WAIT:
+                    break
+                self._cond.wait(self.window - quiet)
+            paths = list(self._pending)
+            dropped = self._dropped
+            self._pending.clear()
+            self._dropped = 0
+            return paths, dropped
+
+
+class CheckWorker(threading.Thread):
+    """Classifies coalesced bursts in one batch and prints the results."""
+    
+    def __init__(self, client: ScopeGuardClient, coalescer: EventCoalescer,
+                 aggressive: bool = False, verbose: bool = False, quiet: bool = False):
+        super().__init__(name="scope-guard-check", daemon=True)
+        self.client = client
+        self.coalescer = coalescer
         self.aggressive = aggressive
         self.verbose = verbose
         self.quiet = quiet
-        self._last_event = {}  # Debounce duplicate events
-    
-    def _debounce(self, path: str) -> bool:
-        """Returns True if we should process this event (not a duplicate)."""
-        now = time.time()
-        last = self._last_event.get(path, 0)
-        if now - last < 0.5:  # 500ms debounce
-            return False
-        self._last_event[path] = now
-        return True
+        self._recent: OrderedDict[str, tuple[Status, float]] = OrderedDict()
     
-    def on_modified(self, event):
-        if event.is_directory:
-            return
-        self._handle_event(event.src_path)
+    def run(self):
+        while True:
+            paths, dropped = self.coalescer.take()
+            try:
+                self._process(paths, dropped)
+            except Exception as e:  # keep watching even if one burst fails
+                print(f"{RED}Scope check failed: {e}{NC}")
     
-    def on_created(self, event):
-        if event.is_directory:
-            return
-        self._handle_event(event.src_path)
+    def _is_repeat(self, rel_path: str, status: Status, now: float) -> bool:
+        """True if the path was just reported with the same status."""
+        previous = self._recent.get(rel_path)
+        if previous is not None and previous[0] == status and now - previous[1] < REPORT_COOLDOWN:
+            return True
+        self._recent[rel_path] = (status, now)
+        self._recent.move_to_end(rel_path)
+        if len(self._recent) > RECENT_SIZE:
+            self._recent.popitem(last=False)
+        return False
     
-    def _handle_event(self, src_path: str):
-        path = Path(src_path)
-        
-        if should_ignore(path):
-            return
+    def _process(self, paths: list[str], dropped: int):
+        if dropped:
+            print(f"{YELLOW}⚠️  {dropped} events dropped (more than {MAX_PENDING} pending paths){NC}")
         
-        if not path.is_file():
-            return
-        
-        rel_path = get_relative_path(path)
+        now = time.monotonic()
+        results = [
+            (rel_path, result)
+            for rel_path, result in zip(paths, self.client.classify_many(paths))
+            if not self._is_repeat(rel_path, result.status, now)
+        ]
+        if len(results) > GROUP_THRESHOLD:
+            self._report_group(results)
+        else:
+            for rel_path, result in results:
+                self._report(rel_path, result)
+    
+    def _report_group(self, results: list):
+        counts = Counter(result.status for _path, result in results)
+        summary = ", ".join(f"{n} {status.value}" for status, n in counts.most_common())
+        color = RED if counts.get(Status.READ_ONLY) else BLUE
+        print(f"{color}📊 {len(results)} files changed: {summary}{NC}")
         
-        if not self._debounce(rel_path):
-            return
+        blocked: dict[str, list[str]] = {}
+        for rel_path, result in results:
+            if result.status == Status.READ_ONLY:
+                blocked.setdefault(result.message, []).append(rel_path)
+        for reason, paths in blocked.items():
+            print(f"{RED}🚫 BLOCKED ({len(paths)}): {reason}{NC}")
+            for rel_path in paths[:GROUP_LIST_LIMIT]:
+                print(f"   {rel_path}")
+            if len(paths) > GROUP_LIST_LIMIT:
+                print(f"   ... and {len(paths) - GROUP_LIST_LIMIT} more")
+            if self.aggressive:
+                reverted = revert_files(paths)
+                print(f"{YELLOW}   ↩ Auto-reverted {reverted}/{len(paths)} files{NC}")
+            print()
         
-        result = check_file(rel_path, self.verbose)
-        output = result['output']
+        if not self.quiet:
+            untracked = [p for p, r in results if r.status == Status.UNTRACKED]
+            if untracked:
+                print(f"{YELLOW}⚠️  UNTRACKED ({len(untracked)}):{NC}")
+                for rel_path in untracked[:GROUP_LIST_LIMIT]:
+                    print(f"   {rel_path}")
+                if len(untracked) > GROUP_LIST_LIMIT:
+                    print(f"   ... and {len(untracked) - GROUP_LIST_LIMIT} more")
+                print()
         
-        # Determine status from output
-        if 'BLOCKED' in output or result['returncode'] == 1:
-            status = 'READ_ONLY'
-        elif 'UNTRACKED' in output or 'WARNING' in output:
-            status = 'UNTRACKED'
-        elif 'Status: SCOPE' in output or 'In scope' in output:
-            status = 'SCOPE'
-        elif 'Status: BUNDLE' in output or 'In bundle' in output:
-            status = 'BUNDLE'
-        else:
-            status = 'ALLOWED'
+        if self.verbose:
+            owners = Counter(r.owner for _p, r in results if r.status in (Status.SCOPE, Status.BUNDLE))
+            for owner, n in owners.most_common():
+                print(f"{CYAN}   {owner}: {n} files{NC}")
+            if owners:
+                print()
+    
+    def _report(self, rel_path: str, result):
+        status = result.status
         
-        # Handle based on status
-        if status == 'READ_ONLY':
+        if status == Status.READ_ONLY:
             print(f"{RED}🚫 BLOCKED: {rel_path}{NC}")
-            # Extract relevant info
-            for line in output.split('\n'):
-                if any(x in line for x in ['Reason:', 'Message:', '→', 'Edit source:']):
-                    print(f"   {line.strip()}")
+            print(f"   Reason: {result.message}")
             
             if self.aggressive:
                 print(f"{YELLOW}   ↩ Auto-reverting...{NC}")
@@ -210,34 +326,78 @@ class ScopeGuardHandler(FileSystemEventHandler):
                     print(f"{RED}   Failed to revert (file may be new){NC}")
             print()
             
-        elif status == 'UNTRACKED' and not self.quiet:
+        elif status == Status.UNTRACKED and not self.quiet:
             print(f"{YELLOW}⚠️  UNTRACKED: {rel_path}{NC}")
             print("   Consider adding to a scope with scope-manager.py")
             print()
             
-        elif status == 'SCOPE' and self.verbose:
-            print(f"{CYAN}📁 SCOPE: {rel_path}{NC}")
-            # Extract scope name and invariants
-            for line in output.split('\n'):
-                if line.startswith('Scope:') or '•' in line:
-                    print(f"   {line.strip()}")
-            print()
-            
-        elif status == 'BUNDLE' and self.verbose:
-            print(f"{MAGENTA}📦 BUNDLE: {rel_path}{NC}")
-            for line in output.split('\n'):
-                if line.startswith('Bundle:') or '•' in line or '→' in line:
-                    print(f"   {line.strip()}")
+        elif status in (Status.SCOPE, Status.BUNDLE) and self.verbose:
+            _result, details = self.client.status(rel_path)
+            if status == Status.SCOPE:
+                print(f"{CYAN}📁 SCOPE: {rel_path}{NC}")
+                print(f"   Scope: {result.owner}")
+            else:
+                print(f"{MAGENTA}📦 BUNDLE: {rel_path}{NC}")
+                print(f"   Bundle: {result.owner}")
+            for inv in details.get("invariants", []):
+                print(f"   • {inv}")
+            if status == Status.BUNDLE:
+                for file in details.get("mandatoryReadBeforeEdit", []):
+                    print(f"   → {file}")
             print()
 
 
-def run_with_watchdog(args):
-    """Run watcher using watchdog library."""
-    event_handler = ScopeGuardHandler(
+class ScopeGuardHandler(FileSystemEventHandler):
+    """Handler for file system events (runs on the observer thread)."""
+    
+    def __init__(self, coalescer: EventCoalescer):
+        super().__init__()
+        self.coalescer = coalescer
+    
+    def on_modified(self, event):
+        if event.is_directory:
+            return
+        self._handle_event(event.src_path)
+    
+    def on_created(self, event):
+        if event.is_directory:
+            return
+        self._handle_event(event.src_path)
+    
+    def on_moved(self, event):
+        if event.is_directory:
+            return
+        self._handle_event(event.dest_path)
+    
+    def _handle_event(self, src_path: str):
+        path = Path(src_path)
+        
+        # Drop excluded directories before touching the filesystem
+        if should_ignore(path):
+            return
+        
+        if not path.is_file():
+            return
+        
+        self.coalescer.add(get_relative_path(path))
+
+
+def start_worker(args, client: ScopeGuardClient) -> EventCoalescer:
+    """Start the background checker shared by both watch modes."""
+    coalescer = EventCoalescer(args.window)
+    CheckWorker(
+        client,
+        coalescer,
         aggressive=args.aggressive,
         verbose=args.verbose,
         quiet=args.quiet
-    )
+    ).start()
+    return coalescer
+
+
+def run_with_watchdog(args, client: ScopeGuardClient):
+    """Run watcher using watchdog library."""
+    event_handler = ScopeGuardHandler(start_worker(args, client))
     
     observer = Observer()
     
@@ -260,66 +420,36 @@ def run_with_watchdog(args):
     observer.join()
 
 
-def run_polling_fallback(args):
-    """Simple polling fallback when watchdog is not available."""
-    print(f"{YELLOW}Note: Using polling mode. Install watchdog for better performance:{NC}")
-    print(f"  pip install watchdog")
+def run_with_inotify(args, client: ScopeGuardClient):
+    """Run watcher on Linux inotify (raises OSError if unavailable/exhausted)."""
+    watcher = InotifyWatcher(watch_roots(), ignore_path)
+    print(f"{GREEN}Using inotify backend ({watcher.watch_count} directories watched){NC}")
     print()
     
-    # Track file mtimes
-    mtimes = {}
+    handler = ScopeGuardHandler(start_worker(args, client))
     
-    def get_files():
-        """Get all files to monitor."""
-        files = []
-        for dir_name in WATCH_DIRS:
-            watch_path = WORKSPACE_ROOT / dir_name if dir_name else WORKSPACE_ROOT
-            if not watch_path.exists():
-                continue
-            
-            if dir_name:
-                # Recursive for subdirs
-                for f in watch_path.rglob('*'):
-                    if f.is_file() and not should_ignore(f):
-                        files.append(f)
-            else:
-                # Non-recursive for root
-                for f in watch_path.iterdir():
-                    if f.is_file() and not should_ignore(f):
-                        files.append(f)
-        return files
-    
-    # Initialize mtimes
-    for f in get_files():
-        try:
-            mtimes[str(f)] = f.stat().st_mtime
-        except Exception:
-            pass
+    def on_overflow():
+        print(f"{YELLOW}⚠️  inotify queue overflow - some events were lost{NC}")
     
-    handler = ScopeGuardHandler(
-        aggressive=args.aggressive,
-        verbose=args.verbose,
-        quiet=args.quiet
-    )
+    try:
+        watcher.run(handler._handle_event, on_overflow=on_overflow)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def run_polling_fallback(args, client: ScopeGuardClient):
+    """Polling fallback: directory-mtime pruning plus periodic full sweeps."""
+    print(f"{YELLOW}Note: Using polling mode. Install watchdog for better performance:{NC}")
+    print(f"  pip install watchdog")
+    print()
+    
+    poller = SmartPoller(watch_roots(), ignore_path)
+    handler = ScopeGuardHandler(start_worker(args, client))
     
     try:
-        while True:
-            time.sleep(args.interval)
-            
-            for f in get_files():
-                path = str(f)
-                try:
-                    mtime = f.stat().st_mtime
-                except Exception:
-                    continue
-                
-                if path not in mtimes:
-                    mtimes[path] = mtime
-                    handler._handle_event(path)
-                elif mtimes[path] != mtime:
-                    mtimes[path] = mtime
-                    handler._handle_event(path)
-                    
+        poller.run(handler._handle_event, interval=args.interval)
     except KeyboardInterrupt:
         pass
 
@@ -339,12 +469,19 @@ def main():
                         help='Only show BLOCKED files')
     parser.add_argument('--interval', type=float, default=1.0,
                         help='Poll interval in seconds (polling mode only)')
+    parser.add_argument('--window', type=float, default=0.5,
+                        help='Coalescing window in seconds (default: 0.5)')
+    parser.add_argument('--backend', choices=['auto', 'watchdog', 'inotify', 'polling'],
+                        default='auto', help='Change source (default: auto)')
     
     args = parser.parse_args()
     
-    # Check CLI tool exists
-    if not CLI_TOOL.exists():
-        print(f"{RED}ERROR: CLI tool not found: {CLI_TOOL}{NC}")
+    # Fail early on a broken config instead of inside the worker thread
+    client = ScopeGuardClient()
+    try:
+        client.classify("AGENTS.md")
+    except ConfigError as e:
+        print(f"{RED}ERROR: {e}{NC}")
         sys.exit(1)
     
     # Banner
@@ -366,11 +503,27 @@ def main():
     print()
     print(f"{MAGENTA}───────────────────────────────────────────────────────────────{NC}")
     
-    # Run watcher
-    if WATCHDOG_AVAILABLE:
-        run_with_watchdog(args)
-    else:
-        run_polling_fallback(args)
+    # Run watcher: watchdog → inotify → smart polling
+    backend = args.backend
+    if backend == 'watchdog' and not WATCHDOG_AVAILABLE:
+        print(f"{RED}ERROR: watchdog not installed (pip install watchdog){NC}")
+        sys.exit(1)
+    if backend == 'auto':
+        backend = 'watchdog' if WATCHDOG_AVAILABLE else 'inotify' if inotify_available() else 'polling'
+    
+    if backend == 'watchdog':
+        run_with_watchdog(args, client)
+        return
+    if backend == 'inotify':
+        try:
+            run_with_inotify(args, client)
+            return
+        except OSError as e:
+            if args.backend == 'inotify':
+                print(f"{RED}ERROR: inotify unavailable: {e}{NC}")
+                sys.exit(1)
+            print(f"{YELLOW}Note: inotify unavailable ({e}) - falling back to polling{NC}")
+    run_polling_fallback(args, client)
 
 
 if __name__ == '__main__':
@@ -23,6 +23,9 @@ Usage:
   
   # Show scope info
   python scope-manager.py info <scope-id>
+  
+  # Measure fileCount/totalLOC of all (or some) scopes and check budgets
+  python scope-manager.py measure [scope-id ...] [--dry-run] [--json]
 
 Examples:
   python scope-manager.py create telegram-transport "Telegram TDLib transport layer" \\
@@ -43,8 +46,12 @@ from datetime import date
 from pathlib import Path
 from typing import Optional, Literal
 
+from scope_guard.config import ConfigError, load_config
+from scope_guard.measure import ModuleSize, measure_modules
+
 # Constants
 SCOPE_DIR = Path(__file__).parent.parent / ".scope"
+CONFIG_FILE = SCOPE_DIR / "scope-guard.config.json"
 SCHEMA_FILE = SCOPE_DIR / "scope-guard.schema.json"
 DEFAULT_VERSION = "1.0.0"
 VALID_OWNERSHIP = ["OWNER", "CONSUMER", "SHARED"]
@@ -68,8 +75,8 @@ def load_scope(scope_id: str) -> Optional[dict]:
 def save_scope(scope_id: str, scope_data: dict) -> Path:
     """Save scope data to file."""
     scope_file = SCOPE_DIR / f"{scope_id}.scope.json"
-    with open(scope_file, "w") as f:
-        json.dump(scope_data, f, indent=2)
+    with open(scope_file, "w", encoding="utf-8") as f:
+        json.dump(scope_data, f, indent=2, ensure_ascii=False)
         f.write("\n")  # Trailing newline
     return scope_file
 
@@ -113,6 +120,15 @@ def count_files_in_module(module_data: dict) -> int:
     return count
 
 
+def measure_module(module_path: str) -> Optional[ModuleSize]:
+    """Measured size of one module path, or None if git is unavailable."""
+    try:
+        sizes, _stats = measure_modules([module_path])
+    except (OSError, RuntimeError):
+        return None
+    return sizes[module_path.replace("\\", "/").strip("/")]
+
+
 def create_new_scope(
     scope_id: str,
     description: str,
@@ -142,6 +158,8 @@ def create_new_scope(
         f".github/instructions/{scope_id.replace('-', '.')}.instructions.md"
     ]
     
+    size = measure_module(module_path)
+    
     scope_data = {
         "$schema": "./scope-guard.schema.json",
         "scopeId": scope_id,
@@ -150,8 +168,8 @@ def create_new_scope(
         "mandatoryReadBeforeEdit": mandatory_reads or default_reads,
         "modules": {
             module_path: {
-                "fileCount": len(critical_files),
-                "totalLOC": 0,  # Will be calculated later
+                "fileCount": size.files if size else len(critical_files),
+                "totalLOC": size.loc if size else 0,  # Until the next `measure`
                 "criticalFiles": critical_files
             }
         },
@@ -252,8 +270,11 @@ def add_files_to_scope(
             module_data["criticalFiles"].append(critical_file)
             added.append(file_path)
     
-    # Update file count
-    module_data["fileCount"] = count_files_in_module(module_data)
+    # Update file count (listed files if the module cannot be measured)
+    size = measure_module(module_key)
+    module_data["fileCount"] = size.files if size else count_files_in_module(module_data)
+    if size:
+        module_data["totalLOC"] = size.loc
     
     # Update timestamp
     scope_data["lastVerified"] = date.today().isoformat()
@@ -287,9 +308,10 @@ def add_module_to_scope(scope_id: str, module_path: str, files: list[str]) -> di
             "purpose": purpose
         })
     
+    size = measure_module(module_path)
     scope_data["modules"][module_path] = {
-        "fileCount": len(critical_files),
-        "totalLOC": 0,
+        "fileCount": size.files if size else len(critical_files),
+        "totalLOC": size.loc if size else 0,
         "criticalFiles": critical_files
     }
     
@@ -491,6 +513,96 @@ def validate_all_scopes() -> None:
         sys.exit(1)
 
 
+def measure_scopes(scope_ids: list[str], dry_run: bool = False, as_json: bool = False,
+                   workers: Optional[int] = None) -> None:
+    """Measure fileCount/totalLOC of scope modules, update scopes, check budgets."""
+    
+    try:
+        config = load_config(CONFIG_FILE)
+    except ConfigError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    max_files = config.get("maxFilesPerScope")
+    max_loc = config.get("maxLOCPerScope")
+    
+    all_scopes = sorted(list_scopes())
+    unknown = [s for s in scope_ids if s not in all_scopes]
+    if unknown:
+        print(f"Error: Scope(s) not found: {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+    scopes = {scope_id: load_scope(scope_id) for scope_id in (scope_ids or all_scopes)}
+    
+    module_paths = {m for scope in scopes.values() for m in scope.get("modules", {})}
+    try:
+        sizes, stats = measure_modules(module_paths, workers=workers, prune=not scope_ids)
+    except (OSError, RuntimeError) as e:
+        print(f"Error: git ls-files failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    report = {}
+    updated = []
+    for scope_id, scope_data in scopes.items():
+        modules = {}
+        changed = False
+        for module_path, module_data in scope_data.get("modules", {}).items():
+            size = sizes[module_path.replace("\\", "/").strip("/")]
+            modules[module_path] = {
+                "files": size.files,
+                "loc": size.loc,
+                "previous": [module_data.get("fileCount"), module_data.get("totalLOC")],
+            }
+            if (module_data.get("fileCount"), module_data.get("totalLOC")) != size:
+                module_data["fileCount"] = size.files
+                module_data["totalLOC"] = size.loc
+                changed = True
+        
+        files = sum(m["files"] for m in modules.values())
+        loc = sum(m["loc"] for m in modules.values())
+        violations = []
+        if max_files is not None and files > max_files:
+            violations.append(f"{files} files > maxFilesPerScope {max_files}")
+        if max_loc is not None and loc > max_loc:
+            violations.append(f"{loc} LOC > maxLOCPerScope {max_loc}")
+        report[scope_id] = {"files": files, "loc": loc, "modules": modules, "violations": violations}
+        
+        if changed and not dry_run:
+            save_scope(scope_id, scope_data)
+            updated.append(scope_id)
+    
+    violating = [s for s, r in report.items() if r["violations"]]
+    
+    if as_json:
+        print(json.dumps({
+            "stats": stats._asdict(),
+            "budget": {"maxFilesPerScope": max_files, "maxLOCPerScope": max_loc},
+            "scopes": report,
+            "updated": updated,
+        }, indent=2))
+    else:
+        print(f"\nMeasured {stats.files} source files in {stats.seconds:.2f}s "
+              f"({stats.counted} counted, {stats.cached} cached)\n")
+        for scope_id, r in report.items():
+            mark = "✗" if r["violations"] else "✓"
+            print(f"{mark} {scope_id:<34} {r['files']:>5} files {r['loc']:>7} LOC")
+            for module_path, m in r["modules"].items():
+                old_files, old_loc = m["previous"]
+                was = f"  (was {old_files} / {old_loc})" if [m["files"], m["loc"]] != m["previous"] else ""
+                print(f"    {module_path}: {m['files']} files, {m['loc']} LOC{was}")
+            for violation in r["violations"]:
+                print(f"    → {violation}")
+        print(f"\nBudget per scope: {max_files} files, {max_loc} LOC")
+        if dry_run:
+            print("Dry run - scope files not modified")
+        elif updated:
+            print(f"✓ Updated {len(updated)} scope files: {', '.join(updated)}")
+        if violating:
+            print(f"✗ {len(violating)} scope(s) over budget")
+        else:
+            print("All scopes within budget")
+    
+    sys.exit(1 if violating else 0)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Scope Guard Manager - Manage scope files",
@@ -535,6 +647,13 @@ def main():
     ownership_parser.add_argument("ownership", choices=VALID_OWNERSHIP, help="OWNER, CONSUMER, or SHARED")
     ownership_parser.add_argument("--shared-with", help="Comma-separated list of scope IDs that share this file")
     
+    # Measure command
+    measure_parser = subparsers.add_parser("measure", help="Measure file counts/LOC and check scope budgets")
+    measure_parser.add_argument("scope_ids", nargs="*", help="Scope IDs (default: all)")
+    measure_parser.add_argument("--dry-run", action="store_true", help="Report only, do not update scope files")
+    measure_parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    measure_parser.add_argument("--workers", type=int, default=None, help="Reader threads (default: CPU-based)")
+    
     # Add module command
     add_mod_parser = subparsers.add_parser("add-module", help="Add module to existing scope")
     add_mod_parser.add_argument("scope_id", help="Scope ID")
@@ -620,6 +739,9 @@ def main():
         output_path = save_scope(args.scope_id, scope_data)
         print(f"✓ Updated file ownership in: {output_path}")
     
+    elif args.command == "measure":
+        measure_scopes(args.scope_ids, dry_run=args.dry_run, as_json=args.json, workers=args.workers)
+    
     elif args.command == "add-module":
         scope_data = add_module_to_scope(args.scope_id, args.module_path, args.files or [])
         output_path = save_scope(args.scope_id, scope_data)
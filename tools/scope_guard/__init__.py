@@ -0,0 +1,13 @@
+"""
+Scope Guard library - shared by scope-guard-cli.py, scope-guard-watcher.py and
+scope-manager.py.
+
+The tools/ scripts are hyphenated and cannot be imported; everything that more
+than one of them needs lives here. Scripts in tools/ import it directly
+(tools/ is on sys.path when a script from there is executed).
+"""
+__all__ = [
+    "audit", "client", "config", "content", "coverage", "daemon", "fswatch", "layers", "matcher", "measure",
+    "naming", "overlaps", "snapshot",
+]
+__version__ = "0.1.0"
@@ -0,0 +1,285 @@
+"""
+Buffered, rotating audit log for Scope Guard.
+
+AuditWriter collects entries in memory and appends them with a single write
+per command (flush()). After flushing it rotates .scope/audit.log when it
+exceeds MAX_BYTES or its first entry is older than MAX_AGE_DAYS:
+
+  audit.log  →  audit.log.20260215T092157.123456.gz   (gzip, streamed)
+
+and records each segment in audit.log.index (JSON: first/last timestamp, entry
+count), so queries can skip segments outside the requested time range
+without decompressing them. Only the newest KEEP_SEGMENTS segments are kept.
+
+The MCP server appends to the same file with open/append/close per entry,
+so renaming the live file is safe: its next write creates a fresh audit.log.
+
+iter_entries()/query() stream entries segment by segment, line by line;
+memory use does not depend on the log size.
+"""
+import fnmatch
+import json
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+MAX_BYTES = 1024 * 1024
+MAX_AGE_DAYS = 30
+KEEP_SEGMENTS = 24
+# Not *.json: the daemon reloads its matcher when any .scope/*.json changes
+INDEX_NAME = "audit.log.index"
+LEGACY_INDEX_NAME = "audit.index.json"
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """
+    Parse audit timestamps to aware UTC datetimes.
+
+    MCP entries use "...Z", CLI entries naive local isoformat().
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.astimezone()
+    return ts.astimezone(timezone.utc)
+
+
+# ============================================================================
+# Writer
+# ============================================================================
+
+class AuditWriter:
+    """Buffer audit entries and write them once per command."""
+
+    def __init__(self, path: Path, source: str = "cli", max_bytes: int = MAX_BYTES,
+                 max_age_days: int = MAX_AGE_DAYS, keep_segments: int = KEEP_SEGMENTS):
+        self.path = Path(path)
+        self.source = source
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.keep_segments = keep_segments
+        self._buffer: list[str] = []
+
+    def log(self, action: str, file_path: str, status: str, details: str = "",
+            scope_id: Optional[str] = None):
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "source": self.source,
+            "action": action,
+            "filePath": file_path,
+            "status": str(status),
+            "details": details,
+        }
+        if scope_id:
+            entry["scopeId"] = scope_id
+        self._buffer.append(json.dumps(entry))
+
+    def flush(self):
+        """Append buffered entries with one write, then rotate if due."""
+        if not self._buffer:
+            return
+        data = "\n".join(self._buffer) + "\n"
+        self._buffer.clear()
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+            self.maybe_rotate()
+        except Exception:
+            pass  # Don't fail on audit errors
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    # -- rotation -----------------------------------------------------------
+
+    def _first_timestamp(self) -> Optional[datetime]:
+        with open(self.path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    return parse_timestamp(json.loads(line).get("timestamp"))
+                except (ValueError, AttributeError):
+                    continue
+        return None
+
+    def rotation_due(self) -> bool:
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return False
+        if size == 0:
+            return False
+        if size >= self.max_bytes:
+            return True
+        first = self._first_timestamp()
+        if first is None:
+            return False
+        return (datetime.now(timezone.utc) - first).days >= self.max_age_days
+
+    def maybe_rotate(self, force: bool = False) -> Optional[Path]:
+        if not (force or self.rotation_due()):
+            return None
+        return rotate(self.path, self.keep_segments)
+
+
+def _load_index(directory: Path) -> list[dict]:
+    for name in (INDEX_NAME, LEGACY_INDEX_NAME):
+        try:
+            with open(directory / name, encoding="utf-8") as f:
+                return json.load(f).get("segments", [])
+        except (OSError, ValueError):
+            continue
+    return []
+
+
+def _save_index(directory: Path, segments: list[dict]):
+    tmp = directory / (INDEX_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"segments": segments}, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, directory / INDEX_NAME)
+    try:
+        (directory / LEGACY_INDEX_NAME).unlink()  # migrated into INDEX_NAME
+    except OSError:
+        pass
+
+
+def rotate(path: Path, keep_segments: int = KEEP_SEGMENTS) -> Optional[Path]:
+    """Move the live log into a gzip segment and index it. Returns the segment."""
+    import gzip  # only needed on rotation / when reading segments
+
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S.%f")
+    staging = path.with_name(f"{path.name}.{stamp}")
+    counter = 1
+    while staging.exists() or staging.with_name(staging.name + ".gz").exists():
+        staging = path.with_name(f"{path.name}.{stamp}-{counter}")  # never overwrite a segment
+        counter += 1
+    try:
+        os.replace(path, staging)  # new writers start a fresh file from here on
+    except OSError:
+        return None
+
+    segment = staging.with_name(staging.name + ".gz")
+    first = last = None
+    entries = 0
+    with open(staging, "rb") as src, gzip.open(segment, "wb") as dst:
+        for line in src:
+            dst.write(line)
+            try:
+                ts = parse_timestamp(json.loads(line).get("timestamp"))
+            except (ValueError, AttributeError):
+                continue
+            if ts is not None:
+                entries += 1
+                first = ts if first is None or ts < first else first
+                last = ts if last is None or ts > last else last
+    staging.unlink()
+
+    segments = _load_index(path.parent)
+    segments.append({
+        "file": segment.name,
+        "first": first.isoformat() if first else None,
+        "last": last.isoformat() if last else None,
+        "entries": entries,
+    })
+    for old in segments[:-keep_segments] if keep_segments > 0 else []:
+        try:
+            (path.parent / old["file"]).unlink()
+        except OSError:
+            pass
+    _save_index(path.parent, segments[-keep_segments:] if keep_segments > 0 else segments)
+    return segment
+
+
+# ============================================================================
+# Query
+# ============================================================================
+
+def _segments(path: Path, since: Optional[datetime], until: Optional[datetime]) -> Iterator[Path]:
+    """Rotated segments (oldest first) that may overlap [since, until], then the live log."""
+    for segment in _load_index(path.parent):
+        first = parse_timestamp(segment.get("first"))
+        last = parse_timestamp(segment.get("last"))
+        if since and last and last < since:
+            continue
+        if until and first and first > until:
+            continue
+        candidate = path.parent / segment["file"]
+        if candidate.exists():
+            yield candidate
+    if path.exists():
+        yield path
+
+
+def iter_entries(path: Path, since: Optional[datetime] = None,
+                 until: Optional[datetime] = None) -> Iterator[dict]:
+    """Stream all parseable entries, oldest segment first."""
+    import gzip
+
+    for segment in _segments(path, since, until):
+        opener = gzip.open if segment.suffix == ".gz" else open
+        with opener(segment, "rt", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+
+
+def _split(values: Optional[str]) -> Optional[set[str]]:
+    return {v.strip() for v in values.split(",") if v.strip()} if values else None
+
+
+def entry_key(entry: dict, field: str, ts: Optional[datetime]) -> str:
+    if field == "day":
+        return ts.date().isoformat() if ts else "-"
+    if field == "scope":
+        return entry.get("scopeId") or "-"
+    if field == "file":
+        return entry.get("filePath") or "-"
+    return str(entry.get(field) or "-")
+
+
+def query(path: Path, scope: Optional[str] = None, status: Optional[str] = None,
+          action: Optional[str] = None, source: Optional[str] = None,
+          file_glob: Optional[str] = None, since: Optional[datetime] = None,
+          until: Optional[datetime] = None) -> Iterator[tuple[dict, Optional[datetime]]]:
+    """Stream (entry, timestamp) pairs matching all given filters."""
+    scopes, statuses, actions = _split(scope), _split(status), _split(action)
+    for entry in iter_entries(path, since, until):
+        if statuses and entry.get("status") not in statuses:
+            continue
+        if scopes and entry.get("scopeId") not in scopes:
+            continue
+        if actions and entry.get("action") not in actions:
+            continue
+        if source and entry.get("source", "mcp") != source:
+            continue
+        if file_glob and not fnmatch.fnmatch(entry.get("filePath") or "", file_glob):
+            continue
+        ts = parse_timestamp(entry.get("timestamp"))
+        if (since or until) and ts is None:
+            continue
+        if since and ts < since:
+            continue
+        if until and ts > until:
+            continue
+        yield entry, ts
+
+
+def aggregate(matches: Iterable[tuple[dict, Optional[datetime]]], group_by: list[str]) -> Counter:
+    """Count matches per tuple of group_by keys."""
+    counts: Counter = Counter()
+    for entry, ts in matches:
+        counts[tuple(entry_key(entry, field, ts) for field in group_by)] += 1
+    return counts
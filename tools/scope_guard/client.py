@@ -0,0 +1,222 @@
+"""
+Scope Guard client: classify paths via the daemon, or in-process.
+
+Kept apart from daemon.py so that a one-shot CLI run does not import
+socketserver, and only imports socket when a daemon socket actually exists.
+The in-process fallback loads the compiled .scope/ snapshot (snapshot.py).
+"""
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from . import __version__
+from .config import WORKSPACE_ROOT
+from .matcher import Classification, ScopeMatcher, Status
+from .snapshot import load_matcher
+
+CLIENT_TIMEOUT = 2.0    # seconds; a hung daemon must not block a commit
+PROTOCOL_VERSION = 1    # bump on incompatible request/response changes
+
+
+def default_socket_path(workspace_root: Path = WORKSPACE_ROOT) -> Path:
+    """
+    Per-user, per-checkout socket path.
+
+    Kept out of the workspace (AF_UNIX paths are limited to ~108 bytes) and
+    overridable with SCOPE_GUARD_SOCKET. Without XDG_RUNTIME_DIR the socket
+    lives in a per-user 0700 directory below /tmp, never directly in /tmp
+    where another user could bind the name first. crc32 rather than hashlib:
+    importing hashlib costs a one-shot CLI run several milliseconds.
+    """
+    override = os.environ.get("SCOPE_GUARD_SOCKET")
+    if override:
+        return Path(override)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    base = Path(runtime_dir) if runtime_dir else Path("/tmp") / f"scope-guard-{os.getuid()}"
+    digest = f"{zlib.crc32(str(workspace_root.resolve()).encode()):08x}"
+    return base / f"scope-guard-{digest}.sock"
+
+
+def socket_is_trusted(socket_path: Path) -> bool:
+    """
+    True if the socket and its directory belong to the current user and the
+    directory is not writable by anyone else (no one can swap the socket).
+    """
+    try:
+        st = os.stat(socket_path)
+        parent = os.stat(socket_path.parent)
+    except OSError:
+        return False
+    uid = os.getuid()
+    return st.st_uid == uid and parent.st_uid == uid and not parent.st_mode & 0o022
+
+
+def classification_to_dict(path: str, result: Classification) -> dict:
+    return {
+        "path": path,
+        "status": result.status.value,
+        "message": result.message,
+        "owner": result.owner,
+        "pattern": result.pattern,
+        "ssot": result.ssot,
+    }
+
+
+def classification_from_dict(data: dict) -> Classification:
+    return Classification(Status(data["status"]), data["message"],
+                          data.get("owner"), data.get("pattern"), data.get("ssot"))
+
+
+def owner_details(matcher: ScopeMatcher, result: Classification) -> dict:
+    """Description, invariants and mandatory reads of the owning bundle/scope."""
+    if result.status == Status.BUNDLE:
+        owner = matcher.bundles.get(result.owner, {})
+        invariants = owner.get("invariants", [])
+    elif result.status == Status.SCOPE:
+        owner = matcher.scopes.get(result.owner, {})
+        invariants = owner.get("globalInvariants", [])
+    else:
+        return {}
+    return {
+        "description": owner.get("description"),
+        "invariants": invariants,
+        "mandatoryReadBeforeEdit": owner.get("mandatoryReadBeforeEdit", []),
+    }
+
+
+class ScopeGuardClient:
+    """
+    Classify paths via the daemon, or in-process when none is running.
+
+    `mode` is "daemon" or "in-process" after the first request. A daemon is
+    only used if its socket passes socket_is_trusted() and its hello reports
+    this client's protocol, version and workspace; otherwise, or once it
+    answers a check with an error, `rejected` says why and checks run
+    in-process. strict=False skips the hello (serve --ping/--stop must reach
+    stale daemons too).
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = CLIENT_TIMEOUT,
+                 use_daemon: bool = True, strict: bool = True):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self.use_daemon = use_daemon
+        self.strict = strict
+        self.mode: Optional[str] = None
+        self.rejected: Optional[str] = None
+        self._sock = None
+        self._reader = None
+        self._matcher: Optional[ScopeMatcher] = None
+
+    # -- transport --------------------------------------------------------
+
+    def _connect(self) -> bool:
+        if self._sock is not None:
+            return True
+        if not self.use_daemon or not self.socket_path.exists():
+            return False
+        if not socket_is_trusted(self.socket_path):
+            return self._reject(f"socket {self.socket_path} not owned by this user or in a shared directory")
+        import socket
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError:
+            sock.close()
+            return False
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+        if self.strict:
+            hello = self._exchange({"op": "hello", "protocol": PROTOCOL_VERSION})
+            expected = (PROTOCOL_VERSION, __version__, str(WORKSPACE_ROOT.resolve()))
+            if hello is None or not hello.get("ok") or \
+                    (hello.get("protocol"), hello.get("version"), hello.get("workspace")) != expected:
+                self.close()
+                return self._reject("stale or foreign daemon (protocol/version/workspace mismatch)")
+        return True
+
+    def _reject(self, reason: str) -> bool:
+        self.rejected = reason
+        self.use_daemon = False
+        return False
+
+    def _exchange(self, payload: dict) -> Optional[dict]:
+        try:
+            self._sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            line = self._reader.readline()
+        except OSError:
+            return None
+        try:
+            return json.loads(line) if line else None
+        except ValueError:
+            return None
+
+    def request(self, payload: dict) -> Optional[dict]:
+        """Send one request to the daemon; None if it is unavailable, RuntimeError if it fails."""
+        if not self._connect():
+            return None
+        response = self._exchange(payload)
+        if response is None:
+            self.close()
+            self.use_daemon = False
+            return None
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "daemon error"))
+        return response
+
+    def _query(self, payload: dict) -> Optional[dict]:
+        """request(), but a daemon-side error disables the daemon (None, fall back in-process)."""
+        try:
+            return self.request(payload)
+        except RuntimeError as e:
+            self.close()
+            self._reject(f"daemon error: {e}")
+            return None
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            finally:
+                self._sock = self._reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- in-process fallback ----------------------------------------------
+
+    @property
+    def matcher(self) -> ScopeMatcher:
+        if self._matcher is None:
+            self._matcher = load_matcher()
+        return self._matcher
+
+    # -- API --------------------------------------------------------------
+
+    def classify_many(self, paths: list[str]) -> list[Classification]:
+        response = self._query({"op": "check", "paths": list(paths)}) if paths else None
+        if response is not None:
+            self.mode = "daemon"
+            return [classification_from_dict(r) for r in response["results"]]
+        self.mode = "in-process"
+        return self.matcher.classify_many(paths)
+
+    def classify(self, path: str) -> Classification:
+        return self.classify_many([path])[0]
+
+    def status(self, path: str) -> tuple[Classification, dict]:
+        response = self._query({"op": "status", "path": path})
+        if response is not None:
+            self.mode = "daemon"
+            return classification_from_dict(response["result"]), response["details"]
+        self.mode = "in-process"
+        result = self.matcher.classify(path)
+        return result, owner_details(self.matcher, result)
@@ -0,0 +1,56 @@
+"""
+Loading of .scope/scope-guard.config.json, .scope/*.scope.json and
+.scope/layer-boundaries.rules.json.
+"""
+import json
+import sys
+from pathlib import Path
+
+WORKSPACE_ROOT = Path(__file__).resolve().parent.parent.parent
+SCOPE_DIR = WORKSPACE_ROOT / ".scope"
+CONFIG_FILE = SCOPE_DIR / "scope-guard.config.json"
+LAYER_RULES_FILE = SCOPE_DIR / "layer-boundaries.rules.json"
+
+
+class ConfigError(Exception):
+    """Raised when scope-guard.config.json is missing or unreadable."""
+
+
+def load_config(config_file: Path = CONFIG_FILE) -> dict:
+    """Load scope guard configuration."""
+    if not config_file.exists():
+        raise ConfigError(f"Config not found: {config_file}")
+    try:
+        with open(config_file, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ConfigError(f"Failed to load {config_file}: {e}") from e
+
+
+def load_scopes(scope_dir: Path = SCOPE_DIR) -> dict[str, dict]:
+    """
+    Load all scope files, keyed by scopeId.
+
+    Files are read in name order so that the scope registered first for an
+    overlapping module path is the same on every machine.
+    """
+    scopes = {}
+    for scope_file in sorted(scope_dir.glob("*.scope.json")):
+        try:
+            with open(scope_file, encoding="utf-8") as f:
+                scope = json.load(f)
+                scopes[scope["scopeId"]] = scope
+        except Exception as e:
+            print(f"WARNING: Failed to load {scope_file}: {e}", file=sys.stderr)
+    return scopes
+
+
+def load_layer_rules(rules_file: Path = LAYER_RULES_FILE) -> dict:
+    """Load layer boundary rules ({} if the file does not exist)."""
+    if not rules_file.exists():
+        return {}
+    try:
+        with open(rules_file, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ConfigError(f"Failed to load {rules_file}: {e}") from e
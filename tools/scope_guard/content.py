@@ -0,0 +1,178 @@
+"""
+Content rules for staged changes (scope-guard-cli.py check-content).
+
+Only lines added by the change are scanned, never whole files, so cost
+scales with the diff and not with the repository:
+
+  git diff --cached -U0  →  parse_added_lines()  →  {path: [(line_no, text)]}
+
+Rules:
+  scope forbiddenPatterns   every scope's patterns are compiled into one
+                            regex (named alternatives p<i>) and applied to the
+                            added lines of files that scope owns.
+  layer verificationCommands  the `grep -rn '<regex>' <dir>...` commands in
+                            layer-boundaries.rules.json, applied to added lines
+                            of files below those directories.
+
+A pattern that is not a valid Python regex is matched literally and reported
+in ContentRules.warnings.
+"""
+import re
+import shlex
+from typing import NamedTuple, Optional
+
+from .matcher import ScopeMatcher, Status, compile_globs
+
+_HUNK = re.compile(r"@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class Violation(NamedTuple):
+    path: str
+    line: int
+    rule: str       # scope id, or "layer-boundaries"
+    pattern: str
+    reason: str
+    text: str
+
+
+def _unquote(path: str) -> str:
+    """Undo git's C-style quoting of unusual paths ("a\\tb.kt")."""
+    if not (path.startswith('"') and path.endswith('"')):
+        return path
+    raw = path[1:-1].encode("latin-1", "backslashreplace").decode("unicode_escape")
+    return raw.encode("latin-1", "replace").decode("utf-8", "replace")
+
+
+def parse_added_lines(diff: str) -> dict[str, list[tuple[int, str]]]:
+    """
+    Added lines per file (new-side line numbers) from unified diff text.
+    
+    Hunk bodies are consumed by the line counts of their @@ header, so an
+    added line that itself starts with "++ " ("+++ x" in the diff) is content,
+    not a file header.
+    """
+    added: dict[str, list[tuple[int, str]]] = {}
+    current: Optional[list] = None
+    line_no = 0
+    old_left = new_left = 0     # lines remaining in the current hunk
+    for line in diff.split("\n"):
+        if old_left > 0 or new_left > 0:
+            tag = line[:1]
+            if tag == "+":
+                if current is not None:
+                    current.append((line_no, line[1:].rstrip("\r")))
+                line_no += 1
+                new_left -= 1
+            elif tag == "-":
+                old_left -= 1
+            elif tag == " " or line == "":
+                line_no += 1  # context lines (only when -U > 0)
+                old_left -= 1
+                new_left -= 1
+            # "\ No newline at end of file" consumes nothing
+            continue
+        if line.startswith("diff --git"):
+            current = None
+        elif line.startswith("+++ "):
+            target = _unquote(line[4:].rstrip("\r"))
+            if target == "/dev/null":
+                current = None
+            else:
+                current = added.setdefault(target[2:] if target.startswith("b/") else target, [])
+        elif line.startswith("@@"):
+            m = _HUNK.match(line)
+            if m:
+                old_left = int(m.group(1) or 1)
+                line_no = int(m.group(2))
+                new_left = int(m.group(3) or 1)
+    return {path: lines for path, lines in added.items() if lines}
+
+
+class _Rule(NamedTuple):
+    name: str
+    regex: re.Pattern
+    patterns: list[tuple[str, str]]     # (pattern, reason) by group index
+
+
+def _combine(patterns: list[tuple[str, str]], name: str, warnings: list[str]) -> Optional[_Rule]:
+    alternatives = []
+    for i, (pattern, _reason) in enumerate(patterns):
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            warnings.append(f"{name}: invalid regex {pattern!r} ({e}), matched literally")
+            pattern = re.escape(pattern)
+        alternatives.append(f"(?P<p{i}>{pattern})")
+    if not alternatives:
+        return None
+    return _Rule(name, re.compile("|".join(alternatives)), patterns)
+
+
+def _parse_grep(command: str) -> Optional[tuple[str, list[str]]]:
+    """('regex', [dir globs]) from "grep -rn 'a\\|b' dir/ other/"; None if not a grep."""
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or argv[0] != "grep":
+        return None
+    args = [a for a in argv[1:] if not a.startswith("-")]
+    if len(args) < 2:
+        return None
+    regex = args[0].replace("\\|", "|").replace("\\(", "(").replace("\\)", ")")
+    return regex, [d.rstrip("/") + "/**" for d in args[1:]]
+
+
+class ContentRules:
+    """Compiled content rules: one regex per scope, one per layer command."""
+
+    def __init__(self, matcher: ScopeMatcher, layer_rules: Optional[dict] = None):
+        self.matcher = matcher
+        self.warnings: list[str] = []
+        self.scope_rules: dict[str, _Rule] = {}
+        for scope_id, scope in matcher.scopes.items():
+            patterns = [(p["pattern"], p.get("reason", "")) if isinstance(p, dict) else (p, "")
+                        for p in scope.get("forbiddenPatterns", [])]
+            rule = _combine([p for p in patterns if p[0]], scope_id, self.warnings)
+            if rule is not None:
+                self.scope_rules[scope_id] = rule
+
+        # (directory globs regex, rule) per verification command
+        self.layer_rules: list[tuple[re.Pattern, _Rule]] = []
+        for command in (layer_rules or {}).get("verificationCommands", []):
+            parsed = _parse_grep(command)
+            if parsed is None:
+                continue
+            regex, dirs = parsed
+            rule = _combine([(regex, f"Layer boundary ({' '.join(d[:-3] for d in dirs)})")],
+                            "layer-boundaries", self.warnings)
+            if rule is not None:
+                self.layer_rules.append((compile_globs(dirs), rule))
+
+    @staticmethod
+    def _scan(rule: _Rule, path: str, lines: list[tuple[int, str]], out: list[Violation]):
+        search = rule.regex.search
+        for line_no, text in lines:
+            m = search(text)
+            if m:
+                pattern, reason = rule.patterns[int(m.lastgroup[1:])]
+                out.append(Violation(path, line_no, rule.name, pattern, reason, text.strip()))
+
+    def scan(self, added: dict[str, list[tuple[int, str]]]) -> list[Violation]:
+        """Violations in the added lines, grouped by owning scope."""
+        violations: list[Violation] = []
+        paths = list(added)
+        by_scope: dict[str, list[str]] = {}
+        for path, result in zip(paths, self.matcher.classify_many(paths)):
+            if result.status == Status.SCOPE and result.owner in self.scope_rules:
+                by_scope.setdefault(result.owner, []).append(path)
+        for scope_id, scope_paths in by_scope.items():
+            rule = self.scope_rules[scope_id]
+            for path in scope_paths:
+                self._scan(rule, path, added[path], violations)
+        for dirs, rule in self.layer_rules:
+            for path in paths:
+                if dirs.match(path):
+                    self._scan(rule, path, added[path], violations)
+        violations.sort(key=lambda v: (v.path, v.line))
+        return violations
@@ -0,0 +1,118 @@
+"""
+Repository-wide scope coverage (scope-guard-cli.py coverage).
+
+Aggregates the classification of every tracked path into a directory tree:
+files and bytes per Status, per directory, down to a given depth. Depth 1 is
+the top-level module (core, infra, pipeline, feature, app-v2, ...); files in
+the repository root are grouped under ROOT_LABEL.
+
+"Owned" means SCOPE or BUNDLE: someone is responsible for the file.
+UNTRACKED hot spots are the directories with the most unowned files.
+"""
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .matcher import Classification, Status
+
+ROOT_LABEL = "(root)"
+OWNED = (Status.SCOPE, Status.BUNDLE)
+
+
+class CoverageNode:
+    """Per-status file/byte counters of one directory, with child directories."""
+
+    __slots__ = ("path", "files", "bytes", "children")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files: dict[Status, int] = {}
+        self.bytes: dict[Status, int] = {}
+        self.children: dict[str, "CoverageNode"] = {}
+
+    def add(self, status: Status, size: int):
+        self.files[status] = self.files.get(status, 0) + 1
+        self.bytes[status] = self.bytes.get(status, 0) + size
+
+    @property
+    def total_files(self) -> int:
+        return sum(self.files.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.bytes.values())
+
+    @property
+    def owned_files(self) -> int:
+        return sum(self.files.get(s, 0) for s in OWNED)
+
+    @property
+    def owned_ratio(self) -> float:
+        total = self.total_files
+        return self.owned_files / total if total else 0.0
+
+    def walk(self) -> Iterable["CoverageNode"]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "files": self.total_files,
+            "bytes": self.total_bytes,
+            "owned": self.owned_files,
+            "byStatus": {s.value: {"files": n, "bytes": self.bytes[s]}
+                         for s, n in sorted(self.files.items())},
+            "children": [c.to_dict() for _k, c in sorted(self.children.items())],
+        }
+
+
+def file_sizes(paths: list[str], workspace_root: Path) -> list[int]:
+    """Working-tree size of each path (0 if missing, e.g. deleted but tracked)."""
+    root = str(workspace_root)
+    sizes = []
+    for path in paths:
+        try:
+            sizes.append(os.lstat(os.path.join(root, path)).st_size)
+        except OSError:
+            sizes.append(0)
+    return sizes
+
+
+def build_tree(paths: list[str], results: list[Classification], sizes: list[int],
+               depth: int = 2) -> CoverageNode:
+    """Aggregate classified paths into a tree of at most `depth` directory levels."""
+    root = CoverageNode("")
+    for path, result, size in zip(paths, results, sizes):
+        status = result.status
+        root.add(status, size)
+        parts = path.split("/")[:-1][:depth] or [ROOT_LABEL]
+        node = root
+        prefix = ""
+        for part in parts:
+            prefix = f"{prefix}/{part}" if prefix else part
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = CoverageNode(prefix)
+            child.add(status, size)
+            node = child
+    return root
+
+
+def hot_spots(root: CoverageNode, limit: int = 10,
+              status: Status = Status.UNTRACKED) -> list[CoverageNode]:
+    """Deepest-level directories with the most files of `status`."""
+    leaves = [n for n in root.walk() if n is not root and not n.children]
+    leaves = [n for n in leaves if n.files.get(status)]
+    leaves.sort(key=lambda n: (-n.files[status], -n.bytes[status], n.path))
+    return leaves[:limit]
+
+
+def filter_paths(paths: list[str], extensions: Optional[set[str]]) -> list[str]:
+    if not extensions:
+        return paths
+    suffixes = tuple(f".{e.lstrip('.')}" for e in extensions)
+    return [p for p in paths if p.endswith(suffixes)]
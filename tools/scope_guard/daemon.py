@@ -0,0 +1,233 @@
+"""
+Persistent Scope Guard daemon.
+
+`scope-guard-cli.py serve` loads and compiles the config once and answers
+requests over a Unix socket. The protocol is JSON lines: one request object
+per line, one response object per line, many requests per connection.
+
+  {"op": "hello", "protocol": 1}         → {"ok": true, "protocol": 1, "version": ..., "workspace": ...}
+  {"op": "ping"}                         → {"ok": true, "version": ..., "generation": n, ...}
+  {"op": "check", "paths": ["a", "b"]}   → {"ok": true, "results": [{"path", "status", ...}]}
+  {"op": "status", "path": "a"}          → {"ok": true, "result": {...}, "details": {...}}
+  {"op": "reload"}                       → {"ok": true, "generation": n}
+  {"op": "shutdown"}                     → {"ok": true}
+
+Errors are reported as {"ok": false, "error": "..."}; the connection stays open.
+
+The socket is created with mode 0600 (bound under umask 0177) inside a
+directory only its owner can write; clients verify ownership and the hello
+reply before trusting any answer (client.ScopeGuardClient).
+
+.scope/ is polled for changed mtimes once per RELOAD_INTERVAL and the matcher
+is swapped atomically, so edits to scope files apply without a restart.
+
+ScopeGuardClient (client.py) talks to the daemon when one is running and
+otherwise checks in-process, so callers never need to care.
+"""
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from . import __version__
+from .client import PROTOCOL_VERSION, classification_to_dict, default_socket_path, owner_details
+from .config import SCOPE_DIR, WORKSPACE_ROOT, load_config, load_scopes
+from .matcher import ScopeMatcher
+
+RELOAD_INTERVAL = 1.0   # seconds between .scope/ mtime polls
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+class _MatcherHolder:
+    """Current compiled matcher plus reload bookkeeping."""
+
+    def __init__(self, scope_dir: Path, workspace_root: Path):
+        self.scope_dir = scope_dir
+        self.workspace_root = workspace_root
+        self.matcher: Optional[ScopeMatcher] = None
+        self.generation = 0
+        self.loaded_at = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def signature(self) -> tuple:
+        entries = []
+        for path in sorted(self.scope_dir.glob("*.json")):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((path.name, st.st_mtime_ns, st.st_size))
+        return tuple(entries)
+
+    def reload(self, force: bool = False) -> bool:
+        """Recompile when .scope/ changed (or when forced). Returns True on swap."""
+        with self._lock:
+            signature = self.signature()
+            if not force and signature == self._signature:
+                return False
+            config = load_config(self.scope_dir / "scope-guard.config.json")
+            scopes = load_scopes(self.scope_dir)
+            self.matcher = ScopeMatcher(config, scopes, self.workspace_root)
+            self._signature = signature
+            self.generation += 1
+            self.loaded_at = datetime.now().isoformat(timespec="seconds")
+            return True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                response = self.server.dispatch(request)
+            except Exception as e:  # keep serving on malformed requests
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if response.get("shutdown"):
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class ScopeGuardServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, scope_dir: Path = SCOPE_DIR,
+                 workspace_root: Path = WORKSPACE_ROOT, log=print):
+        self.socket_path = socket_path
+        self.log = log
+        self.holder = _MatcherHolder(scope_dir, workspace_root)
+        self.holder.reload(force=True)
+        self.requests_served = 0
+        self._served_lock = threading.Lock()
+        self._stop = threading.Event()
+        umask = os.umask(0o177)  # no window where the socket has umask permissions
+        try:
+            super().__init__(str(socket_path), _RequestHandler)
+        finally:
+            os.umask(umask)
+        os.chmod(socket_path, 0o600)
+
+    def dispatch(self, request: dict) -> dict:
+        op = request.get("op")
+        matcher = self.holder.matcher
+        with self._served_lock:
+            self.requests_served += 1
+        if op == "hello":
+            return {"ok": True, "protocol": PROTOCOL_VERSION, "version": __version__,
+                    "workspace": str(self.holder.workspace_root.resolve())}
+        if op == "check":
+            paths = request.get("paths") or []
+            return {"ok": True, "generation": self.holder.generation,
+                    "results": [classification_to_dict(p, matcher.classify(p)) for p in paths]}
+        if op == "status":
+            path = request["path"]
+            result = matcher.classify(path)
+            return {"ok": True, "result": classification_to_dict(path, result),
+                    "details": owner_details(matcher, result)}
+        if op == "ping":
+            return {"ok": True, "version": __version__, "protocol": PROTOCOL_VERSION, "pid": os.getpid(),
+                    "generation": self.holder.generation, "loaded_at": self.holder.loaded_at,
+                    "scopes": len(matcher.scopes), "requests": self.requests_served}
+        if op == "reload":
+            self.holder.reload(force=True)
+            return {"ok": True, "generation": self.holder.generation}
+        if op == "shutdown":
+            return {"ok": True, "shutdown": True}
+        return {"ok": False, "error": f"Unknown op: {op!r}"}
+
+    def _watch_scope_dir(self):
+        while not self._stop.wait(RELOAD_INTERVAL):
+            try:
+                if self.holder.reload():
+                    self.log(f"Reloaded .scope/ (generation {self.holder.generation})")
+            except Exception as e:  # keep the previous matcher on broken edits
+                self.log(f"WARNING: Reload failed, keeping generation "
+                         f"{self.holder.generation}: {e}")
+
+    def serve(self):
+        watcher = threading.Thread(target=self._watch_scope_dir, daemon=True)
+        watcher.start()
+        try:
+            self.serve_forever()
+        finally:
+            self._stop.set()
+            self.server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+
+def ensure_private_dir(directory: Path):
+    """
+    Create the socket directory 0700, or verify an existing one belongs to
+    this user and is not writable by others. Raises PermissionError otherwise.
+    """
+    try:
+        directory.mkdir(mode=0o700, parents=True)
+    except FileExistsError:
+        pass
+    st = os.stat(directory)
+    if st.st_uid != os.getuid() or st.st_mode & 0o022:
+        raise PermissionError(f"{directory} must be owned by uid {os.getuid()} and "
+                              f"not writable by group/others")
+
+
+def prepare_socket(socket_path: Path) -> bool:
+    """
+    Remove a stale socket file. Returns False if a daemon is already
+    listening on it.
+    """
+    if not socket_path.exists():
+        return True
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+        return False
+    except OSError:
+        socket_path.unlink()
+        return True
+    finally:
+        probe.close()
+
+
+def serve(socket_path: Optional[Path] = None) -> int:
+    """Run the daemon in the foreground until shutdown / Ctrl+C."""
+    socket_path = socket_path or default_socket_path()
+    try:
+        ensure_private_dir(socket_path.parent)
+    except OSError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    if not prepare_socket(socket_path):
+        print(f"Scope Guard daemon already running on {socket_path}", file=sys.stderr)
+        return 1
+
+    def log(message):
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}", flush=True)
+
+    start = time.perf_counter()
+    server = ScopeGuardServer(socket_path, log=log)
+    log(f"Scope Guard daemon listening on {socket_path} "
+        f"({len(server.holder.matcher.scopes)} scopes, "
+        f"compiled in {(time.perf_counter() - start) * 1000:.1f} ms)")
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    log("Scope Guard daemon stopped")
+    return 0
@@ -0,0 +1,295 @@
+"""
+Filesystem change sources for scope-guard-watcher.py when watchdog is missing.
+
+InotifyWatcher   Linux inotify through ctypes (no extra dependency), with
+                 recursive watch management: new directories are watched as
+                 they appear, removed ones are forgotten. Idle cost is a
+                 blocked poll() call.
+
+SmartPoller      Portable polling that stats directories, not files. A
+                 directory is only listed again when its mtime changed (entry
+                 added/removed/renamed) or when it is "hot" (changed recently).
+                 Files in hot directories are stat'ed every tick to catch
+                 in-place writes. A periodic full sweep catches in-place writes
+                 everywhere else.
+
+Both report changed file paths through a callback and skip directories for
+which `ignore(path)` is true before descending into them.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Iterable, Optional
+
+# ============================================================================
+# inotify
+# ============================================================================
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_SIZE = 64 * 1024
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        _libc.inotify_init1.argtypes = [ctypes.c_int]
+        _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return _libc
+
+
+def inotify_available() -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        return hasattr(_load_libc(), "inotify_init1")
+    except OSError:
+        return False
+
+
+class InotifyWatcher:
+    """
+    Recursive inotify watcher.
+
+    roots: iterable of (directory, recursive). Raises OSError if inotify cannot
+    be initialized or the per-user watch limit (fs.inotify.max_user_watches)
+    is exhausted while adding the initial tree.
+    """
+
+    def __init__(self, roots: Iterable[tuple[str, bool]], ignore: Callable[[str], bool]):
+        self.ignore = ignore
+        libc = _load_libc()
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self._dirs: dict[int, str] = {}        # wd → directory
+        self._recursive: dict[int, bool] = {}  # wd → recurse into new subdirectories
+        self.overflows = 0
+        try:
+            for root, recursive in roots:
+                if os.path.isdir(root):
+                    self._add_tree(root, recursive, strict=True)
+        except OSError:
+            self.close()
+            raise
+
+    @property
+    def watch_count(self) -> int:
+        return len(self._dirs)
+
+    def _add_watch(self, directory: str, recursive: bool, strict: bool) -> Optional[int]:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK | IN_ONLYDIR)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if strict or err == errno.ENOSPC:
+                raise OSError(err, f"inotify_add_watch({directory}): {os.strerror(err)}")
+            return None  # vanished or unreadable directory
+        self._dirs[wd] = directory
+        self._recursive[wd] = recursive
+        return wd
+
+    def _add_tree(self, top: str, recursive: bool, strict: bool = False, found: Optional[list] = None):
+        """Watch `top` (and its subdirectories); collect files already inside into `found`."""
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            if self._add_watch(directory, recursive, strict and directory == top) is None:
+                continue
+            if not (recursive or found is not None):
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if self.ignore(entry.path):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                        elif found is not None:
+                            found.append(entry.path)
+            except OSError:
+                continue
+
+    def read_events(self, timeout: float) -> list[str]:
+        """Wait up to `timeout` seconds; return changed file paths."""
+        poller = select.poll()
+        poller.register(self.fd, select.POLLIN)
+        if not poller.poll(int(timeout * 1000)):
+            return []
+        changed: list[str] = []
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            self._parse(data, changed)
+        return changed
+
+    def _parse(self, data: bytes, changed: list[str]):
+        offset = 0
+        size = _EVENT_HEADER.size
+        while offset + size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + size:offset + size + length].rstrip(b"\0")
+            offset += size + length
+
+            if mask & IN_Q_OVERFLOW:
+                self.overflows += 1
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    self._recursive.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not raw_name:
+                continue
+            path = os.path.join(directory, os.fsdecode(raw_name))
+            if self.ignore(path):
+                continue
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and self._recursive.get(wd):
+                    # Files may land before the new watch exists: report them too
+                    self._add_tree(path, True, found=changed)
+                continue
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE):
+                changed.append(path)
+
+    def run(self, callback: Callable[[str], None], timeout: float = 1.0,
+            on_overflow: Optional[Callable[[], None]] = None):
+        """Dispatch changed paths to `callback` until interrupted."""
+        while True:
+            overflows = self.overflows
+            for path in self.read_events(timeout):
+                callback(path)
+            if on_overflow is not None and self.overflows != overflows:
+                on_overflow()
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+# ============================================================================
+# Smart polling
+# ============================================================================
+
+class SmartPoller:
+    """
+    Incremental scandir poller that prunes unchanged directories by mtime.
+
+    Per tick: one stat() per directory, plus one stat() per file only in
+    directories whose mtime changed or that changed within `hot_ttl` seconds.
+    Every `full_sweep` seconds all files are stat'ed once.
+    """
+
+    def __init__(self, roots: Iterable[tuple[str, bool]], ignore: Callable[[str], bool],
+                 hot_ttl: float = 60.0, full_sweep: float = 30.0):
+        self.roots = list(roots)
+        self.ignore = ignore
+        self.hot_ttl = hot_ttl
+        self.full_sweep = full_sweep
+        # directory → (mtime_ns, {file name: mtime_ns}, [subdirectories])
+        self._dirs: dict[str, tuple[int, dict[str, int], list[str]]] = {}
+        self._hot: dict[str, float] = {}  # directory → last change (monotonic)
+        self._last_full = time.monotonic()
+        self.stats = 0
+        self.scan(full=True, report=False)
+
+    def _list(self, directory: str, recursive: bool) -> tuple[dict[str, int], list[str]]:
+        files: dict[str, int] = {}
+        subdirs: list[str] = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if self.ignore(entry.path):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files[entry.name] = entry.stat(follow_symlinks=False).st_mtime_ns
+                        self.stats += 1
+                except OSError:
+                    continue
+        return files, subdirs
+
+    def scan(self, full: bool = False, report: bool = True) -> list[str]:
+        """One polling pass; returns changed file paths."""
+        now = time.monotonic()
+        changed: list[str] = []
+        seen: set[str] = set()
+        for root, recursive in self.roots:
+            stack = [root]
+            while stack:
+                directory = stack.pop()
+                seen.add(directory)
+                try:
+                    mtime = os.stat(directory).st_mtime_ns
+                    self.stats += 1
+                except OSError:
+                    continue
+                previous = self._dirs.get(directory)
+                hot = now - self._hot.get(directory, -1e9) < self.hot_ttl
+                if previous is not None and previous[0] == mtime and not (hot or full):
+                    stack.extend(previous[2])
+                    continue
+                try:
+                    files, subdirs = self._list(directory, recursive)
+                except OSError:
+                    continue
+                old_files = previous[1] if previous is not None else {}
+                diff = [name for name, m in files.items() if old_files.get(name) != m]
+                if diff and previous is not None:
+                    self._hot[directory] = now
+                    if report:
+                        changed.extend(os.path.join(directory, name) for name in diff)
+                elif previous is None and report and directory != root:
+                    # New directory since the last tick: everything in it is new
+                    self._hot[directory] = now
+                    changed.extend(os.path.join(directory, name) for name in files)
+                self._dirs[directory] = (mtime, files, subdirs)
+                stack.extend(subdirs)
+        for directory in self._dirs.keys() - seen:
+            del self._dirs[directory]
+            self._hot.pop(directory, None)
+        for directory in [d for d, t in self._hot.items() if now - t >= self.hot_ttl]:
+            del self._hot[directory]
+        return changed
+
+    def tick(self) -> list[str]:
+        full = time.monotonic() - self._last_full >= self.full_sweep
+        if full:
+            self._last_full = time.monotonic()
+        return self.scan(full=full)
+
+    def run(self, callback: Callable[[str], None], interval: float = 1.0):
+        """Dispatch changed paths to `callback` until interrupted."""
+        while True:
+            time.sleep(interval)
+            for path in self.tick():
+                callback(path)
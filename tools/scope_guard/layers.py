@@ -0,0 +1,461 @@
+"""
+Import-graph check of .scope/layer-boundaries.rules.json (scope-guard-cli.py layers).
+
+Every tracked .kt/.java file is scanned for its `package` and `import`
+statements. A file belongs to the first layer whose path glob matches it; an
+import is mapped to layers by:
+
+  1. the packages declared by files of each layer (longest package prefix),
+  2. naming-rules.yaml module_patterns below namespace.v2 (pipeline.<name>,
+     infra.transport.<name>, ...), for packages no scanned file declares.
+
+Forbidden edges come from the rules files:
+
+  forbiddenCrossLayerImports  from → to; "to" is a layer ("pipeline DTOs"
+                              counts as pipeline), a package fragment
+                              ("data/obx/*") or class names ("Obx*Entity",
+                              "TelegramMediaItem|XtreamVodItem").
+  layers.<name>.forbidden     entries "<X> imports": X is a layer name, or
+                              otherwise a package segment ("ExoPlayer
+                              imports" → *.exoplayer.*). Other prose entries
+                              are not machine-checkable.
+  naming forbidden_patterns   package patterns ("com.chris.m3usuite") with
+                              their "in" location ("anywhere except legacy/").
+
+Import sets are cached per git blob SHA in .scope/.cache/imports.json, so a
+re-run only reads files whose content is new; cache misses are scanned in a
+process pool. Files modified in the working tree are always read.
+
+naming-rules.yaml is read with PyYAML when installed; otherwise a minimal
+parser for its subset of YAML (block mappings and lists, inline lists,
+quoted scalars) is used.
+"""
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+from .config import SCOPE_DIR, WORKSPACE_ROOT, ConfigError
+from .matcher import compile_globs
+from .measure import git_blob_sha, modified_paths, read_blobs, tracked_sources
+
+CACHE_FORMAT = 1
+CACHE_NAME = "imports.json"
+
+# Below this many files, scanning in-process beats starting a pool
+POOL_THRESHOLD = 64
+
+_PACKAGE = re.compile(rb"^[ \t]*package[ \t]+([\w.`]+)", re.M)
+_IMPORT = re.compile(rb"^[ \t]*import[ \t]+(?:static[ \t]+)?([\w.`]+(?:\.\*)?)", re.M)
+_CLASS_GLOB = re.compile(r"[A-Za-z_][\w*]*")
+_PACKAGE_NAME = re.compile(r"[a-z_]\w*(?:\.\w+)+")
+
+
+class FileImports(NamedTuple):
+    package: str
+    imports: list[tuple[int, str]]  # (line, imported name)
+
+
+class Edge(NamedTuple):
+    kind: str       # "layer" | "segment" | "package" | "class" | "prefix"
+    target: str     # layer name, package segment(s), class glob regex or prefix
+    label: str      # as written in the rules file
+    reason: str
+
+
+class LayerViolation(NamedTuple):
+    path: str
+    line: int
+    layer: str
+    imported: str
+    target: str
+    reason: str
+
+
+class ScanStats(NamedTuple):
+    files: int
+    cached: int
+    scanned: int
+    seconds: float
+
+
+# ============================================================================
+# naming-rules.yaml
+# ============================================================================
+
+def _strip_comment(line: str) -> str:
+    quote = None
+    for i, ch in enumerate(line):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == "#" and (i == 0 or line[i - 1].isspace()):
+            return line[:i]
+    return line
+
+
+def _scalar(text: str):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        return text[1:-1]
+    if text.startswith("[") and text.endswith("]"):
+        return [_scalar(t) for t in text[1:-1].split(",") if t.strip()]
+    return text
+
+
+def _parse_block(lines: list, i: int, indent: int):
+    if lines[i][1].startswith("-"):
+        items = []
+        while i < len(lines) and lines[i][0] == indent and lines[i][1].startswith("-"):
+            rest = lines[i][1][1:].lstrip()
+            if not rest:
+                i += 1
+                value = None
+                if i < len(lines) and lines[i][0] > indent:
+                    value, i = _parse_block(lines, i, lines[i][0])
+                items.append(value)
+            elif re.match(r"[\w\"'$-][^:]*:(\s|$)", rest):
+                # "- key: value" starts a mapping indented at the key
+                sub_indent = indent + len(lines[i][1]) - len(rest)
+                lines[i] = (sub_indent, rest)
+                value, i = _parse_block(lines, i, sub_indent)
+                items.append(value)
+            else:
+                items.append(_scalar(rest))
+                i += 1
+        return items, i
+
+    mapping = {}
+    while i < len(lines) and lines[i][0] == indent and not lines[i][1].startswith("-"):
+        key, _sep, rest = lines[i][1].partition(":")
+        key, rest = _scalar(key), rest.strip()
+        i += 1
+        if rest:
+            mapping[key] = _scalar(rest)
+        elif i < len(lines) and (lines[i][0] > indent
+                                 or (lines[i][0] == indent and lines[i][1].startswith("-"))):
+            mapping[key], i = _parse_block(lines, i, lines[i][0])
+        else:
+            mapping[key] = None
+    return mapping, i
+
+
+def parse_simple_yaml(text: str) -> dict:
+    """The YAML subset .scope/*.yaml files use, without PyYAML."""
+    lines = []
+    for raw in text.splitlines():
+        line = _strip_comment(raw).rstrip()
+        if line.strip() and line.strip() != "---":
+            lines.append((len(line) - len(line.lstrip(" ")), line.strip()))
+    if not lines:
+        return {}
+    value, _i = _parse_block(lines, 0, lines[0][0])
+    return value if isinstance(value, dict) else {}
+
+
+def load_naming_rules(path: Path = SCOPE_DIR / "naming-rules.yaml") -> dict:
+    """naming-rules.yaml as a dict ({} if the file does not exist)."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return {}
+    except OSError as e:
+        raise ConfigError(f"Failed to load {path}: {e}") from e
+    if not HAS_YAML:
+        return parse_simple_yaml(text)
+    try:
+        return yaml.safe_load(text) or {}
+    except yaml.YAMLError as e:
+        raise ConfigError(f"Invalid YAML in {path}: {e}") from e
+
+
+# ============================================================================
+# Scanning
+# ============================================================================
+
+def scan_imports(data: bytes) -> FileImports:
+    """Package and imports (with line numbers) of Kotlin/Java source."""
+    m = _PACKAGE.search(data)
+    package = m.group(1).replace(b"`", b"").decode("ascii", "replace") if m else ""
+    imports = []
+    line, pos = 1, 0
+    for m in _IMPORT.finditer(data):
+        line += data.count(b"\n", pos, m.start())
+        pos = m.start()
+        imports.append((line, m.group(1).replace(b"`", b"").decode("ascii", "replace")))
+    return FileImports(package, imports)
+
+
+def _scan_file(root: str, item: tuple[str, Optional[str]]) -> tuple[str, Optional[str], Optional[list]]:
+    path, sha = item
+    try:
+        with open(os.path.join(root, path), "rb") as f:
+            data = f.read()
+    except OSError:
+        return path, None, None  # deleted in the working tree
+    package, imports = scan_imports(data)
+    return path, sha or git_blob_sha(data), [package, imports]
+
+
+def _load_cache(cache_file: Path) -> dict[str, list]:
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+        return {}
+    return data.get("files", {})
+
+
+def _save_cache(cache_file: Path, files: dict[str, list]):
+    tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT, "files": files}, f, separators=(",", ":"))
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+
+
+def _scan_blobs(root: str, todo: list[tuple[str, str]]) -> list[tuple[str, Optional[str], Optional[list]]]:
+    blobs = read_blobs((sha for _path, sha in todo), Path(root))
+    return [(path, sha, list(scan_imports(blobs[sha]))) if sha in blobs else (path, None, None)
+            for path, sha in todo]
+
+
+def scan_repository(workspace_root: Path = WORKSPACE_ROOT,
+                    cache_dir: Optional[Path] = SCOPE_DIR / ".cache",
+                    workers: Optional[int] = None,
+                    staged: bool = False) -> tuple[dict[str, FileImports], ScanStats]:
+    """
+    Imports of every tracked Kotlin/Java file. Raises RuntimeError if git is
+    unavailable. With staged=True the index version of every file is scanned
+    (blobs read from git), never the working tree - what a commit would contain.
+    """
+    start = time.perf_counter()
+    sources = tracked_sources(workspace_root)
+    modified = set() if staged else modified_paths(workspace_root)
+    cache_file = cache_dir / CACHE_NAME if cache_dir is not None else None
+    cache = _load_cache(cache_file) if cache_file is not None else {}
+
+    shas = {p: sha for p, sha in sources.items() if p not in modified}
+    todo = [(p, None if p in modified else sha) for p, sha in sources.items()
+            if p in modified or sha not in cache]
+    scan = partial(_scan_file, str(workspace_root))
+    workers = workers or os.cpu_count() or 1
+    pool = None
+    if staged:
+        results = _scan_blobs(str(workspace_root), todo)
+    elif len(todo) < POOL_THRESHOLD or workers == 1:
+        results = map(scan, todo)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(scan, todo, chunksize=max(8, len(todo) // (4 * workers)))
+
+    scanned = 0
+    try:
+        for path, sha, entry in results:
+            if sha is None:
+                shas.pop(path, None)
+                continue
+            shas[path] = sha
+            cache[sha] = entry
+            scanned += 1
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if cache_file is not None:
+        live = set(shas.values())
+        if scanned or len(live) != len(cache):
+            _save_cache(cache_file, {sha: cache[sha] for sha in live})
+
+    files = {}
+    for path, sha in shas.items():
+        package, imports = cache[sha]
+        files[path] = FileImports(package, [tuple(i) for i in imports])
+    stats = ScanStats(len(files), len(files) - scanned, scanned, time.perf_counter() - start)
+    return files, stats
+
+
+# ============================================================================
+# Layer model
+# ============================================================================
+
+def _split_package(name: str) -> list[str]:
+    parts = name.split(".")
+    return parts[:-1] if parts[-1] == "*" else parts
+
+
+class LayerModel:
+    """Layers, package → layer resolution and forbidden edges from the rules files."""
+
+    def __init__(self, layer_rules: dict, naming_rules: Optional[dict] = None):
+        naming_rules = naming_rules or {}
+        self.warnings: list[str] = []
+        self.layers: list[str] = list(layer_rules.get("layers", {}))
+        self._layer_regex = compile_globs([layer_rules["layers"][name].get("path", "")
+                                           for name in self.layers])
+        self.edges: dict[str, list[Edge]] = {name: [] for name in self.layers}
+
+        for rule in layer_rules.get("forbiddenCrossLayerImports", []):
+            sources = [s for s in re.split(r"[/|]", rule.get("from", "")) if s in self.edges]
+            if not sources:
+                self.warnings.append(f"forbiddenCrossLayerImports: unknown layer {rule.get('from')!r}")
+                continue
+            for target in rule.get("to", "").split("|"):
+                edge = self._edge(target.strip(), rule.get("reason", ""))
+                if edge is None:
+                    self.warnings.append(f"forbiddenCrossLayerImports: cannot check {target!r}")
+                    continue
+                for source in sources:
+                    self.edges[source].append(edge)
+
+        for name, layer in layer_rules.get("layers", {}).items():
+            for entry in layer.get("forbidden", []):
+                if not entry.lower().endswith(" imports"):
+                    continue
+                for part in entry[:-len(" imports")].split("/"):
+                    word = part.split()[0].lower() if part.split() else ""
+                    if word in self.edges:
+                        self.edges[name].append(Edge("layer", word, entry, f"{name}: no {entry}"))
+                    elif word:
+                        self.edges[name].append(Edge("segment", word, entry, f"{name}: no {entry}"))
+
+        # Package patterns forbidden in (almost) every file, e.g. the v1 namespace
+        self.global_edges: list[tuple[Optional[re.Pattern], Optional[re.Pattern], Edge]] = []
+        for rule in naming_rules.get("forbidden_patterns", None) or []:
+            pattern = str(rule.get("pattern", "")).rstrip(".*")
+            if not _PACKAGE_NAME.fullmatch(pattern):
+                continue
+            where = str(rule.get("in", "anywhere"))
+            include = exclude = None
+            if where.startswith("anywhere except "):
+                exclude = compile_globs([where[len("anywhere except "):].rstrip("/") + "/**"])
+            elif where != "anywhere":
+                include = compile_globs([where.rstrip("/*") + "/**"])
+            reason = f"use {rule['use_instead']}" if rule.get("use_instead") else f"forbidden {where}"
+            self.global_edges.append((include, exclude, Edge("prefix", pattern, pattern, reason)))
+
+        namespace = str((naming_rules.get("namespace") or {}).get("v2", "")).rstrip(".*")
+        self.namespace = namespace
+        self._pattern_layers: list[tuple[re.Pattern, str]] = []
+        for key, module in (naming_rules.get("module_patterns") or {}).items():
+            package = str((module or {}).get("package", ""))
+            if not namespace or "<name>" not in package:
+                continue
+            layer = self._layer_of_package_pattern(package)
+            if layer is None:
+                self.warnings.append(f"module_patterns.{key}: no layer path matches {package!r}")
+                continue
+            regex = re.escape(f"{namespace}.{package}").replace(re.escape("<name>"), r"[^.]+")
+            self._pattern_layers.append((re.compile(f"{regex}(?:\\.|$)"), layer))
+
+        self._packages: dict[str, set[str]] = {}
+        self._resolved: dict[str, frozenset[str]] = {}
+
+    def _edge(self, target: str, reason: str) -> Optional[Edge]:
+        words = target.split()
+        if not words:
+            return None
+        if words[0].lower() in self.edges:
+            return Edge("layer", words[0].lower(), target, reason)
+        if "/" in target:
+            segments = [s for s in target.split("/") if s and s != "*"]
+            return Edge("package", ".".join(segments), target, reason)
+        if len(words) == 1 and _CLASS_GLOB.fullmatch(target):
+            regex = "".join(".*" if ch == "*" else re.escape(ch) for ch in target)
+            return Edge("class", regex, target, reason)
+        return None
+
+    def _layer_of_package_pattern(self, package: str) -> Optional[str]:
+        """Layer of "infra.transport.<name>": probe infra/transport/x/ and infra/transport-x/."""
+        head = package.split("<name>")[0].rstrip(".").split(".")
+        for path in ("/".join(head + ["x"]), "/".join(head[:-1] + [f"{head[-1]}-x"])):
+            layer = self.layer_of(f"{path}/Probe.kt")
+            if layer is not None:
+                return layer
+        return None
+
+    def layer_of(self, path: str) -> Optional[str]:
+        if self._layer_regex is None:
+            return None
+        m = self._layer_regex.match(path)
+        return self.layers[int(m.lastgroup[1:])] if m else None
+
+    def index(self, files: dict[str, FileImports]):
+        """Record which layers declare which packages."""
+        for path, info in files.items():
+            layer = self.layer_of(path)
+            if layer is not None and info.package:
+                self._packages.setdefault(info.package, set()).add(layer)
+        self._resolved.clear()
+
+    def resolve(self, name: str) -> frozenset[str]:
+        """Layers an imported name belongs to (empty for external packages)."""
+        cached = self._resolved.get(name)
+        if cached is not None:
+            return cached
+        layers: frozenset[str] = frozenset()
+        if not self.namespace or name.startswith(self.namespace + "."):
+            parts = _split_package(name)
+            for end in range(len(parts), 0, -1):
+                found = self._packages.get(".".join(parts[:end]))
+                if found:
+                    layers = frozenset(found)
+                    break
+            else:
+                layers = frozenset(layer for regex, layer in self._pattern_layers if regex.match(name))
+        self._resolved[name] = layers
+        return layers
+
+    @staticmethod
+    def _hits(edge: Edge, name: str, targets: frozenset[str]) -> bool:
+        if edge.kind == "layer":
+            return edge.target in targets
+        parts = _split_package(name)
+        if edge.kind == "segment":
+            return edge.target in (p.lower() for p in parts[:-1])
+        if edge.kind == "package":
+            return f".{edge.target}." in f".{'.'.join(parts)}."
+        if edge.kind == "class":
+            return name[-1:] != "*" and re.fullmatch(edge.target, parts[-1]) is not None
+        return name == edge.target or name.startswith(edge.target + ".")
+
+    def check(self, files: dict[str, FileImports],
+              paths: Optional[set[str]] = None) -> list[LayerViolation]:
+        """
+        Forbidden imports, at most one violation per import statement. All
+        files are indexed; only `paths` (default: all) are checked.
+        """
+        self.index(files)
+        found = []
+        for path in sorted(files if paths is None else paths & files.keys()):
+            layer = self.layer_of(path)
+            edges = self.edges.get(layer, []) if layer else []
+            global_edges = [e for include, exclude, e in self.global_edges
+                            if (include is None or include.match(path))
+                            and (exclude is None or not exclude.match(path))]
+            if not edges and not global_edges:
+                continue
+            for line, name in files[path].imports:
+                targets = self.resolve(name) - {layer}
+                for edge in global_edges + edges:
+                    if self._hits(edge, name, targets):
+                        found.append(LayerViolation(path, line, layer or "-", name, edge.label, edge.reason))
+                        break
+        return found
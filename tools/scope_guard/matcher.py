@@ -0,0 +1,324 @@
+"""
+Precompiled path classification for Scope Guard.
+
+ScopeMatcher compiles scope-guard.config.json and all *.scope.json files once:
+
+  globalExcludes   → one combined regex                      → EXCLUDED
+  readOnlyPaths    → one combined regex (named alternatives)  → READ_ONLY
+  bundle generated → one combined regex (named alternatives)  → READ_ONLY + ssot
+  bundle patterns  → one combined regex (named alternatives)  → BUNDLE
+  scope filePatterns → one combined regex (named alternatives) → SCOPE
+  scope modules    → path-segment trie                        → SCOPE
+  otherwise                                                   → UNTRACKED
+
+Precedence and first-match order are the same as the original check_file():
+the first readOnlyPaths / bundle pattern in config order wins. For files under
+module paths of several scopes the most specific (deepest) module path wins;
+identical module paths go to the scope registered first (file name order).
+A scope's filePatterns name individual files and rank above module paths.
+
+Glob semantics are segment-aware (gitignore style):
+  *    any characters within one path segment
+  ?    one character within one path segment
+  **   zero or more whole segments ("**/build/**" also matches "build/x")
+"""
+import re
+from enum import Enum
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+class Status(str, Enum):
+    ALLOWED = "ALLOWED"      # File can be edited
+    EXCLUDED = "EXCLUDED"    # Build artifact, auto-allowed
+    READ_ONLY = "READ_ONLY"  # Protected path, HARD BLOCK
+    UNTRACKED = "UNTRACKED"  # Not in any scope, WARNING but allowed
+    BUNDLE = "BUNDLE"        # In a bundle, allowed with warning
+    SCOPE = "SCOPE"          # In a scope, allowed
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class Classification(NamedTuple):
+    status: Status
+    message: str
+    owner: Optional[str] = None     # bundle or scope id
+    pattern: Optional[str] = None   # glob or module path that matched
+    ssot: Optional[str] = None      # source of truth for GENERATED files
+
+
+# ============================================================================
+# Glob compilation
+# ============================================================================
+
+def _segment_to_regex(segment: str) -> str:
+    """Translate one path segment of a glob (no '/') to a regex."""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        ch = segment[i]
+        if ch == "*":
+            out.append("[^/]*")
+        elif ch == "?":
+            out.append("[^/]")
+        elif ch == "[":
+            end = segment.find("]", i + 2 if segment[i + 1:i + 2] in ("!", "]") else i + 1)
+            if end == -1:
+                out.append(re.escape(ch))
+            else:
+                body = segment[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return "".join(out)
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Translate a segment-aware glob into an (unanchored) regex string."""
+    segments = pattern.replace("\\", "/").strip("/").split("/")
+    out = []
+    need_sep = False
+    last = len(segments) - 1
+    for i, segment in enumerate(segments):
+        if segment == "**":
+            if i == last:
+                out.append("/.*" if need_sep else ".*")
+            else:
+                out.append("/(?:[^/]+/)*" if need_sep else "(?:[^/]+/)*")
+                need_sep = False
+            continue
+        if need_sep:
+            out.append("/")
+        out.append(_segment_to_regex(segment))
+        need_sep = True
+    return "".join(out)
+
+
+def compile_globs(patterns: list[str]) -> Optional[re.Pattern]:
+    """
+    Compile patterns into one alternation; group "p<i>" names the pattern.
+
+    The regex engine tries alternatives left to right, so m.lastgroup is the
+    first pattern (in list order) that matches the whole path.
+    """
+    if not patterns:
+        return None
+    alternatives = "|".join(f"(?P<p{i}>{glob_to_regex(p)})" for i, p in enumerate(patterns))
+    return re.compile(f"(?:{alternatives})\\Z")
+
+
+def _match_index(regex: Optional[re.Pattern], path: str) -> int:
+    """Index of the first matching pattern, or -1."""
+    if regex is None:
+        return -1
+    m = regex.match(path)
+    return int(m.lastgroup[1:]) if m else -1
+
+
+# ============================================================================
+# Module trie
+# ============================================================================
+
+class ModuleTrie:
+    """
+    Path-segment trie over scope module paths.
+
+    Lookup walks the file's segments once (O(path depth)); module paths only
+    match on segment boundaries, so "infra/data-xtream" does not claim
+    "infra/data-xtream2/...". Deeper module paths are more specific.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self):
+        # node = [children dict, [(rank, scope_id, module_path), ...]]
+        self._root = [{}, []]
+
+    def add(self, module_path: str, scope_id: str, rank: int):
+        node = self._root
+        for segment in module_path.replace("\\", "/").strip("/").split("/"):
+            node = node[0].setdefault(segment, [{}, []])
+        node[1].append((rank, scope_id, module_path))
+
+    def lookup(self, path: str) -> Optional[tuple[int, str, str]]:
+        """Most specific (rank, scope_id, module_path) on the path, or None."""
+        best = None
+        node = self._root
+        for segment in path.split("/"):
+            node = node[0].get(segment)
+            if node is None:
+                break
+            if node[1]:
+                best = node[1][0]  # entries are added in rank order
+        return best
+
+    def lookup_all(self, path: str) -> list[tuple[int, str, str]]:
+        """Every (rank, scope_id, module_path) on the path, most specific first."""
+        found = []
+        node = self._root
+        for segment in path.split("/"):
+            node = node[0].get(segment)
+            if node is None:
+                break
+            if node[1]:
+                found.append(node[1])
+        return [owner for owners in reversed(found) for owner in owners]
+
+    def entries(self) -> list[tuple[int, str, str]]:
+        """All registered (rank, scope_id, module_path), in rank order."""
+        out = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            out.extend(node[1])
+            stack.extend(node[0].values())
+        return sorted(out)
+
+
+# ============================================================================
+# Matcher
+# ============================================================================
+
+def normalize_path(file_path: str, workspace_root: Optional[Path] = None) -> str:
+    """Workspace-relative, forward-slash path."""
+    rel_path = file_path.replace("\\", "/")
+    if workspace_root is not None:
+        root = str(workspace_root).replace("\\", "/").rstrip("/")
+        if rel_path.startswith(root + "/"):
+            rel_path = rel_path[len(root) + 1:]
+    while rel_path.startswith("./"):
+        rel_path = rel_path[2:]
+    return rel_path.lstrip("/")
+
+
+class ScopeMatcher:
+    """Config + scopes compiled into a single classifier."""
+
+    def __init__(self, config: dict, scopes: dict[str, dict], workspace_root: Optional[Path] = None,
+                 regex_sources: Optional[dict[str, Optional[str]]] = None):
+        """
+        regex_sources: output of a previous regex_sources() for the same
+        config (compiled snapshot); skips glob translation.
+        """
+        self.config = config
+        self.scopes = scopes
+        self.bundles: dict[str, dict] = config.get("bundles", {})
+        self.workspace_root = workspace_root
+        sources = regex_sources or {}
+
+        def compile_stage(name: str, patterns: list[str]) -> Optional[re.Pattern]:
+            if name in sources:
+                return re.compile(sources[name]) if sources[name] is not None else None
+            return compile_globs(patterns)
+
+        self._excludes = compile_stage("excludes", config.get("globalExcludes", []))
+
+        self._read_only_patterns = list(config.get("readOnlyPaths", []))
+        self._read_only = compile_stage("read_only", self._read_only_patterns)
+
+        generated = [(bundle_id, p) for bundle_id, bundle in self.bundles.items()
+                     for p in bundle.get("generated", [])]
+        self._generated_owners = [bundle_id for bundle_id, _p in generated]
+        self._generated = compile_stage("generated", [p for _b, p in generated])
+
+        patterns = [(bundle_id, p) for bundle_id, bundle in self.bundles.items()
+                    for p in bundle.get("patterns", [])]
+        self._bundle_owners = patterns
+        self._bundle = compile_stage("bundle", [p for _b, p in patterns])
+
+        file_patterns = [(scope_id, p) for scope_id, scope in scopes.items()
+                         for p in scope.get("filePatterns", [])]
+        self._file_pattern_owners = file_patterns
+        self._file_patterns = compile_stage("file_patterns", [p for _s, p in file_patterns])
+        self._file_pattern_regexes: Optional[list[re.Pattern]] = None  # for scopes_for()
+
+        self._trie = ModuleTrie()
+        rank = 0
+        for scope_id, scope in scopes.items():
+            for module_path in scope.get("modules", {}):
+                self._trie.add(module_path, scope_id, rank)
+                rank += 1
+
+    @property
+    def trie(self) -> ModuleTrie:
+        """Module paths of all scopes (read-only use)."""
+        return self._trie
+
+    def regex_sources(self) -> dict[str, Optional[str]]:
+        """Translated regex per stage, for ScopeMatcher(..., regex_sources=...)."""
+        stages = {"excludes": self._excludes, "read_only": self._read_only,
+                  "generated": self._generated, "bundle": self._bundle,
+                  "file_patterns": self._file_patterns}
+        return {name: (regex.pattern if regex is not None else None)
+                for name, regex in stages.items()}
+
+    def classify(self, file_path: str) -> Classification:
+        """Classify a single path (absolute or workspace-relative)."""
+        path = normalize_path(file_path, self.workspace_root)
+
+        # 1. Excluded (build artifacts)
+        if self._excludes is not None and self._excludes.match(path):
+            return Classification(Status.EXCLUDED, "Build artifact - auto-allowed")
+
+        # 2. Read-only (HARD BLOCK), with generated-source info
+        ro = _match_index(self._read_only, path)
+        if ro >= 0:
+            gen = _match_index(self._generated, path)
+            if gen >= 0:
+                bundle_id = self._generated_owners[gen]
+                ssot = self.bundles[bundle_id].get("ssot", "unknown")
+                return Classification(Status.READ_ONLY, f"GENERATED file. Edit source: {ssot}",
+                                      bundle_id, self._read_only_patterns[ro], ssot)
+            pattern = self._read_only_patterns[ro]
+            return Classification(Status.READ_ONLY, f"Protected by readOnlyPaths: {pattern}",
+                                  pattern=pattern)
+
+        # 3. Bundles
+        b = _match_index(self._bundle, path)
+        if b >= 0:
+            bundle_id, pattern = self._bundle_owners[b]
+            description = self.bundles[bundle_id].get("description", "")
+            return Classification(Status.BUNDLE, f"In bundle '{bundle_id}': {description}",
+                                  bundle_id, pattern)
+
+        # 4. Scopes: file patterns, then the most specific module path
+        fp = _match_index(self._file_patterns, path)
+        if fp >= 0:
+            scope_id, pattern = self._file_pattern_owners[fp]
+            description = self.scopes[scope_id].get("description", "")
+            return Classification(Status.SCOPE, f"In scope '{scope_id}': {description}",
+                                  scope_id, pattern)
+
+        owner = self._trie.lookup(path)
+        if owner is not None:
+            _rank, scope_id, module_path = owner
+            description = self.scopes[scope_id].get("description", "")
+            return Classification(Status.SCOPE, f"In scope '{scope_id}': {description}",
+                                  scope_id, module_path)
+
+        # 5. Untracked
+        return Classification(Status.UNTRACKED, "Not in any scope or bundle")
+
+    def scopes_for(self, file_path: str) -> list[tuple[str, str]]:
+        """
+        All (scope_id, filePattern or module_path) claiming the path, most
+        specific first: file patterns, then module paths deepest first. The
+        first entry is the owner classify() reports.
+        """
+        path = normalize_path(file_path, self.workspace_root)
+        if self._file_pattern_regexes is None:
+            self._file_pattern_regexes = [re.compile(f"(?:{glob_to_regex(p)})\\Z")
+                                          for _s, p in self._file_pattern_owners]
+        found = [owner for owner, regex in zip(self._file_pattern_owners, self._file_pattern_regexes)
+                 if regex.match(path)]
+        found.extend((scope_id, module_path) for _rank, scope_id, module_path in self._trie.lookup_all(path))
+        return found
+
+    def classify_many(self, paths) -> list[Classification]:
+        classify = self.classify
+        return [classify(p) for p in paths]
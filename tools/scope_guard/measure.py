@@ -0,0 +1,210 @@
+"""
+File and LOC measurement of scope modules (scope-manager.py measure).
+
+Tracked Kotlin/Java files and their blob SHAs come from a single
+`git ls-files -s -z` call. LOC is cached per blob SHA in
+.scope/.cache/loc.json, so a re-run only reads files whose content is new.
+Files modified in the working tree (`git ls-files -m`) are always read and
+re-hashed the way git would hash them, so uncommitted edits are measured too.
+Cache misses are read and counted on a thread pool.
+
+LOC = lines that are neither blank nor comment-only (// ..., /* ... */ and
+KDoc/Javadoc blocks starting at the beginning of a line).
+"""
+import hashlib
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from .config import SCOPE_DIR, WORKSPACE_ROOT
+
+SOURCE_SUFFIXES = (".kt", ".java")
+CACHE_FORMAT = 1
+CACHE_NAME = "loc.json"
+
+
+class ModuleSize(NamedTuple):
+    files: int
+    loc: int
+
+
+class MeasureStats(NamedTuple):
+    files: int      # source files inside the measured modules
+    cached: int     # LOC taken from the cache
+    counted: int    # files read and counted
+    seconds: float
+
+
+def count_loc(data: bytes) -> int:
+    """Non-blank, non-comment lines of Kotlin/Java source."""
+    loc = 0
+    in_block = False
+    for raw in data.split(b"\n"):
+        line = raw.strip()
+        if in_block:
+            end = line.find(b"*/")
+            if end < 0:
+                continue
+            in_block = False
+            line = line[end + 2:].strip()
+        while line.startswith(b"/*"):
+            end = line.find(b"*/", 2)
+            if end < 0:
+                in_block = True
+                line = b""
+                break
+            line = line[end + 2:].strip()
+        if line and not line.startswith(b"//"):
+            loc += 1
+    return loc
+
+
+def git_blob_sha(data: bytes) -> str:
+    """SHA git assigns to a blob with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def tracked_sources(workspace_root: Path = WORKSPACE_ROOT) -> dict[str, str]:
+    """Tracked Kotlin/Java path → index blob SHA."""
+    result = subprocess.run(["git", "ls-files", "-s", "-z"], capture_output=True,
+                            cwd=workspace_root)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip())
+    sources = {}
+    for record in result.stdout.decode("utf-8", "surrogateescape").split("\0"):
+        if not record:
+            continue
+        meta, _tab, path = record.partition("\t")
+        mode, sha, _stage = meta.split(" ")
+        if mode != "160000" and path.endswith(SOURCE_SUFFIXES):
+            sources[path] = sha
+    return sources
+
+
+def modified_paths(workspace_root: Path = WORKSPACE_ROOT) -> set[str]:
+    """Tracked paths whose working-tree content differs from the index."""
+    result = subprocess.run(["git", "ls-files", "-m", "-z"], capture_output=True,
+                            cwd=workspace_root)
+    if result.returncode != 0:
+        return set()
+    return {p for p in result.stdout.decode("utf-8", "surrogateescape").split("\0") if p}
+
+
+def read_blobs(shas: Iterable[str], workspace_root: Path = WORKSPACE_ROOT) -> dict[str, bytes]:
+    """Blob SHA → content from the object database, one `git cat-file --batch` call."""
+    wanted = list(dict.fromkeys(shas))
+    if not wanted:
+        return {}
+    result = subprocess.run(["git", "cat-file", "--batch"], input="\n".join(wanted).encode() + b"\n",
+                            capture_output=True, cwd=workspace_root)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip())
+    out, pos, blobs = result.stdout, 0, {}
+    while pos < len(out):
+        end = out.index(b"\n", pos)
+        header = out[pos:end].split(b" ")
+        pos = end + 1
+        if len(header) != 3:
+            continue  # "<sha> missing"
+        size = int(header[2])
+        blobs[header[0].decode("ascii")] = out[pos:pos + size]
+        pos += size + 1
+    return blobs
+
+
+def module_of(path: str, modules: set[str]) -> list[str]:
+    """All module paths (segment prefixes) that contain `path`."""
+    found = []
+    end = path.find("/")
+    while end >= 0:
+        if path[:end] in modules:
+            found.append(path[:end])
+        end = path.find("/", end + 1)
+    return found
+
+
+def _load_cache(cache_file: Path) -> dict[str, int]:
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+        return {}
+    return data.get("loc", {})
+
+
+def _save_cache(cache_file: Path, loc: dict[str, int]):
+    tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT, "loc": loc}, f, separators=(",", ":"))
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+
+
+def measure_modules(module_paths: Iterable[str], workspace_root: Path = WORKSPACE_ROOT,
+                    cache_dir: Optional[Path] = SCOPE_DIR / ".cache", workers: Optional[int] = None,
+                    prune: bool = False) -> tuple[dict[str, ModuleSize], MeasureStats]:
+    """
+    Measure tracked Kotlin/Java files under each module path.
+
+    A file counts towards every listed module path containing it (nested
+    module paths overlap). prune=True drops cache entries for blobs no
+    longer measured; use it only when measuring all modules.
+    Raises RuntimeError if git is unavailable.
+    """
+    start = time.perf_counter()
+    modules = {m.replace("\\", "/").strip("/") for m in module_paths}
+    sources = tracked_sources(workspace_root)
+    members: dict[str, list[str]] = {}
+    for path in sources:
+        owners = module_of(path, modules)
+        if owners:
+            members[path] = owners
+
+    cache_file = cache_dir / CACHE_NAME if cache_dir is not None else None
+    cache = _load_cache(cache_file) if cache_file is not None else {}
+    modified = modified_paths(workspace_root) if members else set()
+
+    todo = [p for p in members if p in modified or sources[p] not in cache]
+    shas = {p: sources[p] for p in members if p not in modified}
+
+    def count(path: str) -> Optional[tuple[str, str, int]]:
+        try:
+            data = (workspace_root / path).read_bytes()
+        except OSError:
+            return None  # deleted in the working tree
+        sha = git_blob_sha(data) if path in modified else sources[path]
+        return path, sha, cache[sha] if sha in cache else count_loc(data)
+
+    counted = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(count, todo):
+            if result is None:
+                continue
+            path, sha, loc = result
+            shas[path] = sha
+            cache[sha] = loc
+            counted += 1
+
+    sizes = {m: [0, 0] for m in modules}
+    for path, sha in shas.items():
+        for module in members[path]:
+            sizes[module][0] += 1
+            sizes[module][1] += cache[sha]
+
+    if cache_file is not None and (counted or prune):
+        if prune:
+            live = set(shas.values())
+            cache = {sha: loc for sha, loc in cache.items() if sha in live}
+        _save_cache(cache_file, cache)
+
+    stats = MeasureStats(len(shas), len(shas) - counted, counted, time.perf_counter() - start)
+    return {m: ModuleSize(*v) for m, v in sizes.items()}, stats
@@ -0,0 +1,283 @@
+"""
+Naming-rules validator for Kotlin/Java sources (scope-guard-cli.py naming).
+
+.scope/naming-rules.yaml is compiled once into regexes (NamingRules); each
+source file is reduced by a streaming lexer (scan_declarations) to its
+package and top-level class/interface/object declarations. The lexer skips
+comments, strings and everything inside braces, so bodies cost one regex
+search per brace, string or comment.
+
+Errors (block):
+  forbidden_patterns         class globs ("*FeatureProvider"), package
+                             segments ("feature/ package") and package
+                             prefixes ("com.chris.m3usuite") in their "in"
+                             location ("pipeline/*", "anywhere except legacy/").
+  entity_naming.forbidden_in entity prefixes (Obx*) declared below a listed
+                             path glob (feature/*).
+
+Warnings:
+  module_patterns            a declaration matching a module kind's class
+                             glob (*CapabilityProvider, *Client, ...) outside
+                             that kind's package or its subpackages
+                             (pipeline.<name>.capability, infra.transport.<name>).
+  namespace.v2               a package outside the v2 namespace, except in
+                             legacy/ (the v1 namespace's home).
+
+module_patterns are checked only from class name to package: a kind's package
+legitimately holds DTOs and helpers with other names. Test source sets are not
+checked against module_patterns. Prose entries ("Ad-hoc capability names")
+are not machine-checkable.
+"""
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from .layers import POOL_THRESHOLD
+from .matcher import compile_globs
+from .measure import read_blobs, tracked_sources
+
+SOURCE_SUFFIXES = (".kt", ".java")
+TEST_SOURCE_SETS = ("/src/test/", "/src/androidTest/", "/src/testFixtures/")
+LEGACY_PREFIX = "legacy/"
+
+# depth 0: every token; inside braces only what changes depth or hides braces
+_TOP = re.compile(r'//[^\n]*|/\*|"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[{}]|[A-Za-z_]\w*|`[^`\n]*`')
+_NESTED = re.compile(r'//[^\n]*|/\*|"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[{}]')
+_BLOCK_COMMENT = re.compile(r"/\*|\*/")
+_QUALIFIED = re.compile(r"\s+([\w.`]+)")
+_DECL_NAME = re.compile(r"\s+`?([A-Za-z_]\w*)")
+
+DECLARATION_KEYWORDS = {"class", "interface", "object"}
+VISIBILITY = {"private", "internal", "public", "protected"}
+STATEMENT_KEYWORDS = {"fun", "val", "var", "typealias", "import"}
+
+
+class Declaration(NamedTuple):
+    line: int
+    kind: str           # class | interface | object
+    name: str
+    visibility: str     # public unless declared otherwise
+
+
+class Finding(NamedTuple):
+    path: str
+    line: int
+    severity: str       # "error" | "warning"
+    rule: str
+    message: str
+
+
+def scan_declarations(text: str) -> tuple[str, list[Declaration]]:
+    """Package and top-level declarations of Kotlin/Java source."""
+    package = ""
+    found = []
+    depth = 0
+    pos, end = 0, len(text)
+    line, line_pos = 1, 0
+    visibility = None
+    while True:
+        m = (_TOP if depth == 0 else _NESTED).search(text, pos)
+        if m is None:
+            break
+        token, start, pos = m.group(), m.start(), m.end()
+        first = token[0]
+        if first == "{":
+            depth += 1
+        elif first == "}":
+            depth = max(0, depth - 1)
+        elif token == "/*":
+            nesting = 1  # Kotlin block comments nest
+            while nesting:
+                c = _BLOCK_COMMENT.search(text, pos)
+                if c is None:
+                    pos = end
+                    break
+                pos = c.end()
+                nesting += 1 if c.group() == "/*" else -1
+        elif token == '"""':
+            close = text.find('"""', pos)
+            pos = end if close < 0 else close + 3
+            while pos < end and text[pos] == '"':
+                pos += 1
+        elif first in "\"'/`":
+            continue
+        elif token in VISIBILITY:
+            visibility = token
+        elif token == "package" and not package:
+            q = _QUALIFIED.match(text, pos)
+            if q:
+                package = q.group(1).replace("`", "")
+                pos = q.end()
+        elif token in DECLARATION_KEYWORDS and text[start - 2:start] != "::":
+            d = _DECL_NAME.match(text, pos)
+            if d:  # not `object : Foo {}` or `Foo::class`
+                line += text.count("\n", line_pos, start)
+                line_pos = start
+                found.append(Declaration(line, token, d.group(1), visibility or "public"))
+                pos = d.end()
+            visibility = None
+        elif token in STATEMENT_KEYWORDS:
+            visibility = None
+    return package, found
+
+
+def _scan_file(root: str, path: str) -> tuple[str, Optional[str], list]:
+    try:
+        with open(os.path.join(root, path), encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except OSError:
+        return path, None, []  # deleted in the working tree
+    package, declarations = scan_declarations(text)
+    return path, package, declarations
+
+
+def scan_files(paths: list[str], workspace_root: Path,
+               workers: Optional[int] = None) -> dict[str, tuple[str, list[Declaration]]]:
+    """path → (package, declarations), scanned in a process pool when worthwhile."""
+    scan = partial(_scan_file, str(workspace_root))
+    workers = workers or os.cpu_count() or 1
+    if len(paths) < POOL_THRESHOLD or workers == 1:
+        results = list(map(scan, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk = max(8, len(paths) // (4 * workers))
+            results = list(pool.map(scan, paths, chunksize=chunk))
+    return {path: (package, [Declaration(*d) for d in decls])
+            for path, package, decls in results if package is not None}
+
+
+def scan_staged(paths: list[str], workspace_root: Path) -> dict[str, tuple[str, list[Declaration]]]:
+    """path → (package, declarations) of the index (staged) version of `paths`."""
+    index = tracked_sources(workspace_root)
+    wanted = {p: index[p] for p in paths if p in index}
+    blobs = read_blobs(wanted.values(), workspace_root)
+    return {p: scan_declarations(blobs[sha].decode("utf-8", "replace"))
+            for p, sha in wanted.items() if sha in blobs}
+
+
+def _glob_regex(pattern: str) -> re.Pattern:
+    return re.compile("".join(".*" if ch == "*" else re.escape(ch) for ch in pattern) + r"\Z")
+
+
+def _location(where: str) -> tuple[Optional[re.Pattern], Optional[re.Pattern]]:
+    """(include, exclude) path regexes for "anywhere", "anywhere except x/", "x/*"."""
+    where = where.strip()
+    if where == "anywhere":
+        return None, None
+    if where.startswith("anywhere except "):
+        return None, compile_globs([where[len("anywhere except "):].strip("/") + "/**"])
+    return compile_globs([where.rstrip("*").rstrip("/") + "/**"]), None
+
+
+class _Rule(NamedTuple):
+    include: Optional[re.Pattern]
+    exclude: Optional[re.Pattern]
+    kind: str           # "class" | "segment" | "prefix"
+    target: object      # class regex, package segment or package prefix
+    label: str
+    message: str
+
+    def applies_to(self, path: str) -> bool:
+        return ((self.include is None or self.include.match(path) is not None)
+                and (self.exclude is None or self.exclude.match(path) is None))
+
+
+class NamingRules:
+    """naming-rules.yaml compiled to regexes."""
+
+    def __init__(self, naming_rules: dict):
+        self.namespace = str((naming_rules.get("namespace") or {}).get("v2", "")).rstrip(".*")
+
+        self.rules: list[_Rule] = []
+        for entry in naming_rules.get("forbidden_patterns") or []:
+            pattern = str(entry.get("pattern", "")).strip()
+            include, exclude = _location(str(entry.get("in", "anywhere")))
+            hint = f" - use {entry['use_instead']}" if entry.get("use_instead") else ""
+            if re.fullmatch(r"[a-z_]\w*(?:\.\w+)+", pattern):
+                self.rules.append(_Rule(include, exclude, "prefix", pattern, pattern,
+                                        f"package {pattern} forbidden here{hint}"))
+            elif pattern.endswith(" package") and re.fullmatch(r"\w+/?", pattern[:-len(" package")]):
+                segment = pattern[:-len(" package")].rstrip("/")
+                self.rules.append(_Rule(include, exclude, "segment", segment, pattern,
+                                        f"'{segment}' package forbidden here{hint}"))
+            elif re.fullmatch(r"[A-Za-z_*][\w*]*", pattern):
+                self.rules.append(_Rule(include, exclude, "class", _glob_regex(pattern), pattern,
+                                        f"{pattern} forbidden here{hint}"))
+
+        for name, entity in (naming_rules.get("entity_naming") or {}).items():
+            prefix = (entity or {}).get("prefix")
+            if not prefix:
+                continue
+            for where in entity.get("forbidden_in") or []:
+                if "/" in where:
+                    include, _exclude = _location(where)
+                    self.rules.append(_Rule(include, None, "class", _glob_regex(f"{prefix}*"),
+                                            f"{name}.forbidden_in",
+                                            f"{prefix}* entities must not be declared in {where}"))
+
+        # (kind, package regex, class-name regex)
+        self.module_patterns: list[tuple[str, str, re.Pattern, re.Pattern]] = []
+        for kind, module in (naming_rules.get("module_patterns") or {}).items():
+            package = str((module or {}).get("package", ""))
+            classes = [c.strip() for c in str((module or {}).get("class", "")).split(",") if c.strip()]
+            if not package or not classes:
+                continue
+            full = f"{self.namespace}.{package}" if self.namespace else package
+            package_regex = re.compile(re.escape(full).replace(re.escape("<name>"), r"[^.]+") + r"(?:\.|\Z)")
+            class_regex = re.compile("|".join(f"(?:{_glob_regex(c).pattern})" for c in classes))
+            self.module_patterns.append((kind, full, package_regex, class_regex))
+
+    def check(self, path: str, package: str, declarations: list[Declaration]) -> list[Finding]:
+        found = []
+        rules = [r for r in self.rules if r.applies_to(path)]
+        for rule in rules:
+            if rule.kind == "prefix" and (package == rule.target or package.startswith(rule.target + ".")):
+                found.append(Finding(path, 1, "error", rule.label, f"{rule.message} ({package})"))
+            elif rule.kind == "segment" and rule.target in package.split("."):
+                found.append(Finding(path, 1, "error", rule.label, f"{rule.message} ({package})"))
+
+        legacy = path.startswith(LEGACY_PREFIX)
+        if self.namespace and package and not legacy and not (
+                package == self.namespace or package.startswith(self.namespace + ".")):
+            found.append(Finding(path, 1, "warning", "namespace.v2",
+                                 f"package {package} outside {self.namespace}.*"))
+
+        test = any(s in path for s in TEST_SOURCE_SETS)
+        for decl in declarations:
+            for rule in rules:
+                if rule.kind == "class" and rule.target.match(decl.name):
+                    found.append(Finding(path, decl.line, "error", rule.label, f"{decl.name}: {rule.message}"))
+            if legacy or test or decl.visibility == "private":
+                continue
+            for kind, expected, package_regex, class_regex in self.module_patterns:
+                if class_regex.match(decl.name) and not package_regex.match(package):
+                    if any(p.match(package) and c.match(decl.name)
+                           for _k, _e, p, c in self.module_patterns):
+                        break  # valid for another kind sharing the suffix
+                    found.append(Finding(path, decl.line, "warning", f"module_patterns.{kind}",
+                                         f"{decl.name} belongs in {expected} (is in {package or '-'})"))
+                    break
+        return found
+
+
+def validate(rules: NamingRules, paths: list[str], workspace_root: Path,
+             workers: Optional[int] = None, staged: bool = False) -> tuple[list[Finding], int, float]:
+    """
+    (findings, files scanned, seconds) for the Kotlin/Java files among `paths`;
+    staged=True checks their index version instead of the working tree.
+    """
+    start = time.perf_counter()
+    sources = [p for p in paths if p.endswith(SOURCE_SUFFIXES)]
+    if staged:
+        scanned = scan_staged(sources, workspace_root)
+    else:
+        scanned = scan_files(sources, workspace_root, workers)
+    found = []
+    for path in sorted(scanned):
+        package, declarations = scanned[path]
+        found.extend(rules.check(path, package, declarations))
+    return found, len(scanned), time.perf_counter() - start
@@ -0,0 +1,130 @@
+"""
+Overlap and shadowing analysis of scope definitions (scope-guard-cli.py overlaps).
+
+shadowed_modules()  module paths that lie inside (or equal) a module path of
+                    another scope. Files below the inner path resolve to the
+                    inner scope, so the outer scope silently loses them.
+contested_files()   tracked files claimed by more than one scope (filePatterns
+                    or module paths), with the owner classify() resolves.
+declared_files()    files listed by scopes (criticalFiles, handlers, diModules,
+                    coveredFiles) that more than one scope lists, or whose
+                    declared OWNER is not the resolved owner. More than one
+                    OWNER is a conflict; CONSUMER/SHARED entries are
+                    intentional sharing.
+"""
+from typing import NamedTuple, Optional
+
+from .matcher import ScopeMatcher, Status
+
+FILE_LISTS = ("criticalFiles", "handlers", "diModules")
+
+
+class ShadowedModule(NamedTuple):
+    module_path: str
+    scope_id: str
+    outer_path: str
+    outer_scope: str
+    kind: str       # "nested" | "duplicate" | "redundant" (same scope)
+    files: int      # tracked files below module_path
+
+
+class ContestedFile(NamedTuple):
+    path: str
+    owner: str
+    owner_via: str
+    others: list[tuple[str, str]]   # (scope_id, filePattern or module_path)
+
+
+class DeclaredFile(NamedTuple):
+    path: str
+    entries: list[tuple[str, str, Optional[list[str]]]]  # (scope_id, ownership, sharedWith)
+    resolved: Optional[str]   # owning scope per classify(), or the non-SCOPE status
+
+    @property
+    def owners(self) -> list[str]:
+        return [scope_id for scope_id, ownership, _shared in self.entries if ownership == "OWNER"]
+
+    @property
+    def conflict(self) -> bool:
+        return len(set(self.owners)) > 1
+
+    @property
+    def mismatch(self) -> bool:
+        owners = set(self.owners)
+        return len(owners) == 1 and self.resolved not in owners
+
+
+def _count_below(module_path: str, paths: list[str]) -> int:
+    prefix = module_path + "/"
+    return sum(1 for p in paths if p.startswith(prefix))
+
+
+def shadowed_modules(matcher: ScopeMatcher, paths: list[str]) -> list[ShadowedModule]:
+    """Module paths at or below another registered module path."""
+    trie = matcher.trie
+    found = []
+    for rank, scope_id, module_path in trie.entries():
+        module_path = module_path.replace("\\", "/").strip("/")
+        for outer_rank, outer_scope, outer_path in trie.lookup_all(module_path):
+            outer_path = outer_path.replace("\\", "/").strip("/")
+            if outer_rank == rank:
+                continue
+            if outer_path == module_path:
+                if outer_scope == scope_id or outer_rank > rank:
+                    continue  # reported from the shadowed (later) entry
+                kind = "duplicate"
+            else:
+                kind = "redundant" if outer_scope == scope_id else "nested"
+            found.append(ShadowedModule(module_path, scope_id, outer_path, outer_scope, kind,
+                                        _count_below(module_path, paths)))
+    return found
+
+
+def contested_files(matcher: ScopeMatcher, paths: list[str]) -> list[ContestedFile]:
+    """Tracked SCOPE files that more than one scope claims."""
+    found = []
+    for path, result in zip(paths, matcher.classify_many(paths)):
+        if result.status != Status.SCOPE:
+            continue
+        claims = matcher.scopes_for(path)
+        if len({scope_id for scope_id, _via in claims}) < 2:
+            continue
+        others = [(s, via) for s, via in claims if s != result.owner]
+        found.append(ContestedFile(path, result.owner, result.pattern, others))
+    return found
+
+
+def _declared_entries(scopes: dict[str, dict]) -> dict[str, list]:
+    """path → [(scope_id, ownership, sharedWith)], bare file names joined to their module."""
+    declared: dict[str, list] = {}
+
+    def add(path: str, module_path: Optional[str], scope_id: str, item):
+        if module_path and "/" not in path:
+            path = f"{module_path.rstrip('/')}/{path}"
+        ownership = item.get("ownership", "OWNER") if isinstance(item, dict) else "OWNER"
+        shared = item.get("sharedWith") if isinstance(item, dict) else None
+        declared.setdefault(path, []).append((scope_id, ownership, shared))
+
+    for scope_id, scope in scopes.items():
+        for module_path, module in scope.get("modules", {}).items():
+            for key in FILE_LISTS:
+                for item in module.get(key, []):
+                    path = item.get("path") if isinstance(item, dict) else item
+                    if path:
+                        add(path, module_path, scope_id, item)
+        for item in scope.get("coveredFiles", []):
+            if isinstance(item, dict) and item.get("path"):
+                add(item["path"], None, scope_id, item)
+    return declared
+
+
+def declared_files(matcher: ScopeMatcher) -> list[DeclaredFile]:
+    """Listed files shared between scopes, conflicting, or owned elsewhere."""
+    found = []
+    for path, entries in sorted(_declared_entries(matcher.scopes).items()):
+        result = matcher.classify(path)
+        resolved = result.owner if result.status == Status.SCOPE else result.status.value
+        item = DeclaredFile(path, entries, resolved)
+        if len({scope_id for scope_id, _o, _s in entries}) > 1 or item.mismatch:
+            found.append(item)
+    return found
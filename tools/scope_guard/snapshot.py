@@ -0,0 +1,161 @@
+"""
+Compiled snapshot of .scope/ for fast one-shot CLI runs.
+
+load_matcher() builds the ScopeMatcher from .scope/.cache/snapshot.json when
+the snapshot is still valid: one file read instead of the config plus every
+*.scope.json, and no glob translation (the regex sources are stored). When
+it is stale the sources are loaded as usual and the snapshot is rewritten.
+
+Validity is checked per source file (scope-guard.config.json, *.scope.json):
+
+  same names, (mtime_ns, size) unchanged   → valid, sources are not read
+  mtime changed but sha1 of content equal  → valid (e.g. after git checkout);
+                                             stored mtimes are refreshed
+  anything else                            → rebuild
+
+The snapshot also records SNAPSHOT_FORMAT and the package version, so a
+changed matcher never reads an old snapshot. SCOPE_GUARD_NO_CACHE=1 bypasses
+it entirely. Write failures (read-only checkout) are ignored.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from . import __version__
+from .config import CONFIG_FILE, SCOPE_DIR, WORKSPACE_ROOT, load_config, load_scopes
+from .matcher import ScopeMatcher
+
+SNAPSHOT_FORMAT = 1
+CACHE_DIR_NAME = ".cache"
+SNAPSHOT_NAME = "snapshot.json"
+
+
+def snapshot_path(scope_dir: Path = SCOPE_DIR) -> Path:
+    return scope_dir / CACHE_DIR_NAME / SNAPSHOT_NAME
+
+
+def source_files(scope_dir: Path = SCOPE_DIR) -> list[Path]:
+    """Files the matcher is built from, in load order."""
+    return [scope_dir / CONFIG_FILE.name] + sorted(scope_dir.glob("*.scope.json"))
+
+
+def _stat_key(path: Path) -> Optional[list[int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _sha1(path: Path) -> Optional[str]:
+    import hashlib  # only reached when an mtime changed
+
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _read_snapshot(cache_file: Path) -> Optional[dict]:
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict):
+        return None
+    if snapshot.get("format") != SNAPSHOT_FORMAT or snapshot.get("version") != __version__:
+        return None
+    return snapshot
+
+
+def _write_snapshot(cache_file: Path, snapshot: dict):
+    tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp, cache_file)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def check_snapshot(snapshot: dict, files: list[Path]) -> Optional[bool]:
+    """
+    None if stale; False if valid as recorded; True if valid but the stored
+    mtimes need refreshing (content unchanged).
+    """
+    recorded = snapshot.get("sources", {})
+    if sorted(recorded) != sorted(f.name for f in files):
+        return None
+    touched = False
+    for path in files:
+        stat_key, digest = recorded[path.name]
+        current = _stat_key(path)
+        if current is None:
+            return None
+        if current == stat_key:
+            continue
+        if _sha1(path) != digest:
+            return None
+        recorded[path.name] = [current, digest]
+        touched = True
+    return touched
+
+
+def build_snapshot(scope_dir: Path = SCOPE_DIR,
+                   workspace_root: Path = WORKSPACE_ROOT) -> tuple[ScopeMatcher, Optional[dict]]:
+    """
+    Load and compile the sources. The snapshot is None when a scope file
+    failed to load: its warning must show on every run, so it is not cached.
+    """
+    files = source_files(scope_dir)
+    before = {path.name: _stat_key(path) for path in files}
+    config = load_config(files[0])
+    scopes = load_scopes(scope_dir)
+    matcher = ScopeMatcher(config, scopes, workspace_root)
+    if len(scopes) != len(files) - 1:
+        return matcher, None
+    sources = {}
+    for path in files:
+        digest = _sha1(path)
+        if digest is None or _stat_key(path) != before[path.name]:
+            return matcher, None  # changed while loading
+        sources[path.name] = [before[path.name], digest]
+    return matcher, {
+        "format": SNAPSHOT_FORMAT,
+        "version": __version__,
+        "sources": sources,
+        "config": config,
+        "scopes": scopes,
+        "regex": matcher.regex_sources(),
+    }
+
+
+def load_matcher(scope_dir: Path = SCOPE_DIR, workspace_root: Path = WORKSPACE_ROOT,
+                 use_cache: Optional[bool] = None) -> ScopeMatcher:
+    """Compiled matcher for `scope_dir`, from the snapshot when it is valid."""
+    if use_cache is None:
+        use_cache = not os.environ.get("SCOPE_GUARD_NO_CACHE")
+    if not use_cache:
+        return ScopeMatcher(load_config(scope_dir / CONFIG_FILE.name), load_scopes(scope_dir),
+                            workspace_root)
+
+    cache_file = snapshot_path(scope_dir)
+    snapshot = _read_snapshot(cache_file)
+    if snapshot is not None:
+        touched = check_snapshot(snapshot, source_files(scope_dir))
+        if touched is not None:
+            if touched:
+                _write_snapshot(cache_file, snapshot)
+            return ScopeMatcher(snapshot["config"], snapshot["scopes"], workspace_root,
+                                regex_sources=snapshot["regex"])
+
+    matcher, snapshot = build_snapshot(scope_dir, workspace_root)
+    if snapshot is not None:
+        _write_snapshot(cache_file, snapshot)
+    return matcher